@@ -2,8 +2,8 @@ import streamlit as st
 import time
 import threading
 from modules.system_monitor import SystemMonitor
-from modules.self_healer import SelfHealer
-from modules.alerts import AlertManager
+from modules.self_healer import get_shared_healer
+from modules.alerts import get_shared_alert_manager
 from modules.logger import SystemLogger
 
 # Configure the page
@@ -17,8 +17,8 @@ st.set_page_config(
 # Initialize session state
 if 'monitor' not in st.session_state:
     st.session_state.monitor = SystemMonitor()
-    st.session_state.healer = SelfHealer()
-    st.session_state.alert_manager = AlertManager()
+    st.session_state.healer = get_shared_healer()
+    st.session_state.alert_manager = get_shared_alert_manager()
     st.session_state.logger = SystemLogger()
     st.session_state.monitoring_active = False
 
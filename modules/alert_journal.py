@@ -0,0 +1,138 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Any
+
+
+class AlertJournal:
+    """
+    Append-only alert journal with periodic compacted checkpoints
+
+    Every store mutation is appended as a small JSON line (a full record only
+    for new alerts; acknowledge/resolve/update are deltas). Every
+    checkpoint_every records the current alerts are written to a checkpoint
+    (temp file + os.replace) and the journal restarts empty. Records carry
+    sequence numbers, so a crash between the two steps replays nothing twice.
+
+    The journal is driven by AlertStore, which calls it under its own lock.
+    """
+
+    CHECKPOINT_FILE = 'alerts.checkpoint.json'
+    JOURNAL_FILE = 'alerts.journal.jsonl'
+
+    def __init__(self, directory: str = os.path.join('logs', 'alert_journal'),
+                 checkpoint_every: int = 500, fsync: bool = False):
+        self.directory = directory
+        self.checkpoint_every = checkpoint_every
+        self.fsync = fsync  # fsync each record (durable across power loss, but slower)
+        self.checkpoint_path = os.path.join(directory, self.CHECKPOINT_FILE)
+        self.journal_path = os.path.join(directory, self.JOURNAL_FILE)
+        self.sequence = 0
+        self.records_since_checkpoint = 0
+        self.stats = {'appended': 0, 'checkpoints': 0, 'replayed': 0, 'skipped': 0, 'recovery_ms': 0.0}
+        self._file = None
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Read the checkpoint and the journal tail
+
+        Returns {'alerts': [...], 'next_id': int, 'records': [...]}: the checkpointed
+        alerts (oldest first) and the journal records newer than the checkpoint.
+        A torn last line from a crash mid-write is ignored.
+        """
+        started = time.perf_counter()
+        checkpoint = {'sequence': 0, 'next_id': 1, 'alerts': []}
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+
+        records = []
+        skipped = 0
+        sequence = checkpoint.get('sequence', 0)
+        if os.path.exists(self.journal_path):
+            # The journal holds at most checkpoint_every records, so it is read whole
+            with open(self.journal_path, 'rb') as f:
+                data = f.read()
+            lines = data.split(b'\n')
+            if lines[-1]:
+                # Torn write: cut it off so the next append starts on a fresh line
+                with open(self.journal_path, 'r+b') as f:
+                    f.truncate(len(data) - len(lines[-1]))
+                skipped += 1
+            for line in lines[:-1]:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    skipped += 1
+                    continue
+                if record.get('seq', 0) <= checkpoint.get('sequence', 0):
+                    skipped += 1  # already in the checkpoint
+                    continue
+                records.append(record)
+                sequence = max(sequence, record['seq'])
+
+        with self._lock:
+            self.sequence = sequence
+            self.records_since_checkpoint = len(records)
+            self.stats['replayed'] = len(records)
+            self.stats['skipped'] = skipped
+            self.stats['recovery_ms'] = (time.perf_counter() - started) * 1000
+
+        return {'alerts': checkpoint.get('alerts', []), 'next_id': checkpoint.get('next_id', 1), 'records': records}
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.journal_path, 'a', encoding='utf-8')
+        return self._file
+
+    def append(self, op: str, **fields) -> bool:
+        """Append one record (add, update, remove_older_than or clear); returns True when a checkpoint is due"""
+        with self._lock:
+            self.sequence += 1
+            record = dict(fields, seq=self.sequence, op=op)
+            f = self._open()
+            f.write(json.dumps(record, default=str) + '\n')
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+            self.stats['appended'] += 1
+            self.records_since_checkpoint += 1
+            return self.records_since_checkpoint >= self.checkpoint_every
+
+    def checkpoint(self, alerts: List[Dict[str, Any]], next_id: int):
+        """Write alerts (the store's full state) as a checkpoint and start an empty journal"""
+        with self._lock:
+            data = {'sequence': self.sequence, 'next_id': next_id,
+                    'created_at': time.time(), 'alerts': alerts}
+
+            temp_path = self.checkpoint_path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, default=str)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.checkpoint_path)
+
+            # Records up to self.sequence are now in the checkpoint
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            with open(self.journal_path, 'w', encoding='utf-8'):
+                pass
+
+            self.records_since_checkpoint = 0
+            self.stats['checkpoints'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get journal counters and the last recovery time"""
+        with self._lock:
+            return dict(self.stats, sequence=self.sequence,
+                        records_since_checkpoint=self.records_since_checkpoint)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
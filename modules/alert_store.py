@@ -0,0 +1,364 @@
+import bisect
+import heapq
+import itertools
+import threading
+from collections import Counter, deque
+from datetime import datetime
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+
+class TimeBuckets:
+    """
+    Alert counts per fixed-width time bucket over a bounded retention, so
+    windowed counts and rates cost O(buckets) rather than O(alerts)
+    """
+
+    def __init__(self, width: float, retention: int):
+        self.width = width
+        self.retention = retention  # buckets kept
+        self._counts = {}  # bucket number -> count, in insertion (mostly time) order
+
+    def _bucket(self, timestamp: float) -> int:
+        return int(timestamp // self.width)
+
+    def add(self, timestamp: float):
+        bucket = self._bucket(timestamp)
+        self._counts[bucket] = self._counts.get(bucket, 0) + 1
+
+        # Drop buckets that fell out of the retention window
+        oldest = bucket - self.retention
+        while self._counts:
+            first = next(iter(self._counts))
+            if first > oldest:
+                break
+            del self._counts[first]
+
+    def remove(self, timestamp: float):
+        bucket = self._bucket(timestamp)
+        count = self._counts.get(bucket)
+        if count is None:
+            return
+        if count <= 1:
+            del self._counts[bucket]
+        else:
+            self._counts[bucket] = count - 1
+
+    def count_since(self, since: float, now: float) -> int:
+        """Count alerts from the bucket holding since up to now (bucket-granular)"""
+        counts = self._counts
+        return sum(counts.get(bucket, 0) for bucket in range(self._bucket(since), self._bucket(now) + 1))
+
+    def series(self, now: float, buckets: int) -> List[Tuple[float, int]]:
+        """Get (bucket start, count) for the last buckets buckets up to now, oldest first"""
+        last = self._bucket(now)
+        return [(bucket * self.width, self._counts.get(bucket, 0)) for bucket in range(last - buckets + 1, last + 1)]
+
+    def clear(self):
+        self._counts.clear()
+
+
+class AlertStore:
+    """
+    Bounded alert store with monotonic IDs, an ID index and secondary indexes
+    by category, severity and state, kept in sync on insert, update and eviction
+
+    Counters (severity x state, and alerts per minute and per hour) are kept
+    in sync the same way, so statistics never scan the stored alerts.
+
+    With a journal, every mutation is also journaled and restore() rebuilds
+    the store from the last checkpoint plus the journal tail.
+    """
+
+    INDEXED_FIELDS = ('category', 'severity', 'state')
+
+    def __init__(self, max_alerts: int = 1000, start_id: int = 1, journal=None):
+        self.max_alerts = max_alerts
+        self.journal = journal  # optional AlertJournal
+        self._ids = itertools.count(start_id)
+        self._last_id = start_id - 1
+        self._order = deque()  # alert IDs, oldest first
+        self._by_id = {}
+        # field -> value -> sorted list of numeric alert IDs
+        self._indexes = {field: {} for field in self.INDEXED_FIELDS}
+        self._severity_states = Counter()  # (severity, state) -> count
+        self.per_minute = TimeBuckets(60, 60)
+        self.per_hour = TimeBuckets(3600, 24 * 7)
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def alert_state(alert: Dict[str, Any]) -> str:
+        """Get the lifecycle state of an alert: open, acknowledged or resolved"""
+        if alert.get('resolved'):
+            return 'resolved'
+        if alert.get('acknowledged'):
+            return 'acknowledged'
+        return 'open'
+
+    def _index_values(self, alert: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'category': alert.get('category'),
+            'severity': alert.get('severity'),
+            'state': self.alert_state(alert)
+        }
+
+    def _index(self, alert_id: str, values: Dict[str, Any]):
+        key = int(alert_id)
+        for field, value in values.items():
+            bucket = self._indexes[field].setdefault(value, [])
+            # New alerts append; only re-indexed ones (state changes) need an insert
+            if not bucket or bucket[-1] < key:
+                bucket.append(key)
+            else:
+                bisect.insort(bucket, key)
+
+    def _unindex(self, alert_id: str, values: Dict[str, Any]):
+        key = int(alert_id)
+        for field, value in values.items():
+            bucket = self._indexes[field].get(value)
+            if bucket is None:
+                continue
+            position = bisect.bisect_left(bucket, key)
+            if position < len(bucket) and bucket[position] == key:
+                del bucket[position]
+            if not bucket:
+                del self._indexes[field][value]
+
+    @staticmethod
+    def _epoch(alert: Dict[str, Any]) -> float:
+        return datetime.fromisoformat(alert['timestamp']).timestamp()
+
+    def _count(self, alert: Dict[str, Any], values: Dict[str, Any], delta: int):
+        self._severity_states[(values['severity'], values['state'])] += delta
+        if not alert.get('timestamp'):
+            return
+        timestamp = self._epoch(alert)
+        for buckets in (self.per_minute, self.per_hour):
+            if delta > 0:
+                buckets.add(timestamp)
+            else:
+                buckets.remove(timestamp)
+
+    def next_id(self) -> str:
+        """Allocate the next alert ID (never reused, even after eviction)"""
+        with self._lock:
+            self._last_id = next(self._ids)
+            return str(self._last_id)
+
+    def _journal(self, op: str, **fields):
+        # Called under the store lock, so checkpoints see a consistent store
+        if self.journal is not None and self.journal.append(op, **fields):
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Write a journal checkpoint of the current alerts"""
+        with self._lock:
+            if self.journal is not None:
+                self.journal.checkpoint(self.to_list(), self._last_id + 1)
+
+    def restore(self) -> int:
+        """Rebuild the store from the journal's checkpoint and tail; returns the number of alerts"""
+        if self.journal is None:
+            return 0
+        state = self.journal.load()
+        with self._lock:
+            self._clear()
+            last_id = state['next_id'] - 1
+            for alert in state['alerts']:
+                self._insert(alert)
+                last_id = max(last_id, int(alert['id']))
+            for record in state['records']:
+                op = record['op']
+                if op == 'add':
+                    self._insert(record['alert'])
+                    last_id = max(last_id, int(record['alert']['id']))
+                elif op == 'update':
+                    self._update(record['id'], record['changes'])
+                elif op == 'remove_older_than':
+                    self._remove_older_than(datetime.fromisoformat(record['cutoff']))
+                elif op == 'clear':
+                    self._clear()
+            self._ids = itertools.count(last_id + 1)
+            self._last_id = last_id
+            return len(self._by_id)
+
+    def add(self, alert: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert an alert, evicting the oldest ones beyond max_alerts"""
+        with self._lock:
+            if not alert.get('id'):
+                alert['id'] = self.next_id()
+            self._insert(alert)
+            self._journal('add', alert=alert)
+            return alert
+
+    def _insert(self, alert: Dict[str, Any]):
+        # Evictions are not journaled: replaying the adds evicts the same alerts
+        with self._lock:
+            alert_id = alert['id']
+
+            self._by_id[alert_id] = alert
+            self._order.append(alert_id)
+            values = self._index_values(alert)
+            self._index(alert_id, values)
+            self._count(alert, values, 1)
+
+            while len(self._order) > self.max_alerts:
+                self._evict(self._order.popleft())
+
+    def _evict(self, alert_id: str) -> Optional[Dict[str, Any]]:
+        alert = self._by_id.pop(alert_id, None)
+        if alert is not None:
+            values = self._index_values(alert)
+            self._unindex(alert_id, values)
+            self._count(alert, values, -1)
+        return alert
+
+    def get(self, alert_id: str) -> Optional[Dict[str, Any]]:
+        """Look up an alert by ID"""
+        return self._by_id.get(alert_id)
+
+    def update(self, alert_id: str, **changes) -> Optional[Dict[str, Any]]:
+        """Update alert fields in place and re-index them"""
+        with self._lock:
+            alert = self._update(alert_id, changes)
+            if alert is not None:
+                self._journal('update', id=alert_id, changes=changes)
+            return alert
+
+    def _update(self, alert_id: str, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            alert = self._by_id.get(alert_id)
+            if alert is None:
+                return None
+
+            before = self._index_values(alert)
+            alert.update(changes)
+            after = self._index_values(alert)
+
+            changed = {field: value for field, value in before.items() if after[field] != value}
+            if changed:
+                self._unindex(alert_id, changed)
+                self._index(alert_id, {field: after[field] for field in changed})
+                self._severity_states[(before['severity'], before['state'])] -= 1
+                self._severity_states[(after['severity'], after['state'])] += 1
+            return alert
+
+    def remove_older_than(self, cutoff: datetime) -> int:
+        """Drop alerts created before cutoff; alerts are stored in creation order"""
+        with self._lock:
+            removed = self._remove_older_than(cutoff)
+            if removed:
+                self._journal('remove_older_than', cutoff=cutoff.isoformat())
+            return removed
+
+    def _remove_older_than(self, cutoff: datetime) -> int:
+        removed = 0
+        with self._lock:
+            while self._order:
+                oldest = self._by_id.get(self._order[0])
+                if oldest is not None and datetime.fromisoformat(oldest['timestamp']) > cutoff:
+                    break
+                self._evict(self._order.popleft())
+                removed += 1
+        return removed
+
+    def clear(self):
+        """Remove every alert (IDs keep increasing)"""
+        with self._lock:
+            self._clear()
+            self._journal('clear')
+
+    def _clear(self):
+        with self._lock:
+            self._order.clear()
+            self._by_id.clear()
+            for index in self._indexes.values():
+                index.clear()
+            self._severity_states.clear()
+            self.per_minute.clear()
+            self.per_hour.clear()
+
+    def _candidate_ids(self, field: str, values: List[Any]) -> List[Iterator[int]]:
+        index = self._indexes[field]
+        return [reversed(index[value]) for value in values if value in index]
+
+    def query(self, category: str = None, severity: str = None, states: List[str] = None,
+              limit: int = None) -> List[Dict[str, Any]]:
+        """
+        Get alerts newest first; the most selective index drives the scan and the
+        remaining filters are checked per candidate
+        """
+        with self._lock:
+            filters = {}
+            if category:
+                filters['category'] = [category]
+            if severity:
+                filters['severity'] = [severity]
+            if states is not None:
+                filters['state'] = list(states)
+
+            if filters:
+                field = min(filters, key=lambda f: sum(len(self._indexes[f].get(v, ())) for v in filters[f]))
+                sources = self._candidate_ids(field, filters[field])
+                if len(sources) == 1:
+                    candidates = sources[0]
+                else:
+                    candidates = heapq.merge(*sources, reverse=True)
+                others = {f: set(values) for f, values in filters.items() if f != field}
+            else:
+                candidates = map(int, reversed(self._order))
+                others = {}
+
+            results = []
+            for key in candidates:
+                alert = self._by_id[str(key)]
+                if others:
+                    values = self._index_values(alert)
+                    if any(values[f] not in allowed for f, allowed in others.items()):
+                        continue
+                results.append(alert)
+                if limit is not None and len(results) >= limit:
+                    break
+            return results
+
+    def count(self, field: str = None, value: Any = None) -> int:
+        """Count all alerts, or those with an indexed field value"""
+        if field is None:
+            return len(self._by_id)
+        return len(self._indexes[field].get(value, ()))
+
+    def count_values(self, field: str) -> Dict[Any, int]:
+        """Count alerts per value of an indexed field"""
+        with self._lock:
+            return {value: len(ids) for value, ids in self._indexes[field].items()}
+
+    def count_severity(self, severity: str, states: List[str] = None) -> int:
+        """Count alerts of a severity, optionally only in some states"""
+        with self._lock:
+            if states is None:
+                return self.count('severity', severity)
+            return sum(self._severity_states[(severity, state)] for state in states)
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Get all alerts, oldest first"""
+        with self._lock:
+            return [self._by_id[alert_id] for alert_id in self._order]
+
+    def iter_copies(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield a shallow copy of each alert, oldest first, taking the lock per alert
+        so a long export never blocks writers (alerts removed meanwhile are skipped)
+        """
+        with self._lock:
+            alert_ids = list(self._order)
+        for alert_id in alert_ids:
+            with self._lock:
+                alert = self._by_id.get(alert_id)
+                alert = dict(alert) if alert is not None else None
+            if alert is not None:
+                yield alert
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.to_list())
@@ -1,46 +1,94 @@
-import smtplib
-import json
+import math
 import os
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from typing import Dict, List, Any, Iterator, Optional
 import threading
-import time
+from .alert_store import AlertStore
+from .alert_journal import AlertJournal
+from .notification_dispatcher import NotificationDispatcher, EmailChannel, DesktopChannel, SoundChannel
+from .rule_evaluator import RuleEvaluator
+from .webhook_notifier import WebhookChannel
+from .rule_engine import RuleEngine, series_name
+from .incident_correlator import IncidentCorrelator
+from .stream_export import iter_export
 
 class AlertManager:
     """
     Alert management system for system monitoring
     """
     
-    def __init__(self):
-        self.alerts = []
+    def __init__(self, journal: AlertJournal = None):
+        self.store = AlertStore(max_alerts=1000, journal=journal)
         self.alert_rules = self.load_default_rules()
         self.notification_settings = self.load_notification_settings()
-        self.max_alerts = 1000
+        self.webhook_channel = WebhookChannel(lambda: self.notification_settings)
+        self.dispatcher = NotificationDispatcher([
+            EmailChannel(lambda: self.notification_settings),
+            self.webhook_channel,
+            DesktopChannel(lambda: self.notification_settings),
+            SoundChannel(lambda: self.notification_settings)
+        ])
+        self.evaluator = RuleEvaluator(self)
+        self.correlator = IncidentCorrelator()
+        if journal is not None:
+            # Recover alerts (and acknowledgements) from the last checkpoint plus the journal tail
+            self.store.restore()
+            self.evaluator.adopt_open_alerts()
+            # Restored alerts keep their incident IDs; new incidents must not reuse them
+            self.correlator.reserve_ids([alert.get('incident_id') for alert in self.store.to_list()])
+            # Resume webhook retries persisted by the previous run (with their endpoints' headers)
+            self.webhook_channel.resume()
+        self.rule_engine = RuleEngine(self.build_threshold_rules())
         self.alert_thread = None
         self.alert_active = False
         
+    @property
+    def alerts(self) -> List[Dict[str, Any]]:
+        """All stored alerts, oldest first"""
+        return self.store.to_list()
+    
+    @property
+    def max_alerts(self) -> int:
+        return self.store.max_alerts
+    
+    @max_alerts.setter
+    def max_alerts(self, value: int):
+        self.store.max_alerts = value
+    
     def load_default_rules(self) -> Dict[str, Any]:
         """Load default alerting rules"""
         return {
             'cpu': {
+                'metric': 'cpu.percent',
+                'aggregate': 'avg',  # compared over the last window seconds
+                'window': 60,
                 'warning_threshold': 75.0,
                 'critical_threshold': 90.0,
                 'check_interval': 60,  # seconds
-                'consecutive_checks': 2
+                'consecutive_checks': 2,
+                'clear_margin': 5.0,  # clears below warning_threshold - clear_margin
+                'clear_checks': 2
             },
             'memory': {
+                'metric': 'memory.percent',
+                'aggregate': 'avg',
+                'window': 60,
                 'warning_threshold': 85.0,
                 'critical_threshold': 95.0,
                 'check_interval': 60,
-                'consecutive_checks': 2
+                'consecutive_checks': 2,
+                'clear_margin': 5.0,
+                'clear_checks': 2
             },
             'disk': {
+                'metric': 'disk.percent',
                 'warning_threshold': 85.0,
                 'critical_threshold': 95.0,
                 'check_interval': 300,  # 5 minutes
-                'consecutive_checks': 1
+                'consecutive_checks': 1,
+                'clear_margin': 2.0,
+                'clear_checks': 1
             },
             'process': {
                 'max_cpu_per_process': 80.0,
@@ -55,6 +103,31 @@ class AlertManager:
             }
         }
     
+    def build_threshold_rules(self) -> List[Dict[str, Any]]:
+        """
+        Declare a rule-engine rule for every alert rule with a metric and warning/critical
+        thresholds (optionally compared as an aggregate over window seconds)
+        """
+        rules = []
+        for category, rule in self.alert_rules.items():
+            if 'metric' not in rule or 'warning_threshold' not in rule or 'critical_threshold' not in rule:
+                continue
+            rules.append({
+                'name': category,
+                'category': category,
+                'metric': rule['metric'],
+                'comparator': '>=',
+                'aggregate': rule.get('aggregate', 'last'),
+                'window': rule.get('window', 0),
+                'min_coverage': rule.get('min_coverage', 1.0),
+                'percentile': rule.get('percentile', 95.0),
+                'levels': [
+                    {'name': 'critical', 'threshold': rule['critical_threshold']},
+                    {'name': 'warning', 'threshold': rule['warning_threshold']}
+                ]
+            })
+        return rules
+    
     def load_notification_settings(self) -> Dict[str, Any]:
         """Load notification settings"""
         return {
@@ -64,17 +137,31 @@ class AlertManager:
                 'smtp_port': int(os.getenv('SMTP_PORT', '587')),
                 'username': os.getenv('EMAIL_USERNAME', ''),
                 'password': os.getenv('EMAIL_PASSWORD', ''),
-                'recipients': os.getenv('EMAIL_RECIPIENTS', '').split(',') if os.getenv('EMAIL_RECIPIENTS') else []
+                'recipients': os.getenv('EMAIL_RECIPIENTS', '').split(',') if os.getenv('EMAIL_RECIPIENTS') else [],
+                'use_tls': os.getenv('SMTP_USE_TLS', 'true').lower() != 'false',
+                'coalesce_seconds': 30  # alerts within this window share one e-mail
+            },
+            'webhook': {
+                'enabled': bool(os.getenv('WEBHOOK_URLS')),
+                # [{'url': ..., 'headers': {...}, 'format': 'json' | 'chat', 'max_concurrency': 2}]
+                'endpoints': [
+                    {'url': url.strip(), 'format': os.getenv('WEBHOOK_FORMAT', 'json')}
+                    for url in os.getenv('WEBHOOK_URLS', '').split(',') if url.strip()
+                ],
+                'timeout': 5.0,
+                'coalesce_seconds': 1  # alerts within this window share one POST per endpoint
             },
             'desktop': {
                 'enabled': True,
                 'show_warnings': True,
-                'show_critical': True
+                'show_critical': True,
+                'coalesce_seconds': 2
             },
             'sound': {
                 'enabled': True,
                 'warning_sound': True,
-                'critical_sound': True
+                'critical_sound': True,
+                'coalesce_seconds': 2
             }
         }
     
@@ -82,7 +169,7 @@ class AlertManager:
                   severity: str = 'info', metadata: Dict[str, Any] = None) -> Dict[str, Any]:
         """Add a new alert"""
         alert = {
-            'id': f"{int(time.time())}-{len(self.alerts)}",
+            'id': self.store.next_id(),
             'timestamp': datetime.now().isoformat(),
             'type': alert_type,
             'category': category,
@@ -93,54 +180,58 @@ class AlertManager:
             'metadata': metadata or {}
         }
         
-        self.alerts.append(alert)
+        # Related alerts share an incident, which is notified once (and on escalation)
+        alert['incident_id'], notification = self.correlator.correlate(alert)
         
-        # Keep only recent alerts
-        if len(self.alerts) > self.max_alerts:
-            self.alerts = self.alerts[-self.max_alerts:]
+        # The store evicts the oldest alerts beyond max_alerts
+        self.store.add(alert)
         
-        # Send notifications
-        self._send_notifications(alert)
+        if notification:
+            self._send_notifications(notification)
         
         return alert
     
+    def update_alert(self, alert_id: str, notify: bool = False, **changes) -> Optional[Dict[str, Any]]:
+        """Update an alert in place; notify=True (e.g. on escalation) re-notifies its incident if it escalated"""
+        alert = self.store.update(alert_id, **changes)
+        if alert is not None:
+            if notify and not self.correlator.is_open(alert.get('incident_id')):
+                # The alert outlived its incident: the escalation opens (or joins) a new one
+                incident_id, notification = self.correlator.correlate(alert)
+                alert = self.store.update(alert_id, incident_id=incident_id)
+            else:
+                notification = self.correlator.touch(alert)
+            if notification and notify:
+                self._send_notifications(notification)
+        return alert
+    
     def acknowledge_alert(self, alert_id: str) -> bool:
         """Acknowledge an alert"""
-        for alert in self.alerts:
-            if alert['id'] == alert_id:
-                alert['acknowledged'] = True
-                alert['acknowledged_at'] = datetime.now().isoformat()
-                return True
-        return False
+        return self.store.update(
+            alert_id,
+            acknowledged=True,
+            acknowledged_at=datetime.now().isoformat()
+        ) is not None
     
     def resolve_alert(self, alert_id: str, resolution_note: str = "") -> bool:
         """Resolve an alert"""
-        for alert in self.alerts:
-            if alert['id'] == alert_id:
-                alert['resolved'] = True
-                alert['resolved_at'] = datetime.now().isoformat()
-                alert['resolution_note'] = resolution_note
-                return True
-        return False
+        return self.store.update(
+            alert_id,
+            resolved=True,
+            resolved_at=datetime.now().isoformat(),
+            resolution_note=resolution_note
+        ) is not None
     
     def get_alerts(self, category: str = None, severity: str = None, 
                    resolved: bool = None, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get alerts with optional filtering"""
-        filtered_alerts = self.alerts
-        
-        if category:
-            filtered_alerts = [a for a in filtered_alerts if a['category'] == category]
-        
-        if severity:
-            filtered_alerts = [a for a in filtered_alerts if a['severity'] == severity]
-        
-        if resolved is not None:
-            filtered_alerts = [a for a in filtered_alerts if a['resolved'] == resolved]
+        """Get alerts with optional filtering (newest first)"""
+        states = None
+        if resolved is True:
+            states = ['resolved']
+        elif resolved is False:
+            states = ['open', 'acknowledged']
         
-        # Sort by timestamp (newest first)
-        filtered_alerts.sort(key=lambda x: x['timestamp'], reverse=True)
-        
-        return filtered_alerts[:limit]
+        return self.store.query(category=category, severity=severity, states=states, limit=limit)
     
     def get_recent_alerts(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent alerts"""
@@ -157,238 +248,88 @@ class AlertManager:
     def clear_old_alerts(self, days: int = 7):
         """Clear alerts older than specified days"""
         cutoff_date = datetime.now() - timedelta(days=days)
-        
-        self.alerts = [
-            alert for alert in self.alerts
-            if datetime.fromisoformat(alert['timestamp']) > cutoff_date
-        ]
+        self.store.remove_older_than(cutoff_date)
+    
+    def get_active_alert_count(self) -> int:
+        """Count unresolved alerts without fetching them"""
+        return self.store.count('state', 'open') + self.store.count('state', 'acknowledged')
+    
+    def get_critical_alert_count(self) -> int:
+        """Count unresolved critical alerts without fetching them"""
+        return self.store.count_severity('critical', ['open', 'acknowledged'])
     
     def get_alert_statistics(self) -> Dict[str, Any]:
-        """Get alert statistics"""
-        now = datetime.now()
+        """
+        Get alert statistics from the store's counters (never scans the alerts)
         
-        # Count alerts by time period
-        last_hour = now - timedelta(hours=1)
-        last_day = now - timedelta(days=1)
-        last_week = now - timedelta(weeks=1)
+        Time-period counts are bucket-granular: per minute for the last hour,
+        per hour for the last day and week.
+        """
+        now = time.time()
+        store = self.store
         
-        stats = {
-            'total_alerts': len(self.alerts),
-            'active_alerts': len(self.get_active_alerts()),
-            'critical_alerts': len(self.get_critical_alerts()),
-            'alerts_last_hour': 0,
-            'alerts_last_day': 0,
-            'alerts_last_week': 0,
-            'by_category': {},
-            'by_severity': {}
-        }
-        
-        # Count by time periods and categories
-        for alert in self.alerts:
-            alert_time = datetime.fromisoformat(alert['timestamp'])
-            
-            if alert_time > last_hour:
-                stats['alerts_last_hour'] += 1
-            if alert_time > last_day:
-                stats['alerts_last_day'] += 1
-            if alert_time > last_week:
-                stats['alerts_last_week'] += 1
-            
-            # Count by category
-            category = alert['category']
-            stats['by_category'][category] = stats['by_category'].get(category, 0) + 1
-            
-            # Count by severity
-            severity = alert['severity']
-            stats['by_severity'][severity] = stats['by_severity'].get(severity, 0) + 1
+        per_minute = store.per_minute.series(now, 60)
+        per_hour = store.per_hour.series(now, 24)
         
-        return stats
+        return {
+            'total_alerts': len(store),
+            'active_alerts': self.get_active_alert_count(),
+            'critical_alerts': self.get_critical_alert_count(),
+            'alerts_last_hour': store.per_minute.count_since(now - 3600, now),
+            'alerts_last_day': store.per_hour.count_since(now - 86400, now),
+            'alerts_last_week': store.per_hour.count_since(now - 7 * 86400, now),
+            'by_category': store.count_values('category'),
+            'by_severity': store.count_values('severity'),
+            'by_state': store.count_values('state'),
+            'alerts_per_minute': [
+                {'timestamp': datetime.fromtimestamp(start).isoformat(), 'count': count}
+                for start, count in per_minute
+            ],
+            'alerts_per_hour': [
+                {'timestamp': datetime.fromtimestamp(start).isoformat(), 'count': count}
+                for start, count in per_hour
+            ]
+        }
     
-    def _send_notifications(self, alert: Dict[str, Any]):
-        """Send notifications for an alert"""
-        try:
-            # Desktop notification
-            if self.notification_settings['desktop']['enabled']:
-                self._send_desktop_notification(alert)
-            
-            # Sound notification
-            if self.notification_settings['sound']['enabled']:
-                self._play_alert_sound(alert)
-            
-            # Email notification
-            if self.notification_settings['email']['enabled']:
-                self._send_email_notification(alert)
-                
-        except Exception as e:
-            print(f"Error sending notifications: {e}")
+    def get_incidents(self, limit: int = 50, active_only: bool = False) -> List[Dict[str, Any]]:
+        """Get correlated incidents, most recently opened first"""
+        return self.correlator.get_incidents(limit=limit, active_only=active_only)
     
-    def _send_desktop_notification(self, alert: Dict[str, Any]):
-        """Send desktop notification (Windows)"""
-        try:
-            import subprocess
-            
-            # Use PowerShell to show Windows toast notification
-            title = f"System Alert - {alert['severity'].title()}"
-            message = alert['message']
-            
-            # Create PowerShell script for toast notification
-            ps_script = f"""
-            Add-Type -AssemblyName System.Windows.Forms
-            $notification = New-Object System.Windows.Forms.NotifyIcon
-            $notification.Icon = [System.Drawing.SystemIcons]::Warning
-            $notification.BalloonTipIcon = [System.Windows.Forms.ToolTipIcon]::Warning
-            $notification.BalloonTipText = "{message}"
-            $notification.BalloonTipTitle = "{title}"
-            $notification.Visible = $true
-            $notification.ShowBalloonTip(5000)
-            """
-            
-            subprocess.run([
-                'powershell', '-Command', ps_script
-            ], capture_output=True, check=False, timeout=10)
-            
-        except Exception as e:
-            print(f"Error sending desktop notification: {e}")
+    def _send_notifications(self, alert: Dict[str, Any]):
+        """Queue an alert (or incident notification) for background delivery on every enabled channel"""
+        self.dispatcher.submit(alert)
     
-    def _play_alert_sound(self, alert: Dict[str, Any]):
-        """Play alert sound"""
-        try:
-            import winsound
-            
-            severity = alert['severity']
-            
-            if severity == 'critical':
-                # Play system error sound
-                winsound.MessageBeep(winsound.MB_ICONHAND)
-            elif severity == 'warning':
-                # Play system warning sound
-                winsound.MessageBeep(winsound.MB_ICONEXCLAMATION)
-            else:
-                # Play system info sound
-                winsound.MessageBeep(winsound.MB_ICONASTERISK)
-                
-        except Exception as e:
-            print(f"Error playing alert sound: {e}")
+    def get_journal_stats(self) -> Optional[Dict[str, Any]]:
+        """Get alert journal counters and the last recovery time, if journaling is enabled"""
+        return self.store.journal.get_stats() if self.store.journal else None
     
-    def _send_email_notification(self, alert: Dict[str, Any]):
-        """Send email notification"""
-        try:
-            if not self.notification_settings['email']['recipients']:
-                return
-            
-            smtp_server = self.notification_settings['email']['smtp_server']
-            smtp_port = self.notification_settings['email']['smtp_port']
-            username = self.notification_settings['email']['username']
-            password = self.notification_settings['email']['password']
-            recipients = self.notification_settings['email']['recipients']
-            
-            if not all([smtp_server, username, password, recipients]):
-                return
-            
-            # Create email message
-            msg = MIMEMultipart()
-            msg['From'] = username
-            msg['To'] = ', '.join(recipients)
-            msg['Subject'] = f"System Alert - {alert['severity'].title()}: {alert['category'].title()}"
-            
-            body = f"""
-System Alert Notification
-
-Timestamp: {alert['timestamp']}
-Severity: {alert['severity'].title()}
-Category: {alert['category'].title()}
-Message: {alert['message']}
-
-Alert ID: {alert['id']}
-
-This is an automated message from the Self-Healing System Monitor.
-            """
-            
-            msg.attach(MIMEText(body, 'plain'))
-            
-            # Send email
-            server = smtplib.SMTP(smtp_server, smtp_port)
-            server.starttls()
-            server.login(username, password)
-            text = msg.as_string()
-            server.sendmail(username, recipients, text)
-            server.quit()
-            
-        except Exception as e:
-            print(f"Error sending email notification: {e}")
+    def get_notification_metrics(self) -> Dict[str, Any]:
+        """Get notification backlog and delivery latency per channel (webhooks per endpoint)"""
+        metrics = self.dispatcher.get_metrics()
+        metrics['webhook'] = self.webhook_channel.get_metrics()
+        return metrics
     
     def check_thresholds(self, system_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Check system data against alert thresholds"""
+        """
+        Check system data against alert thresholds
+        
+        Each series holds at most one open alert; returns alerts opened or
+        escalated by this sample.
+        """
         new_alerts = []
         
         try:
-            # CPU threshold checks
-            if 'cpu_percent' in system_data:
-                cpu_percent = system_data['cpu_percent']
-                cpu_rules = self.alert_rules['cpu']
-                
-                if cpu_percent >= cpu_rules['critical_threshold']:
-                    alert = self.add_alert(
-                        'threshold', 'cpu', 
-                        f'Critical CPU usage: {cpu_percent:.1f}%',
-                        'critical',
-                        {'value': cpu_percent, 'threshold': cpu_rules['critical_threshold']}
+            # One batched pass decides each series' level; the evaluator debounces it
+            for result in self.rule_engine.evaluate(system_data):
+                category = result.rule.category
+                for index, labels in enumerate(result.labels):
+                    value = float(result.values[index])
+                    if math.isnan(value):
+                        continue  # window still warming up
+                    alert = self.evaluator.evaluate(
+                        category, value, series_name(labels), level=result.level_name(index), labels=labels
                     )
-                    new_alerts.append(alert)
-                elif cpu_percent >= cpu_rules['warning_threshold']:
-                    alert = self.add_alert(
-                        'threshold', 'cpu',
-                        f'High CPU usage: {cpu_percent:.1f}%',
-                        'warning',
-                        {'value': cpu_percent, 'threshold': cpu_rules['warning_threshold']}
-                    )
-                    new_alerts.append(alert)
-            
-            # Memory threshold checks
-            if 'memory_percent' in system_data:
-                memory_percent = system_data['memory_percent']
-                memory_rules = self.alert_rules['memory']
-                
-                if memory_percent >= memory_rules['critical_threshold']:
-                    alert = self.add_alert(
-                        'threshold', 'memory',
-                        f'Critical memory usage: {memory_percent:.1f}%',
-                        'critical',
-                        {'value': memory_percent, 'threshold': memory_rules['critical_threshold']}
-                    )
-                    new_alerts.append(alert)
-                elif memory_percent >= memory_rules['warning_threshold']:
-                    alert = self.add_alert(
-                        'threshold', 'memory',
-                        f'High memory usage: {memory_percent:.1f}%',
-                        'warning',
-                        {'value': memory_percent, 'threshold': memory_rules['warning_threshold']}
-                    )
-                    new_alerts.append(alert)
-            
-            # Disk threshold checks
-            if 'disk_usage' in system_data:
-                disk_rules = self.alert_rules['disk']
-                
-                for disk in system_data['disk_usage']:
-                    disk_percent = disk.get('percent', 0)
-                    device = disk.get('device', 'Unknown')
-                    
-                    if disk_percent >= disk_rules['critical_threshold']:
-                        alert = self.add_alert(
-                            'threshold', 'disk',
-                            f'Critical disk usage on {device}: {disk_percent:.1f}%',
-                            'critical',
-                            {'value': disk_percent, 'threshold': disk_rules['critical_threshold'], 'device': device}
-                        )
-                        new_alerts.append(alert)
-                    elif disk_percent >= disk_rules['warning_threshold']:
-                        alert = self.add_alert(
-                            'threshold', 'disk',
-                            f'High disk usage on {device}: {disk_percent:.1f}%',
-                            'warning',
-                            {'value': disk_percent, 'threshold': disk_rules['warning_threshold'], 'device': device}
-                        )
+                    if alert:
                         new_alerts.append(alert)
             
             return new_alerts
@@ -402,31 +343,53 @@ This is an automated message from the Self-Healing System Monitor.
             return [error_alert]
     
     def update_alert_rules(self, new_rules: Dict[str, Any]):
-        """Update alerting rules"""
-        self.alert_rules.update(new_rules)
+        """
+        Update alerting rules (merged per category, so unspecified settings are kept)
+        
+        Threshold changes are written into the compiled rules in place; the rule
+        engine is only rebuilt when a rule's metric or window changes.
+        """
+        rebuild = False
+        for category, rule in new_rules.items():
+            current = self.alert_rules.setdefault(category, {})
+            if any(key in rule and rule[key] != current.get(key)
+                   for key in ('metric', 'aggregate', 'window', 'min_coverage', 'percentile')):
+                rebuild = True
+            current.update(rule)
+            
+            levels = {
+                level: rule[f'{level}_threshold']
+                for level in ('critical', 'warning') if f'{level}_threshold' in rule
+            }
+            if levels and not self.rule_engine.set_thresholds(category, levels):
+                rebuild = True
+        
+        if rebuild:
+            self.rule_engine.set_rules(self.build_threshold_rules())
     
     def update_notification_settings(self, new_settings: Dict[str, Any]):
         """Update notification settings"""
         self.notification_settings.update(new_settings)
     
+    EXPORT_FIELDS = ['timestamp', 'type', 'category', 'message', 'severity', 'acknowledged', 'resolved']
+
+    def iter_export_alerts(self, format: str = 'json') -> Iterator[str]:
+        """Stream alerts (oldest first) as json, ndjson or csv text chunks"""
+        return iter_export(self.store.iter_copies(), format, fieldnames=self.EXPORT_FIELDS)
+
     def export_alerts(self, format: str = 'json') -> str:
         """Export alerts in specified format"""
-        if format.lower() == 'json':
-            return json.dumps(self.alerts, indent=2)
-        elif format.lower() == 'csv':
-            import csv
-            import io
-            
-            output = io.StringIO()
-            if self.alerts:
-                fieldnames = ['timestamp', 'type', 'category', 'message', 'severity', 'acknowledged', 'resolved']
-                writer = csv.DictWriter(output, fieldnames=fieldnames)
-                writer.writeheader()
-                
-                for alert in self.alerts:
-                    row = {field: alert.get(field, '') for field in fieldnames}
-                    writer.writerow(row)
-            
-            return output.getvalue()
-        else:
-            raise ValueError(f"Unsupported export format: {format}")
+        return ''.join(self.iter_export_alerts(format))
+
+
+_shared_alert_manager = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_alert_manager() -> AlertManager:
+    """Get the process-wide, journaled alert manager shared by every session"""
+    global _shared_alert_manager
+    with _shared_lock:
+        if _shared_alert_manager is None:
+            _shared_alert_manager = AlertManager(journal=AlertJournal())
+        return _shared_alert_manager
@@ -0,0 +1,95 @@
+import itertools
+import queue
+import threading
+import time
+from typing import Dict, Any, Callable
+
+
+class EventBus:
+    """
+    In-process publish/subscribe bus; events are delivered to subscribers on a dispatcher thread
+    """
+
+    def __init__(self, max_queue: int = 1000):
+        self.subscribers = {}
+        self.stats = {
+            'published': 0,
+            'delivered': 0,
+            'dropped': 0,
+            'errors': 0,
+            'last_error': None
+        }
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._tokens = itertools.count(1)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def subscribe(self, topic: str, callback: Callable[[Any], None]) -> int:
+        """Subscribe to a topic; returns a token for unsubscribe()"""
+        with self._lock:
+            token = next(self._tokens)
+            self.subscribers.setdefault(topic, {})[token] = callback
+            self._ensure_dispatcher()
+        return token
+
+    def unsubscribe(self, token: int) -> bool:
+        """Remove a subscription"""
+        with self._lock:
+            for callbacks in self.subscribers.values():
+                if token in callbacks:
+                    del callbacks[token]
+                    return True
+        return False
+
+    def subscriber_count(self, topic: str = None) -> int:
+        """Count subscriptions, optionally for one topic"""
+        with self._lock:
+            if topic:
+                return len(self.subscribers.get(topic, {}))
+            return sum(len(callbacks) for callbacks in self.subscribers.values())
+
+    def publish(self, topic: str, payload: Any = None):
+        """Queue an event without blocking; the oldest event is dropped if the queue is full"""
+        event = (topic, payload, time.time())
+
+        while True:
+            try:
+                self._queue.put_nowait(event)
+                break
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.stats['dropped'] += 1
+                except queue.Empty:
+                    pass
+
+        self.stats['published'] += 1
+
+    def _ensure_dispatcher(self):
+        """Start the dispatcher thread on first subscription"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._dispatch_loop, name="event-bus", daemon=True)
+            self._thread.start()
+
+    def _dispatch_loop(self):
+        """Deliver queued events to the topic's subscribers"""
+        while True:
+            topic, payload, _ = self._queue.get()
+
+            with self._lock:
+                callbacks = list(self.subscribers.get(topic, {}).values())
+
+            for callback in callbacks:
+                try:
+                    callback(payload)
+                    self.stats['delivered'] += 1
+                except Exception as e:
+                    self.stats['errors'] += 1
+                    self.stats['last_error'] = f"{topic}: {e}"
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get bus delivery statistics"""
+        stats = dict(self.stats)
+        stats['queued'] = self._queue.qsize()
+        stats['subscribers'] = self.subscriber_count()
+        return stats
@@ -0,0 +1,370 @@
+import os
+import platform
+import shutil
+import subprocess
+import threading
+from typing import Dict, List, Any, Callable, Optional
+
+from .service_manager import AsyncCommandRunner, ServiceManager, load_default_services
+
+
+class CommandRunner:
+    """
+    Runs external commands for healing actions; replace it to run actions without spawning
+    """
+
+    def __init__(self, default_timeout: float = 30):
+        self.default_timeout = default_timeout
+
+    def which(self, command: str) -> Optional[str]:
+        """Locate an executable on PATH"""
+        return shutil.which(command)
+
+    def run(self, args: List[str], timeout: float = None) -> Dict[str, Any]:
+        """Run a command and capture its output"""
+        try:
+            result = subprocess.run(
+                args,
+                capture_output=True,
+                text=True,
+                check=False,
+                timeout=timeout or self.default_timeout
+            )
+            return {
+                'returncode': result.returncode,
+                'stdout': result.stdout,
+                'stderr': result.stderr
+            }
+        except subprocess.TimeoutExpired:
+            return {'returncode': None, 'stdout': '', 'stderr': f"Timed out after {timeout or self.default_timeout}s"}
+        except OSError as e:
+            return {'returncode': None, 'stdout': '', 'stderr': str(e)}
+
+
+def detect_capabilities(runner: CommandRunner = None, proc_root: str = '/proc') -> Dict[str, Any]:
+    """
+    Detect host platform and healing capabilities
+    """
+    runner = runner or CommandRunner()
+    system = platform.system()
+
+    commands = ['systemctl', 'journalctl', 'sc', 'cleanmgr', 'powershell', 'ipconfig', 'rundll32']
+
+    return {
+        'platform': system,
+        'is_admin': os.geteuid() == 0 if hasattr(os, 'geteuid') else False,
+        'commands': {command: runner.which(command) is not None for command in commands},
+        'drop_caches': os.access(os.path.join(proc_root, 'sys', 'vm', 'drop_caches'), os.W_OK),
+        'compact_memory': os.access(os.path.join(proc_root, 'sys', 'vm', 'compact_memory'), os.W_OK)
+    }
+
+
+_default_capabilities = None
+_capabilities_lock = threading.Lock()
+
+
+def get_default_capabilities() -> Dict[str, Any]:
+    """Get host capabilities, detected once per process"""
+    global _default_capabilities
+    with _capabilities_lock:
+        if _default_capabilities is None:
+            _default_capabilities = detect_capabilities()
+        return _default_capabilities
+
+
+class HealingAction:
+    """
+    A platform-specific healing operation and the capabilities it needs
+    """
+
+    def __init__(self, name: str, category: str, platforms: List[str], func: Callable,
+                 requires: List[str] = None, description: str = ""):
+        self.name = name
+        self.category = category
+        self.platforms = platforms
+        self.func = func
+        self.requires = requires or []
+        self.description = description
+
+    def check(self, capabilities: Dict[str, Any]) -> Optional[str]:
+        """Return the reason this action cannot run on the host, or None"""
+        if capabilities['platform'] not in self.platforms:
+            return f"unsupported platform {capabilities['platform']}"
+
+        for requirement in self.requires:
+            if requirement.startswith('cmd:'):
+                command = requirement[4:]
+                if not capabilities['commands'].get(command):
+                    return f"{command} not available"
+            elif not capabilities.get(requirement):
+                return f"{requirement} not permitted"
+        return None
+
+
+class HealingActionRegistry:
+    """
+    Registry of healing actions keyed by category, filtered by host capabilities
+    """
+
+    def __init__(self, runner: CommandRunner = None, capabilities: Dict[str, Any] = None,
+                 proc_root: str = '/proc', async_runner: AsyncCommandRunner = None,
+                 services: Dict[str, List[str]] = None, discover_failed_units: bool = False):
+        self.runner = runner or CommandRunner()
+        self.async_runner = async_runner or AsyncCommandRunner()
+        self.proc_root = proc_root
+        if capabilities is None:
+            if runner is None and proc_root == '/proc':
+                capabilities = get_default_capabilities()
+            else:
+                capabilities = detect_capabilities(self.runner, proc_root)
+        self.capabilities = capabilities
+        self.services = services if services is not None else load_default_services(capabilities['platform'])
+        # Off by default: restarting every failed unit would touch services nobody chose
+        self.discover_failed_units = discover_failed_units
+        self.actions = {}
+        self.register_default_actions()
+
+    def configure_services(self, services: Dict[str, List[str]]):
+        """Set the services to watch (name -> names it depends on)"""
+        self.services = {name: list(deps) for name, deps in services.items()}
+
+    def set_failed_unit_discovery(self, enabled: bool):
+        """Opt in to restarting the units systemd reports as failed when no services are watched"""
+        self.discover_failed_units = enabled
+
+    def register(self, action: HealingAction):
+        """Register (or replace) a healing action"""
+        self.actions[action.name] = action
+
+    def register_default_actions(self):
+        """Register built-in Windows and Linux actions"""
+        # Memory
+        self.register(HealingAction(
+            'drop_page_cache', 'memory', ['Linux'], _drop_page_cache,
+            requires=['drop_caches'], description="Sync and drop the clean page cache"
+        ))
+        self.register(HealingAction(
+            'compact_memory', 'memory', ['Linux'], _compact_memory,
+            requires=['compact_memory'], description="Trigger kernel memory compaction"
+        ))
+        self.register(HealingAction(
+            'flush_dns_cache', 'memory', ['Windows'], _flush_dns_cache,
+            requires=['cmd:ipconfig'], description="DNS cache flush"
+        ))
+        self.register(HealingAction(
+            'process_idle_tasks', 'memory', ['Windows'], _process_idle_tasks,
+            requires=['cmd:rundll32'], description="Process idle tasks"
+        ))
+        self.register(HealingAction(
+            'close_large_windows', 'memory', ['Windows'], _close_large_windows,
+            requires=['cmd:powershell'], description="Large process cleanup"
+        ))
+
+        # Services
+        self.register(HealingAction(
+            'systemd_restart_services', 'service', ['Linux'], _systemd_restart_services,
+            requires=['cmd:systemctl', 'is_admin'], description="Restart stopped systemd services"
+        ))
+        self.register(HealingAction(
+            'sc_start_services', 'service', ['Windows'], _sc_start_services,
+            requires=['cmd:sc'], description="Start stopped Windows services"
+        ))
+
+        # Disk
+        self.register(HealingAction(
+            'journal_vacuum', 'disk', ['Linux'], _journal_vacuum,
+            requires=['cmd:journalctl', 'is_admin'], description="Vacuum the systemd journal"
+        ))
+        self.register(HealingAction(
+            'windows_disk_cleanup', 'disk', ['Windows'], _windows_disk_cleanup,
+            requires=['cmd:cleanmgr'], description="Windows Disk Cleanup"
+        ))
+        self.register(HealingAction(
+            'empty_recycle_bin', 'disk', ['Windows'], _empty_recycle_bin,
+            requires=['cmd:powershell'], description="Recycle Bin cleanup"
+        ))
+
+    def get_actions(self, category: str = None, available_only: bool = True) -> List[HealingAction]:
+        """Get registered actions, optionally only those the host supports"""
+        actions = [a for a in self.actions.values() if category is None or a.category == category]
+        if available_only:
+            actions = [a for a in actions if a.check(self.capabilities) is None]
+        return actions
+
+    def describe(self) -> List[Dict[str, Any]]:
+        """Get availability of every registered action"""
+        return [
+            {
+                'name': action.name,
+                'category': action.category,
+                'platforms': ', '.join(action.platforms),
+                'description': action.description,
+                'available': action.check(self.capabilities) is None,
+                'reason': action.check(self.capabilities) or ''
+            }
+            for action in self.actions.values()
+        ]
+
+    def run_action(self, name: str, **kwargs) -> Dict[str, Any]:
+        """Run a single action if the host supports it"""
+        action = self.actions.get(name)
+        if action is None:
+            return {'success': False, 'skipped': True, 'message': f"Unknown action {name}"}
+
+        reason = action.check(self.capabilities)
+        if reason:
+            return {'success': False, 'skipped': True, 'message': f"{name} skipped: {reason}"}
+
+        try:
+            result = action.func(self, **kwargs)
+            result.setdefault('skipped', False)
+            return result
+        except Exception as e:
+            return {'success': False, 'skipped': False, 'message': f"{name} failed: {e}"}
+
+    def run_category(self, category: str, **kwargs) -> Dict[str, Any]:
+        """
+        Run every available action in a category; unsupported actions are skipped without spawning
+        """
+        operations = []
+        skipped = []
+        results = {}
+
+        for action in self.get_actions(category, available_only=False):
+            reason = action.check(self.capabilities)
+            if reason:
+                skipped.append({'action': action.name, 'reason': reason})
+                continue
+
+            result = self.run_action(action.name, **kwargs)
+            results[action.name] = result
+            if result.get('success'):
+                operations.append(action.description or action.name)
+
+        return {
+            'operations': operations,
+            'skipped': skipped,
+            'results': results
+        }
+
+
+def _write_proc_value(registry: HealingActionRegistry, relative_path: str, value: str):
+    """Write a value to a /proc tunable"""
+    with open(os.path.join(registry.proc_root, relative_path), 'w') as f:
+        f.write(value)
+
+
+def _drop_page_cache(registry: HealingActionRegistry, **kwargs) -> Dict[str, Any]:
+    """Drop the clean page cache (dirty pages are synced first)"""
+    if hasattr(os, 'sync'):
+        os.sync()
+    _write_proc_value(registry, os.path.join('sys', 'vm', 'drop_caches'), '1')
+    return {'success': True, 'message': "Dropped page cache"}
+
+
+def _compact_memory(registry: HealingActionRegistry, **kwargs) -> Dict[str, Any]:
+    """Ask the kernel to compact memory"""
+    _write_proc_value(registry, os.path.join('sys', 'vm', 'compact_memory'), '1')
+    return {'success': True, 'message': "Triggered memory compaction"}
+
+
+def _flush_dns_cache(registry: HealingActionRegistry, **kwargs) -> Dict[str, Any]:
+    """Flush the Windows DNS resolver cache"""
+    result = registry.runner.run(['ipconfig', '/flushdns'])
+    return {'success': result['returncode'] == 0, 'message': result['stderr'] or "Flushed DNS cache"}
+
+
+def _process_idle_tasks(registry: HealingActionRegistry, **kwargs) -> Dict[str, Any]:
+    """Run pending Windows idle tasks"""
+    result = registry.runner.run(['rundll32.exe', 'advapi32.dll,ProcessIdleTasks'], timeout=10)
+    return {'success': result['returncode'] == 0, 'message': result['stderr'] or "Processed idle tasks"}
+
+
+def _close_large_windows(registry: HealingActionRegistry, **kwargs) -> Dict[str, Any]:
+    """Close main windows of processes with a large working set"""
+    result = registry.runner.run([
+        'powershell', '-Command',
+        'Get-Process | Where-Object {$_.WorkingSet -gt 100MB} | ForEach-Object {$_.CloseMainWindow()}'
+    ], timeout=15)
+    return {'success': result['returncode'] == 0, 'message': result['stderr'] or "Closed large process windows"}
+
+
+async def _list_failed_units(registry: HealingActionRegistry) -> Dict[str, List[str]]:
+    """Discover failed systemd services (only when opted in and no service set is configured)"""
+    listing = await registry.async_runner.run(
+        ['systemctl', 'list-units', '--failed', '--type=service', '--no-legend', '--plain'],
+        timeout=10
+    )
+    if listing['returncode'] != 0:
+        raise RuntimeError(listing['stderr'] or "systemctl list-units failed")
+    return {line.split()[0]: [] for line in listing['stdout'].splitlines() if line.split()}
+
+
+def _restart_services(registry: HealingActionRegistry, backend: str,
+                      services: Dict[str, List[str]] = None) -> Dict[str, Any]:
+    """Check services concurrently and restart stopped ones in dependency order"""
+    services = services if services is not None else registry.services
+    if not services and not (backend == 'systemd' and registry.discover_failed_units):
+        return {
+            'success': True,
+            'message': "No watched services",
+            'restarted_services': [],
+            'failed_services': [],
+            'service_statuses': {}
+        }
+
+    async def check_and_restart():
+        watched = services
+        if not watched:
+            watched = await _list_failed_units(registry)
+        manager = ServiceManager(backend, watched, runner=registry.async_runner)
+        return await manager.check_and_restart_async()
+
+    outcome = registry.async_runner.run_sync(check_and_restart)
+    restarted = outcome['restarted_services']
+    failed = outcome['failed_services']
+
+    message = f"Restarted {len(restarted)} of {len(restarted) + len(failed)} stopped services"
+    return {
+        'success': not failed,
+        'message': message,
+        'restarted_services': restarted,
+        'failed_services': failed,
+        'service_statuses': outcome['statuses']
+    }
+
+
+def _systemd_restart_services(registry: HealingActionRegistry, services: Dict[str, List[str]] = None,
+                              **kwargs) -> Dict[str, Any]:
+    """Restart stopped systemd services (failed units if opted in and no service set is configured)"""
+    return _restart_services(registry, 'systemd', services)
+
+
+def _sc_start_services(registry: HealingActionRegistry, services: Dict[str, List[str]] = None,
+                       **kwargs) -> Dict[str, Any]:
+    """Start stopped Windows services"""
+    return _restart_services(registry, 'windows', services)
+
+
+def _journal_vacuum(registry: HealingActionRegistry, max_size: str = '200M', **kwargs) -> Dict[str, Any]:
+    """Shrink archived systemd journal files"""
+    result = registry.runner.run(['journalctl', f'--vacuum-size={max_size}'], timeout=60)
+    return {
+        'success': result['returncode'] == 0,
+        'message': (result['stderr'] or result['stdout']).strip() or "Vacuumed journal"
+    }
+
+
+def _windows_disk_cleanup(registry: HealingActionRegistry, **kwargs) -> Dict[str, Any]:
+    """Run the Windows Disk Cleanup utility"""
+    result = registry.runner.run(['cleanmgr', '/sagerun:1'], timeout=60)
+    return {'success': result['returncode'] == 0, 'message': result['stderr'] or "Ran Disk Cleanup"}
+
+
+def _empty_recycle_bin(registry: HealingActionRegistry, **kwargs) -> Dict[str, Any]:
+    """Empty the Windows Recycle Bin"""
+    result = registry.runner.run([
+        'powershell', '-Command',
+        'Clear-RecycleBin -Force -ErrorAction SilentlyContinue'
+    ], timeout=30)
+    return {'success': result['returncode'] == 0, 'message': result['stderr'] or "Emptied Recycle Bin"}
@@ -0,0 +1,169 @@
+import math
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Any, Callable, Optional
+
+import psutil
+
+
+class EffectivenessTracker:
+    """
+    Measures system metrics before and after each healing action and keeps
+    running effectiveness statistics per action and issue category
+    """
+
+    def __init__(self, settle_seconds: float = 15.0,
+                 snapshot_provider: Callable[[], Dict[str, Any]] = None,
+                 min_runs: int = 2):
+        self.settle_seconds = settle_seconds
+        self.snapshot_provider = snapshot_provider or self.take_snapshot
+        self.min_runs = min_runs
+        self.stats = {}
+        self.pending = 0
+        self._lock = threading.Lock()
+
+    def take_snapshot(self) -> Dict[str, Any]:
+        """Sample the metrics healing actions are expected to move"""
+        memory = psutil.virtual_memory()
+
+        disk_used = 0
+        for partition in psutil.disk_partitions():
+            try:
+                disk_used += psutil.disk_usage(partition.mountpoint).used
+            except (PermissionError, OSError):
+                continue
+
+        return {
+            'timestamp': time.time(),
+            'cpu_percent': psutil.cpu_percent(interval=0.5),
+            'memory_used': memory.used,
+            'memory_percent': memory.percent,
+            'disk_used': disk_used,
+            'process_count': len(psutil.pids())
+        }
+
+    @staticmethod
+    def compute_relief(category: str, before: Dict[str, Any], after: Dict[str, Any]) -> float:
+        """Get the improvement in the metric an issue category is judged by (positive is better)"""
+        if category == 'memory':
+            return (before['memory_used'] - after['memory_used']) / (1024 * 1024)  # MB
+        if category == 'disk':
+            return (before['disk_used'] - after['disk_used']) / (1024 * 1024)  # MB
+        # cpu and process issues are judged by CPU load
+        return before['cpu_percent'] - after['cpu_percent']  # percentage points
+
+    def begin(self, action: str, category: str) -> Dict[str, Any]:
+        """Start a measurement just before an action runs"""
+        try:
+            before = self.snapshot_provider()
+        except Exception:
+            before = None
+
+        return {
+            'action': action,
+            'category': category or 'manual',
+            'before': before
+        }
+
+    def complete(self, measurement: Dict[str, Any], result: Optional[Dict[str, Any]]):
+        """Schedule the after-sample once the settling window has passed"""
+        if measurement['before'] is None or not result or not result.get('success'):
+            return
+
+        with self._lock:
+            self.pending += 1
+
+        if self.settle_seconds <= 0:
+            self._finish(measurement)
+            return
+
+        timer = threading.Timer(self.settle_seconds, self._finish, args=(measurement,))
+        timer.daemon = True
+        timer.start()
+
+    def _finish(self, measurement: Dict[str, Any]):
+        """Take the after-sample and attribute the delta to the action"""
+        try:
+            after = self.snapshot_provider()
+            self.record(measurement['action'], measurement['category'], measurement['before'], after)
+        except Exception:
+            pass
+        finally:
+            with self._lock:
+                self.pending -= 1
+
+    def record(self, action: str, category: str, before: Dict[str, Any], after: Dict[str, Any]) -> float:
+        """Fold one before/after pair into the running statistics"""
+        relief = self.compute_relief(category, before, after)
+
+        with self._lock:
+            key = (action, category)
+            entry = self.stats.get(key)
+            if entry is None:
+                entry = self.stats[key] = {
+                    'runs': 0,
+                    'mean_relief': 0.0,
+                    'm2': 0.0,
+                    'effective_runs': 0,
+                    'last_relief': 0.0,
+                    'last_measured': None
+                }
+
+            # Welford's online mean/variance
+            entry['runs'] += 1
+            delta = relief - entry['mean_relief']
+            entry['mean_relief'] += delta / entry['runs']
+            entry['m2'] += delta * (relief - entry['mean_relief'])
+
+            if relief > 0:
+                entry['effective_runs'] += 1
+            entry['last_relief'] = relief
+            entry['last_measured'] = datetime.now().isoformat()
+
+        return relief
+
+    def rank_actions(self, category: str, candidates: List[str]) -> List[str]:
+        """
+        Order candidate actions for a category: proven relievers first (best
+        mean relief), then untried actions in configured order, then the rest
+        """
+        proven = []
+        untried = []
+        unproductive = []
+
+        with self._lock:
+            for action in candidates:
+                entry = self.stats.get((action, category))
+                if entry is None or entry['runs'] < self.min_runs:
+                    untried.append(action)
+                elif entry['mean_relief'] > 0:
+                    proven.append((entry['mean_relief'], action))
+                else:
+                    unproductive.append((entry['mean_relief'], action))
+
+        proven.sort(key=lambda x: x[0], reverse=True)
+        unproductive.sort(key=lambda x: x[0], reverse=True)
+        return [a for _, a in proven] + untried + [a for _, a in unproductive]
+
+    def get_statistics(self) -> List[Dict[str, Any]]:
+        """Get effectiveness statistics per action and category"""
+        units = {'memory': 'MB', 'disk': 'MB'}
+        statistics = []
+
+        with self._lock:
+            for (action, category), entry in self.stats.items():
+                variance = entry['m2'] / (entry['runs'] - 1) if entry['runs'] > 1 else 0.0
+                statistics.append({
+                    'action': action,
+                    'category': category,
+                    'runs': entry['runs'],
+                    'mean_relief': entry['mean_relief'],
+                    'stddev_relief': math.sqrt(variance),
+                    'unit': units.get(category, '% CPU'),
+                    'effective_rate': entry['effective_runs'] / entry['runs'] * 100,
+                    'last_relief': entry['last_relief'],
+                    'last_measured': entry['last_measured']
+                })
+
+        return sorted(statistics, key=lambda x: (x['category'], -x['mean_relief']))
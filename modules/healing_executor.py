@@ -0,0 +1,275 @@
+import itertools
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from datetime import datetime
+from typing import Dict, List, Any, Callable, Optional
+
+
+class HealingJob:
+    """
+    Status handle for a healing action submitted to the executor
+    """
+
+    def __init__(self, job_id: int, action: str, func: Callable, args: tuple, kwargs: Dict[str, Any],
+                 priority: int, deadline: Optional[float], resource_class: str,
+                 on_complete: Optional[Callable[[Any], None]] = None):
+        self.job_id = job_id
+        self.action = action
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.resource_class = resource_class
+        self.on_complete = on_complete
+        self.submitted_at = time.time()
+        self.deadline_at = self.submitted_at + deadline if deadline else None
+        self.started_at = None
+        self.finished_at = None
+        self.status = 'queued'
+        self.error = None
+        self.future = Future()
+        self.timer = None  # deadline timer, cancelled once the job reaches a final status
+        self._lock = threading.Lock()
+
+    def _cancel_timer(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+    def done(self) -> bool:
+        """Check whether the job has a final status"""
+        return self.future.done()
+
+    def result(self, timeout: float = None) -> Any:
+        """Wait for the job result (raises TimeoutError on expiry)"""
+        return self.future.result(timeout=timeout)
+
+    def cancel(self) -> bool:
+        """Cancel the job if it has not started yet"""
+        with self._lock:
+            if self.status != 'queued' or not self.future.cancel():
+                return False
+            self.status = 'cancelled'
+            self.finished_at = time.time()
+        self._cancel_timer()
+
+        if self.on_complete:
+            try:
+                self.on_complete(None)
+            except Exception:
+                pass
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get a serializable view of the job status"""
+        elapsed = None
+        if self.started_at:
+            elapsed = (self.finished_at or time.time()) - self.started_at
+
+        return {
+            'job_id': self.job_id,
+            'action': self.action,
+            'status': self.status,
+            'priority': self.priority,
+            'resource_class': self.resource_class,
+            'submitted_at': datetime.fromtimestamp(self.submitted_at).isoformat(),
+            'deadline_at': datetime.fromtimestamp(self.deadline_at).isoformat() if self.deadline_at else None,
+            'elapsed_seconds': elapsed,
+            'error': self.error
+        }
+
+
+class HealingExecutor:
+    """
+    Executor that runs healing actions as prioritized jobs on per-resource-class worker pools
+    """
+
+    def __init__(self, pool_sizes: Dict[str, int] = None, max_jobs: int = 200):
+        self.pool_sizes = pool_sizes or {
+            'cpu': 1,         # process scans and kills
+            'io': 2,          # filesystem sweeps
+            'subprocess': 2   # external tools
+        }
+        self.max_jobs = max_jobs
+        self.jobs = OrderedDict()
+        self._queues = {name: queue.PriorityQueue() for name in self.pool_sizes}
+        self._workers = {name: [] for name in self.pool_sizes}
+        self._sequence = itertools.count(1)
+        self._lock = threading.Lock()
+        self._shutdown = threading.Event()
+
+    def submit(self, action: str, func: Callable, *args, priority: int = 5,
+               deadline: float = None, resource_class: str = 'io',
+               on_complete: Callable[[Any], None] = None, **kwargs) -> HealingJob:
+        """
+        Submit an action; lower priority values run first, deadline is in seconds
+        """
+        if resource_class not in self._queues:
+            raise ValueError(f"Unknown resource class: {resource_class}")
+        if self._shutdown.is_set():
+            raise RuntimeError("Executor has been shut down")
+
+        with self._lock:
+            job_id = next(self._sequence)
+            job = HealingJob(job_id, action, func, args, kwargs, priority,
+                             deadline, resource_class, on_complete)
+            self.jobs[job_id] = job
+            self._trim_jobs()
+            self._ensure_workers(resource_class)
+
+        if job.deadline_at:
+            job.timer = threading.Timer(job.deadline_at - job.submitted_at, self._expire, args=(job,))
+            job.timer.daemon = True
+            job.timer.start()
+
+        self._queues[resource_class].put((priority, job_id, job))
+        return job
+
+    def _ensure_workers(self, resource_class: str):
+        """Start worker threads for a resource class on first use"""
+        workers = self._workers[resource_class]
+        while len(workers) < self.pool_sizes[resource_class]:
+            worker = threading.Thread(
+                target=self._worker_loop,
+                args=(resource_class,),
+                name=f"healing-{resource_class}-{len(workers)}",
+                daemon=True
+            )
+            workers.append(worker)
+            worker.start()
+
+    def _trim_jobs(self):
+        """Drop the oldest finished jobs once the job table is full"""
+        if len(self.jobs) <= self.max_jobs:
+            return
+        for job_id in list(self.jobs.keys()):
+            if len(self.jobs) <= self.max_jobs:
+                break
+            if self.jobs[job_id].done():
+                del self.jobs[job_id]
+
+    def _worker_loop(self, resource_class: str):
+        """Run queued jobs for one resource class"""
+        job_queue = self._queues[resource_class]
+
+        while not self._shutdown.is_set():
+            try:
+                _, _, job = job_queue.get(timeout=1)
+            except queue.Empty:
+                continue
+
+            if job is None:
+                break
+
+            try:
+                self._run_job(job)
+            finally:
+                # The job is final now (or was already), so its deadline timer has nothing to do
+                job._cancel_timer()
+                job_queue.task_done()
+
+    def _run_job(self, job: HealingJob):
+        """Run a single job and resolve its future"""
+        if job.future.done():
+            # Cancelled or expired while waiting in the queue
+            return
+
+        if job.deadline_at and time.time() >= job.deadline_at:
+            self._expire(job)
+            return
+
+        with job._lock:
+            if not job.future.set_running_or_notify_cancel():
+                return
+            job.status = 'running'
+            job.started_at = time.time()
+        result = None
+        error = None
+
+        try:
+            result = job.func(*job.args, **job.kwargs)
+        except Exception as e:
+            error = e
+        finally:
+            job.finished_at = time.time()
+            # Notify before resolving the future so callers waiting on result() see its side effects
+            if job.on_complete:
+                try:
+                    job.on_complete(result)
+                except Exception:
+                    pass
+
+        with job._lock:
+            if error is not None:
+                job.error = str(error)
+            if job.status == 'running':
+                if error is None:
+                    job.status = 'completed'
+                    job.future.set_result(result)
+                else:
+                    job.status = 'failed'
+                    job.future.set_exception(error)
+
+    def _expire(self, job: HealingJob):
+        """Resolve a job whose deadline passed so waiting callers are released"""
+        with job._lock:
+            if job.future.done():
+                return
+
+            if job.status == 'queued':
+                if not job.future.cancel():
+                    return
+                job.status = 'expired'
+                job.finished_at = time.time()
+                notify = True
+            elif job.status == 'running':
+                # The worker cannot be pre-empted; its result is discarded when it finishes
+                job.status = 'timed_out'
+                job.error = 'Deadline exceeded'
+                job.future.set_exception(FutureTimeoutError(f"{job.action} exceeded its deadline"))
+                notify = False
+            else:
+                return
+
+        if notify and job.on_complete:
+            try:
+                job.on_complete(None)
+            except Exception:
+                pass
+
+    def get_job(self, job_id: int) -> Optional[HealingJob]:
+        """Get a job handle by ID"""
+        return self.jobs.get(job_id)
+
+    def get_jobs(self, limit: int = 50, active_only: bool = False) -> List[Dict[str, Any]]:
+        """Get status of recent jobs (newest first)"""
+        with self._lock:
+            jobs = list(self.jobs.values())
+
+        statuses = []
+        for job in reversed(jobs):
+            if active_only and job.status not in ('queued', 'running'):
+                continue
+            statuses.append(job.to_dict())
+            if len(statuses) >= limit:
+                break
+        return statuses
+
+    def get_queue_depths(self) -> Dict[str, int]:
+        """Get the number of queued jobs per resource class"""
+        return {name: q.qsize() for name, q in self._queues.items()}
+
+    def shutdown(self, wait: bool = True, timeout: float = 5):
+        """Stop accepting jobs and stop the worker threads"""
+        self._shutdown.set()
+        for name, job_queue in self._queues.items():
+            for _ in self._workers[name]:
+                job_queue.put((float('inf'), 0, None))
+
+        if wait:
+            for workers in self._workers.values():
+                for worker in workers:
+                    worker.join(timeout=timeout)
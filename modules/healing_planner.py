@@ -0,0 +1,263 @@
+import threading
+import time
+from typing import Dict, List, Any, Callable, Optional
+
+from .rate_limiter import ActionRateLimiter
+
+
+class HealingPlanner:
+    """
+    Healing planner that coalesces detected issues into distinct actions per
+    cycle and applies per-action cooldowns, concurrency locks and effect checks
+    """
+
+    # Limiter verdicts that skip the whole category rather than falling through to
+    # the next (usually more destructive) candidate
+    LIMITER_REASONS = ('circuit_open', 'backoff', 'rate_limited')
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self.action_rules = self.load_default_action_rules()
+        self.cooldowns = self.load_default_cooldowns()
+        self.ineffective_multiplier = 4.0
+        self.limiter = ActionRateLimiter(clock=lambda: self.clock())
+        self.action_state = {}
+        self._locks = {}
+        self._state_lock = threading.Lock()
+
+    def load_default_action_rules(self) -> Dict[str, Any]:
+        """Load default issue category to candidate healing actions mapping"""
+        return {
+            'cpu': {
+                'severities': ['high', 'medium'],
+                'actions': [
+                    {'action': 'kill_high_cpu_processes', 'method': 'kill_high_cpu_processes',
+                     'kwargs': {'cpu_threshold': 75.0}}
+                ]
+            },
+            'memory': {
+                'severities': ['high', 'medium'],
+                'actions': [
+                    # terminate_leak_suspects is opt-in (SelfHealer.set_leak_termination)
+                    {'action': 'free_memory', 'method': 'free_memory', 'kwargs': {}}
+                ]
+            },
+            'disk': {
+                'severities': ['high', 'medium'],
+                'actions': [
+                    {'action': 'clean_temp_files', 'method': 'clean_temp_files', 'kwargs': {}},
+                    {'action': 'disk_cleanup', 'method': 'disk_cleanup', 'kwargs': {}}
+                ]
+            },
+            'process': {
+                'severities': None,  # any severity
+                'actions': [
+                    {'action': 'restart_services', 'method': 'restart_unresponsive_services', 'kwargs': {}}
+                ]
+            }
+        }
+
+    def load_default_cooldowns(self) -> Dict[str, float]:
+        """Load default per-action cooldowns (seconds)"""
+        return {
+            'kill_high_cpu_processes': 60,
+            'throttle_high_cpu_processes': 60,
+            'free_memory': 120,
+            'terminate_leak_suspects': 300,
+            'clean_temp_files': 600,
+            'disk_cleanup': 900,
+            'restart_services': 300
+        }
+
+    def _get_state(self, action: str) -> Dict[str, Any]:
+        """Get (or create) the tracked state for an action"""
+        if action not in self.action_state:
+            self.action_state[action] = {
+                'in_flight': False,
+                'last_started': None,
+                'last_finished': None,
+                'last_effective': None,
+                'runs': 0,
+                'skips': 0
+            }
+            self._locks[action] = threading.Lock()
+        return self.action_state[action]
+
+    def get_cooldown(self, action: str) -> float:
+        """Get the current cooldown for an action, extended if its last run had no effect"""
+        cooldown = self.cooldowns.get(action, 0)
+        state = self.action_state.get(action)
+        if state and state['last_effective'] is False:
+            cooldown *= self.ineffective_multiplier
+        return cooldown
+
+    def _skip_reason(self, action: str, now: float) -> Optional[str]:
+        """Get the reason an action cannot run this cycle, or None"""
+        state = self._get_state(action)
+        if state['in_flight']:
+            return 'in_flight'
+        if state['last_finished'] is not None:
+            remaining = self.get_cooldown(action) - (now - state['last_finished'])
+            if remaining > 0:
+                return 'cooldown' if state['last_effective'] is not False else 'ineffective'
+        return self.limiter.check(action)
+
+    @staticmethod
+    def _fill_issue_kwargs(kwargs: Dict[str, Any], entry: Dict[str, Any], issue: Dict[str, Any]):
+        """Copy issue fields an action consumes into its arguments"""
+        for argument, field in entry.get('issue_kwargs', {}).items():
+            if argument not in kwargs and field in issue:
+                kwargs[argument] = issue[field]
+
+    def plan(self, issues: List[Dict[str, Any]],
+             ranker: Callable[[str, List[str]], List[str]] = None) -> Dict[str, Any]:
+        """
+        Deduplicate issues into a set of distinct actions for this cycle
+
+        Each category's candidate actions are tried in the order given by
+        ranker (category, action names) -> ordered names; the first one not
+        in flight or cooling down is planned. A candidate held back by its rate
+        limit, backoff or open circuit breaker skips the category for this cycle.
+        Ranking only applies to categories with several candidates: by default
+        disk, and memory once leak termination is enabled.
+        """
+        planned = {}
+        skipped = {}
+        now = self.clock()
+
+        with self._state_lock:
+            for issue in issues:
+                category = issue.get('category', '')
+                rule = self.action_rules.get(category)
+                if not rule:
+                    continue
+                if rule['severities'] is not None and issue.get('severity', '') not in rule['severities']:
+                    continue
+
+                candidates = {entry['action']: entry for entry in rule['actions']}
+                ordered = list(candidates.keys())
+                if ranker and len(ordered) > 1:
+                    ordered = [name for name in ranker(category, ordered) if name in candidates]
+
+                # Reuse an action already planned for this cycle
+                existing = next((name for name in ordered if name in planned), None)
+                if existing:
+                    planned[existing]['issues'].append(issue)
+                    self._fill_issue_kwargs(planned[existing]['kwargs'], candidates[existing], issue)
+                    continue
+
+                chosen = None
+                first_reason = None
+                for name in ordered:
+                    reason = self._skip_reason(name, now)
+                    if reason is None:
+                        chosen = name
+                        break
+                    if first_reason is None or reason in self.LIMITER_REASONS:
+                        first_reason = reason
+                    if reason in self.LIMITER_REASONS:
+                        break
+
+                if chosen:
+                    entry = candidates[chosen]
+                    kwargs = dict(entry['kwargs'])
+                    self._fill_issue_kwargs(kwargs, entry, issue)
+                    planned[chosen] = {
+                        'action': chosen,
+                        'method': entry['method'],
+                        'kwargs': kwargs,
+                        'category': category,
+                        'issues': [issue]
+                    }
+                elif ordered:
+                    top = ordered[0]
+                    if top in skipped:
+                        skipped[top]['issues'].append(issue)
+                    else:
+                        self.action_state[top]['skips'] += 1
+                        skipped[top] = {
+                            'action': top,
+                            'reason': first_reason,
+                            'issues': [issue]
+                        }
+
+        return {
+            'actions': list(planned.values()),
+            'skipped': list(skipped.values())
+        }
+
+    def begin(self, action: str) -> Optional[str]:
+        """
+        Mark an action as in flight; returns why it cannot start ('in_flight' if a
+        previous run still holds it, or one of LIMITER_REASONS), or None once started
+        """
+        with self._state_lock:
+            state = self._get_state(action)
+            lock = self._locks[action]
+
+        if not lock.acquire(blocking=False):
+            return 'in_flight'
+
+        reason = self.limiter.acquire(action)
+        if reason:
+            lock.release()
+            return reason
+
+        with self._state_lock:
+            state['in_flight'] = True
+            state['last_started'] = self.clock()
+        return None
+
+    def finish(self, action: str, result: Optional[Dict[str, Any]]):
+        """Record the outcome of an action run and release its lock"""
+        with self._state_lock:
+            state = self._get_state(action)
+            state['in_flight'] = False
+            state['last_finished'] = self.clock()
+            state['last_effective'] = self.measure_effect(action, result)
+            state['runs'] += 1
+            lock = self._locks[action]
+            effective = state['last_effective']
+
+        if lock.locked():
+            lock.release()
+
+        self.limiter.record(action, bool(result and result.get('success')), effective)
+
+    def measure_effect(self, action: str, result: Optional[Dict[str, Any]]) -> bool:
+        """Decide whether an action run made a measurable difference"""
+        if not result or not result.get('success'):
+            return False
+
+        effect_keys = {
+            'kill_high_cpu_processes': 'killed_processes',
+            'throttle_high_cpu_processes': 'throttled_processes',
+            'free_memory': 'operations',  # memory freed is measured after settling
+            'terminate_leak_suspects': 'terminated_processes',
+            'clean_temp_files': 'files_removed',
+            'disk_cleanup': 'operations',
+            'restart_services': 'restarted_services'
+        }
+        key = effect_keys.get(action)
+        if key is None:
+            return True
+
+        value = result.get(key)
+        if isinstance(value, (list, tuple, dict)):
+            return len(value) > 0
+        return bool(value and value > 0)
+
+    def get_action_states(self) -> Dict[str, Dict[str, Any]]:
+        """Get a copy of the tracked state for every action"""
+        with self._state_lock:
+            return {action: dict(state) for action, state in self.action_state.items()}
+
+    def reset(self, action: str = None):
+        """Clear cooldown, backoff and circuit breaker state for one action or all actions"""
+        with self._state_lock:
+            for name in ([action] if action else list(self.action_state.keys())):
+                state = self.action_state.get(name)
+                if state and not state['in_flight']:
+                    state['last_finished'] = None
+                    state['last_effective'] = None
+        self.limiter.reset(action)
@@ -0,0 +1,610 @@
+import json
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from .event_bus import EventBus
+from .healing_actions import HealingActionRegistry
+from .healing_effectiveness import EffectivenessTracker
+from .self_healer import SelfHealer
+from .system_monitor import SystemMonitor
+from .system_sampler import SNAPSHOT_TOPIC
+
+MB = 1024 * 1024
+
+# Capabilities of the simulated host: no platform actions, so nothing touches the real machine
+SIMULATED_CAPABILITIES = {
+    'platform': 'Simulated',
+    'is_admin': False,
+    'commands': {},
+    'drop_caches': False,
+    'compact_memory': False
+}
+
+
+class MockHost:
+    """
+    Process table, memory, filesystem and clock replayed from a trace; healing actions mutate it
+
+    Trace frames describe what the host would look like without intervention:
+    {'t': seconds, 'cpu_percent': ..., 'cpu_count': ...,
+     'memory': {'total_mb', 'used_mb', 'cache_mb'},
+     'disks': [{'device', 'mountpoint', 'total_mb', 'used_mb', 'temp_mb', 'reclaimable_mb'}],
+     'processes': [{'pid', 'name', 'cpu_percent', 'memory_mb', 'status', 'create_time', 'culprit'}]}
+    """
+
+    def __init__(self, cache_regrow_seconds: float = 600.0, throttle_cpu_percent: float = 50.0):
+        self.cache_regrow_seconds = cache_regrow_seconds
+        self.throttle_cpu_percent = throttle_cpu_percent
+        self.now = 0.0
+        self.frame = {'t': 0.0, 'cpu_percent': 0.0, 'memory': {}, 'disks': [], 'processes': []}
+        self.removed = {}  # (pid, create_time) -> how the process was removed
+        self.throttled = set()
+        self.cache_dropped_at = None
+        self.cleaned_temp_mb = {}
+        self.cleaned_reclaimable_mb = {}
+
+    def clock(self) -> float:
+        return self.now
+
+    @staticmethod
+    def _key(proc: Dict[str, Any]):
+        return (proc['pid'], proc.get('create_time'))
+
+    def load_frame(self, frame: Dict[str, Any]):
+        """Advance the simulated clock to a trace frame"""
+        self.frame = frame
+        self.now = float(frame['t'])
+        present = {self._key(proc) for proc in frame.get('processes', [])}
+        self.throttled &= present
+
+    def _cpu_count(self) -> int:
+        return self.frame.get('cpu_count', 4)
+
+    def _effective_cpu(self, proc: Dict[str, Any]) -> float:
+        cpu = proc.get('cpu_percent', 0.0)
+        if self._key(proc) in self.throttled:
+            return min(cpu, self.throttle_cpu_percent)
+        return cpu
+
+    def processes(self) -> List[Dict[str, Any]]:
+        """Get live processes with throttling applied"""
+        live = []
+        for proc in self.frame.get('processes', []):
+            if self._key(proc) in self.removed:
+                continue
+            entry = dict(proc)
+            entry.setdefault('status', 'running')
+            entry['cpu_percent'] = self._effective_cpu(proc)
+            live.append(entry)
+        return live
+
+    def cpu_percent(self) -> float:
+        saved = 0.0
+        for proc in self.frame.get('processes', []):
+            saved += proc.get('cpu_percent', 0.0) - (
+                0.0 if self._key(proc) in self.removed else self._effective_cpu(proc))
+        return max(0.0, min(100.0, self.frame.get('cpu_percent', 0.0) - saved / self._cpu_count()))
+
+    def memory(self) -> Dict[str, Any]:
+        memory = self.frame.get('memory', {})
+        total_mb = memory.get('total_mb', 16384)
+        used_mb = memory.get('used_mb', 0.0)
+
+        used_mb -= sum(proc.get('memory_mb', 0.0) for proc in self.frame.get('processes', [])
+                       if self._key(proc) in self.removed)
+
+        # Dropped page cache grows back linearly
+        if self.cache_dropped_at is not None:
+            regrown = (self.now - self.cache_dropped_at) / self.cache_regrow_seconds
+            if regrown < 1:
+                used_mb -= memory.get('cache_mb', 0.0) * (1 - regrown)
+
+        used_mb = max(0.0, used_mb)
+        return {
+            'total': total_mb * MB,
+            'used': used_mb * MB,
+            'available': (total_mb - used_mb) * MB,
+            'percent': used_mb / total_mb * 100 if total_mb else 0.0
+        }
+
+    def disks(self) -> List[Dict[str, Any]]:
+        disks = []
+        for disk in self.frame.get('disks', []):
+            device = disk['device']
+            used_mb = disk.get('used_mb', 0.0)
+            used_mb -= min(self.cleaned_temp_mb.get(device, 0.0), disk.get('temp_mb', 0.0))
+            used_mb -= min(self.cleaned_reclaimable_mb.get(device, 0.0), disk.get('reclaimable_mb', 0.0))
+            total_mb = disk.get('total_mb', 0.0)
+            disks.append({
+                'device': device,
+                'mountpoint': disk.get('mountpoint', device),
+                'total': total_mb * MB,
+                'used': used_mb * MB,
+                'free': (total_mb - used_mb) * MB,
+                'percent': used_mb / total_mb * 100 if total_mb else 0.0
+            })
+        return disks
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get a snapshot shaped like SystemMonitor.collect_snapshot()"""
+        return {
+            'timestamp': datetime.fromtimestamp(self.now).isoformat(),
+            'cpu_percent': self.cpu_percent(),
+            'memory': self.memory(),
+            'disks': self.disks(),
+            'processes': self.processes()
+        }
+
+    def effect_snapshot(self) -> Dict[str, Any]:
+        """Get a snapshot shaped like EffectivenessTracker.take_snapshot()"""
+        memory = self.memory()
+        return {
+            'cpu_percent': self.cpu_percent(),
+            'memory_used': memory['used'],
+            'memory_percent': memory['percent'],
+            'disk_used': sum(disk['used'] for disk in self.disks()),
+            'process_count': len(self.processes())
+        }
+
+    def remove_process(self, proc: Dict[str, Any], reason: str):
+        self.removed[self._key(proc)] = reason
+        self.throttled.discard(self._key(proc))
+
+    def throttle(self, proc: Dict[str, Any]) -> bool:
+        key = self._key(proc)
+        if key in self.throttled:
+            return False
+        self.throttled.add(key)
+        return True
+
+    def release_all(self) -> int:
+        count = len(self.throttled)
+        self.throttled.clear()
+        return count
+
+    def drop_cache(self) -> float:
+        before = self.memory()['used']
+        self.cache_dropped_at = self.now
+        return (before - self.memory()['used']) / MB
+
+    def clean_temp(self) -> float:
+        freed = 0.0
+        for disk in self.frame.get('disks', []):
+            device = disk['device']
+            temp_mb = disk.get('temp_mb', 0.0)
+            freed += max(0.0, temp_mb - self.cleaned_temp_mb.get(device, 0.0))
+            self.cleaned_temp_mb[device] = temp_mb
+        return freed
+
+    def clean_reclaimable(self) -> float:
+        freed = 0.0
+        for disk in self.frame.get('disks', []):
+            device = disk['device']
+            reclaimable_mb = disk.get('reclaimable_mb', 0.0)
+            freed += max(0.0, reclaimable_mb - self.cleaned_reclaimable_mb.get(device, 0.0))
+            self.cleaned_reclaimable_mb[device] = reclaimable_mb
+        return freed
+
+
+class SimulatedHealer(SelfHealer):
+    """
+    SelfHealer whose host-facing actions operate on a MockHost instead of the real machine
+    """
+
+    def __init__(self, host: MockHost):
+        registry = HealingActionRegistry(capabilities=dict(SIMULATED_CAPABILITIES), services={})
+        super().__init__(action_registry=registry)
+        self.host = host
+        self.planner.clock = host.clock
+        self.effectiveness = EffectivenessTracker(settle_seconds=0, snapshot_provider=host.effect_snapshot)
+        self.kills = []
+
+    def _candidates(self, cpu_threshold: float, exclude_processes: Optional[List[str]]):
+        excluded = self.protected_processes if exclude_processes is None else exclude_processes
+        return [proc for proc in self.host.processes()
+                if proc['cpu_percent'] > cpu_threshold and proc['name'] not in excluded]
+
+    def _record_kill(self, proc: Dict[str, Any], action: str):
+        self.host.remove_process(proc, action)
+        self.kills.append({
+            'time': self.host.now,
+            'action': action,
+            'pid': proc['pid'],
+            'name': proc['name'],
+            'culprit': bool(proc.get('culprit'))
+        })
+
+    def kill_high_cpu_processes(self, cpu_threshold: float = 80.0,
+                               exclude_processes: List[str] = None) -> Dict[str, Any]:
+        killed_processes = []
+        for proc in self._candidates(cpu_threshold, exclude_processes):
+            self._record_kill(proc, 'kill_high_cpu_processes')
+            killed_processes.append({'pid': proc['pid'], 'name': proc['name'], 'cpu_percent': proc['cpu_percent']})
+
+        message = f"Killed {len(killed_processes)} high CPU processes"
+        self.log_action("kill_high_cpu_processes", True, message)
+        return {'success': True, 'message': message, 'killed_processes': killed_processes}
+
+    def throttle_high_cpu_processes(self, cpu_threshold: float = 80.0,
+                                    exclude_processes: List[str] = None,
+                                    methods: List[str] = None) -> Dict[str, Any]:
+        throttled_processes = []
+        for proc in self._candidates(cpu_threshold, exclude_processes):
+            if self.host.throttle(proc):
+                throttled_processes.append({'pid': proc['pid'], 'name': proc['name'],
+                                            'cpu_percent': proc['cpu_percent'], 'applied': ['simulated']})
+
+        message = f"Throttled {len(throttled_processes)} high CPU processes"
+        self.log_action("throttle_high_cpu_processes", True, message)
+        return {'success': True, 'message': message, 'throttled_processes': throttled_processes}
+
+    def release_throttles(self, force: bool = False) -> Dict[str, Any]:
+        if not self.host.throttled:
+            return {'success': True, 'message': "No throttled processes", 'released': []}
+        if not force and self.host.cpu_percent() >= self.throttle_release_threshold:
+            return {'success': True, 'message': "CPU still high, keeping throttles", 'released': []}
+
+        released = self.host.release_all()
+        message = f"Released throttles on {released} processes"
+        self.log_action("release_throttles", True, message)
+        return {'success': True, 'message': message, 'released': list(range(released))}
+
+    def get_throttled_processes(self) -> List[Dict[str, Any]]:
+        return [{'pid': pid, 'create_time': create_time} for pid, create_time in self.host.throttled]
+
+    def free_memory(self) -> Dict[str, Any]:
+        memory_freed_mb = self.host.drop_cache()
+        message = f"Memory optimization completed. Freed: {memory_freed_mb:.1f} MB"
+        self.log_action("free_memory", True, message)
+        operations = ['simulated cache drop'] if memory_freed_mb > 0 else []
+        return {'success': True, 'message': message, 'operations': operations,
+                'actions_taken': ['simulated cache drop']}
+
+    def terminate_leak_suspects(self, leak_suspects: List[Dict[str, Any]] = None,
+                                max_hours_to_oom: float = 6.0, max_terminations: int = 1,
+                                exclude_processes: List[str] = None, min_observed_seconds: float = 3600.0,
+                                min_growth_mb: float = 512.0) -> Dict[str, Any]:
+        excluded = self.protected_processes if exclude_processes is None else exclude_processes
+        live = {proc['pid']: proc for proc in self.host.processes()}
+        terminated_processes = []
+
+        for suspect in leak_suspects or []:
+            if len(terminated_processes) >= max_terminations:
+                break
+            if suspect.get('hours_to_oom') is None or suspect['hours_to_oom'] > max_hours_to_oom:
+                continue
+            if (suspect.get('observed_seconds', 0) < min_observed_seconds or
+                    suspect.get('growth_mb', 0) < min_growth_mb):
+                continue
+            proc = live.get(suspect['pid'])
+            if proc is None or proc['name'] in excluded:
+                continue
+            self._record_kill(proc, 'terminate_leak_suspects')
+            terminated_processes.append({'pid': proc['pid'], 'name': proc['name'], 'rss_mb': proc.get('memory_mb')})
+
+        message = f"Terminated {len(terminated_processes)} leak suspects"
+        self.log_action("terminate_leak_suspects", True, message)
+        return {'success': True, 'message': message, 'terminated_processes': terminated_processes}
+
+    def clean_temp_files(self) -> Dict[str, Any]:
+        space_freed_mb = self.host.clean_temp()
+        message = f"Cleaned temporary files. Freed: {space_freed_mb:.1f} MB"
+        self.log_action("clean_temp_files", True, message)
+        return {'success': True, 'message': message, 'files_removed': int(space_freed_mb > 0),
+                'space_freed_mb': space_freed_mb}
+
+    def disk_cleanup(self) -> Dict[str, Any]:
+        space_freed_mb = self.host.clean_reclaimable()
+        operations = ['simulated disk cleanup'] if space_freed_mb > 0 else []
+        message = f"Disk cleanup completed. Freed: {space_freed_mb:.1f} MB"
+        self.log_action("disk_cleanup", True, message)
+        return {'success': True, 'message': message, 'operations': operations}
+
+    def restart_unresponsive_services(self, services: Dict[str, List[str]] = None) -> Dict[str, Any]:
+        # Restarting the owning service reaps its zombie children
+        restarted_services = []
+        for proc in self.host.processes():
+            if proc.get('status') == 'zombie':
+                self.host.remove_process(proc, 'restart_services')
+                restarted_services.append(proc['name'])
+
+        message = f"Restarted {len(restarted_services)} services"
+        self.log_action("restart_services", True, message)
+        return {'success': True, 'message': message, 'restarted_services': restarted_services}
+
+    def _run_measured(self, action: str, method: str, category: str, **kwargs) -> Dict[str, Any]:
+        """Mock effects are immediate, so the measurement is recorded without a settling window"""
+        before = self.host.effect_snapshot()
+        result = getattr(self, method)(**kwargs)
+        if result and result.get('success'):
+            self.effectiveness.record(action, category or 'manual', before, self.host.effect_snapshot())
+        return result
+
+
+def apply_policy(healer: SelfHealer, monitor: SystemMonitor, policy: Dict[str, Any]):
+    """
+    Configure a healer and monitor from a policy description
+
+    Recognised keys: cpu_healing_mode, leak_termination (bool), thresholds (issue rule -> {level: threshold},
+    applied to the monitor's rule engine), cooldowns, action_kwargs (action -> kwargs),
+    disabled_actions and throttle_release_threshold.
+    """
+    healer.set_cpu_healing_mode(policy.get('cpu_healing_mode', 'throttle'))
+    healer.set_leak_termination(policy.get('leak_termination', False))
+
+    for rule_name, levels in policy.get('thresholds', {}).items():
+        monitor.set_issue_thresholds(rule_name, levels)
+
+    healer.planner.cooldowns.update(policy.get('cooldowns', {}))
+
+    disabled = set(policy.get('disabled_actions', []))
+    action_kwargs = policy.get('action_kwargs', {})
+    for rule in healer.planner.action_rules.values():
+        rule['actions'] = [dict(entry, kwargs=dict(entry['kwargs'], **action_kwargs.get(entry['action'], {})))
+                           for entry in rule['actions'] if entry['action'] not in disabled]
+
+    if 'throttle_release_threshold' in policy:
+        healer.throttle_release_threshold = policy['throttle_release_threshold']
+
+
+class HealingSimulator:
+    """
+    Replays a recorded trace against healing policies, much faster than real time
+    """
+
+    def __init__(self, trace: List[Dict[str, Any]]):
+        self.trace = sorted(trace, key=lambda frame: frame['t'])
+
+    def run(self, policy: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one policy over the trace and score it"""
+        host = MockHost()
+        monitor = SystemMonitor()
+        healer = SimulatedHealer(host)
+        apply_policy(healer, monitor, policy)
+        healing_enabled = policy.get('enabled', True)
+
+        incidents = []
+        open_incident = None
+        actions_by_type = {}
+        skipped_actions = 0
+        unhealthy_seconds = 0.0
+        previous_t = None
+        cpu_seconds = 0.0
+        wall_started = time.perf_counter()
+
+        try:
+            for frame in self.trace:
+                host.load_frame(frame)
+                cpu_started = time.process_time()
+
+                snapshot = host.snapshot()
+                monitor.leak_detector.update(snapshot['processes'], timestamp=host.now)
+                snapshot['leak_suspects'] = monitor.leak_detector.get_suspects(
+                    limit=5, available_mb=snapshot['memory']['available'] / MB)
+                issues = monitor.evaluate_issues(snapshot)
+
+                if previous_t is not None and open_incident is not None:
+                    unhealthy_seconds += host.now - previous_t
+                previous_t = host.now
+
+                if issues and open_incident is None:
+                    open_incident = {'start': host.now, 'categories': sorted({i['category'] for i in issues})}
+                elif not issues and open_incident is not None:
+                    open_incident['end'] = host.now
+                    open_incident['time_to_recovery'] = host.now - open_incident['start']
+                    incidents.append(open_incident)
+                    open_incident = None
+
+                if healing_enabled:
+                    if issues:
+                        result = healer.auto_heal(issues, wait=True)
+                        skipped_actions += len(result.get('skipped_actions', []))
+                        for entry in result.get('healing_results', []):
+                            actions_by_type[entry['action']] = actions_by_type.get(entry['action'], 0) + 1
+                    else:
+                        healer.release_throttles()
+
+                cpu_seconds += time.process_time() - cpu_started
+        finally:
+            healer.executor.shutdown(wait=False)
+
+        wall_seconds = time.perf_counter() - wall_started
+        simulated_seconds = self.trace[-1]['t'] - self.trace[0]['t'] if self.trace else 0.0
+
+        if open_incident is not None:
+            open_incident['end'] = None
+            open_incident['time_to_recovery'] = None
+            incidents.append(open_incident)
+
+        recovered = [i['time_to_recovery'] for i in incidents if i['time_to_recovery'] is not None]
+        collateral = [kill for kill in healer.kills if not kill['culprit']]
+
+        return {
+            'policy': policy.get('name', 'unnamed'),
+            'frames': len(self.trace),
+            'simulated_seconds': simulated_seconds,
+            'wall_seconds': wall_seconds,
+            'speedup': simulated_seconds / wall_seconds if wall_seconds > 0 else None,
+            'incidents': len(incidents),
+            'unresolved_incidents': len(incidents) - len(recovered),
+            'mean_time_to_recovery': sum(recovered) / len(recovered) if recovered else None,
+            'max_time_to_recovery': max(recovered) if recovered else None,
+            'unhealthy_seconds': unhealthy_seconds,
+            'actions_taken': sum(actions_by_type.values()),
+            'actions_by_type': actions_by_type,
+            'skipped_actions': skipped_actions,
+            'processes_killed': len(healer.kills),
+            'collateral_kills': len(collateral),
+            'cpu_seconds': cpu_seconds,
+            'incident_details': incidents,
+            'kills': healer.kills
+        }
+
+
+def benchmark_policies(trace: List[Dict[str, Any]], policies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Score several policies on the same trace
+
+    Results are ranked by unresolved incidents, collateral kills, time spent
+    unhealthy and actions taken, in that order.
+    """
+    simulator = HealingSimulator(trace)
+    results = [simulator.run(policy) for policy in policies]
+    results.sort(key=lambda r: (r['unresolved_incidents'], r['collateral_kills'],
+                                r['unhealthy_seconds'], r['actions_taken']))
+    return results
+
+
+def load_trace(path: str) -> List[Dict[str, Any]]:
+    """Load a trace from a JSON array or a JSON-lines file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read().strip()
+    if content.startswith('['):
+        return json.loads(content)
+    return [json.loads(line) for line in content.splitlines() if line.strip()]
+
+
+def snapshot_to_frame(snapshot: Dict[str, Any], origin: float) -> Dict[str, Any]:
+    """Convert a SystemMonitor snapshot into a trace frame relative to origin (epoch seconds)"""
+    memory = snapshot['memory']
+    frame = {
+        't': datetime.fromisoformat(snapshot['timestamp']).timestamp() - origin,
+        'cpu_percent': snapshot['cpu_percent'],
+        'memory': {
+            'total_mb': memory['total'] / MB,
+            'used_mb': memory['used'] / MB,
+            'cache_mb': max(0, memory['available'] - memory['free']) / MB
+        },
+        'disks': [
+            {
+                'device': disk['device'],
+                'mountpoint': disk['mountpoint'],
+                'total_mb': disk['total'] / MB,
+                'used_mb': disk['used'] / MB
+            }
+            for disk in snapshot['disks']
+        ]
+    }
+
+    if 'processes' in snapshot:
+        frame['processes'] = [
+            {
+                'pid': proc['pid'],
+                'name': proc.get('name') or '',
+                'cpu_percent': proc.get('cpu_percent') or 0.0,
+                'memory_mb': proc.get('memory_mb', 0.0),
+                'status': proc.get('status', 'running'),
+                'create_time': proc['create_time'] - origin if proc.get('create_time') else None
+            }
+            for proc in snapshot['processes']
+        ]
+    return frame
+
+
+class TraceRecorder:
+    """
+    Records sampler snapshots from the event bus into a JSON-lines trace file
+    """
+
+    def __init__(self, bus: EventBus, path: str):
+        self.bus = bus
+        self.path = path
+        self.origin = None
+        self.frames_written = 0
+        self._file = open(path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+        self.token = bus.subscribe(SNAPSHOT_TOPIC, self.on_snapshot)
+
+    def on_snapshot(self, snapshot: Dict[str, Any]):
+        with self._lock:
+            if self._file is None:
+                return
+            if self.origin is None:
+                self.origin = datetime.fromisoformat(snapshot['timestamp']).timestamp()
+            self._file.write(json.dumps(snapshot_to_frame(snapshot, self.origin)) + '\n')
+            self._file.flush()
+            self.frames_written += 1
+
+    def close(self):
+        """Stop recording"""
+        self.bus.unsubscribe(self.token)
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+
+def generate_sample_trace(duration: float = 7200, interval: float = 5.0, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Build a synthetic trace with a CPU storm, a slow memory leak, a filling disk and a zombie
+
+    Culprit processes are flagged so collateral kills can be told apart.
+    """
+    rng = random.Random(seed)
+    frames = []
+    total_mb = 16384
+
+    background = [
+        {'pid': 100 + i, 'name': name, 'create_time': -86400.0}
+        for i, name in enumerate(['postgres', 'nginx', 'python', 'node', 'java', 'redis'])
+    ]
+
+    t = 0.0
+    while t <= duration:
+        processes = []
+        for proc in background:
+            processes.append(dict(proc, cpu_percent=rng.uniform(2, 25), memory_mb=rng.uniform(100, 600),
+                                  status='running'))
+
+        # CPU storm: a runaway build job, with a busy but legitimate database alongside it
+        if 1200 <= t < 3000:
+            processes.append({'pid': 4242, 'name': 'runaway-build', 'create_time': 1190.0,
+                              'cpu_percent': rng.uniform(330, 390), 'memory_mb': 800.0,
+                              'status': 'running', 'culprit': True})
+            processes[0]['cpu_percent'] = rng.uniform(85, 95)
+
+        # Slow leak in a long-lived worker
+        leak_mb = 500 + t * 1.6
+        processes.append({'pid': 777, 'name': 'leaky-worker', 'create_time': -3600.0,
+                          'cpu_percent': rng.uniform(1, 5), 'memory_mb': leak_mb,
+                          'status': 'running', 'culprit': True})
+
+        # A zombie left behind for a while
+        if 4000 <= t < 4600:
+            processes.append({'pid': 999, 'name': 'defunct-child', 'create_time': 3990.0,
+                              'cpu_percent': 0.0, 'memory_mb': 0.0, 'status': 'zombie', 'culprit': True})
+
+        cpu_percent = min(100.0, 8 + sum(p['cpu_percent'] for p in processes) / 4)
+        used_mb = 4000 + sum(p['memory_mb'] for p in processes) + 2500
+        temp_mb = 2000 + t * 4.0
+
+        frames.append({
+            't': t,
+            'cpu_percent': cpu_percent,
+            'cpu_count': 4,
+            'memory': {'total_mb': total_mb, 'used_mb': min(used_mb, total_mb), 'cache_mb': 2500},
+            'disks': [{'device': '/dev/sda1', 'mountpoint': '/', 'total_mb': 100000,
+                       'used_mb': 78000 + temp_mb, 'temp_mb': temp_mb, 'reclaimable_mb': 3000}],
+            'processes': processes
+        })
+        t += interval
+
+    return frames
+
+
+def load_default_policies() -> List[Dict[str, Any]]:
+    """Policy variants compared by default"""
+    return [
+        {'name': 'no_healing', 'enabled': False},
+        {'name': 'kill', 'cpu_healing_mode': 'kill'},
+        {'name': 'throttle', 'cpu_healing_mode': 'throttle'},
+        {'name': 'throttle_leak_termination', 'cpu_healing_mode': 'throttle', 'leak_termination': True},
+        {'name': 'throttle_short_cooldowns', 'cpu_healing_mode': 'throttle',
+         'cooldowns': {'throttle_high_cpu_processes': 15, 'free_memory': 30, 'clean_temp_files': 120}},
+        {'name': 'kill_conservative', 'cpu_healing_mode': 'kill',
+         'thresholds': {'cpu': {'warning': 85}},
+         'action_kwargs': {'kill_high_cpu_processes': {'cpu_threshold': 150.0}}}
+    ]
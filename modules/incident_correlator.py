@@ -0,0 +1,268 @@
+import itertools
+import socket
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+SEVERITY_ORDER = {'info': 0, 'warning': 1, 'critical': 2}
+
+
+class Incident:
+    """A group of correlated alerts notified as one"""
+
+    __slots__ = ('id', 'opened_at', 'updated_at', 'root_alert', 'alert_ids', 'alert_count',
+                 'categories', 'severity', 'keys', 'notified_severity', 'notified_categories',
+                 'notifications', 'suppressed')
+
+    def __init__(self, incident_id: str, alert: Dict[str, Any], now: float):
+        self.id = incident_id
+        self.opened_at = now
+        self.updated_at = now
+        self.root_alert = alert
+        self.alert_ids = []
+        self.alert_count = 0
+        self.categories = []
+        self.severity = 'info'
+        self.keys = set()
+        self.notified_severity = None
+        self.notified_categories = 0
+        self.notifications = 0
+        self.suppressed = 0
+
+    def to_dict(self, window: float, now: float) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'status': 'active' if now - self.opened_at <= window else 'closed',
+            'opened_at': datetime.fromtimestamp(self.opened_at).isoformat(),
+            'updated_at': datetime.fromtimestamp(self.updated_at).isoformat(),
+            'severity': self.severity,
+            'root_category': self.root_alert.get('category'),
+            'root_message': self.root_alert.get('message'),
+            'categories': list(self.categories),
+            'alert_count': self.alert_count,
+            'alert_ids': list(self.alert_ids),
+            'notifications': self.notifications,
+            'suppressed': self.suppressed
+        }
+
+
+class IncidentCorrelator:
+    """
+    Groups alerts into incidents by time proximity, shared labels (PID, device)
+    and causal links between categories on the same host
+
+    An alert joins an incident opened less than window seconds earlier that
+    shares one of its labels, or that already holds a category causally linked
+    to the alert's. Incidents close window seconds after their first alert,
+    however often their alerts are updated, so an incident cannot absorb
+    unrelated alerts indefinitely. Each alert is matched through a handful of
+    correlation keys looked up in a dict, so correlation is O(1) amortized;
+    at most max_incidents are kept.
+    """
+
+    LABEL_KEYS = ('pid', 'device', 'nic')
+
+    def __init__(self, window: float = 300, max_incidents: int = 500, max_alert_ids: int = 50,
+                 causal_links: List[Tuple[str, str]] = None, host: str = None,
+                 clock: Callable[[], float] = time.time):
+        self.window = window
+        self.max_incidents = max_incidents
+        self.max_alert_ids = max_alert_ids  # alert IDs kept per incident (the count is exact)
+        self.host = host or socket.gethostname()
+        self.clock = clock
+        self.incidents = OrderedDict()  # id -> Incident, oldest first
+        self._by_key = {}               # correlation key -> incident id
+        self._ids = itertools.count(1)
+        self._links = {}  # category -> link keys
+        self.set_causal_links(causal_links if causal_links is not None else self.load_default_causal_links())
+        self._lock = threading.Lock()
+
+    def reserve_ids(self, incident_ids: List[str]):
+        """Continue numbering after existing incident IDs (e.g. on alerts restored from a journal)"""
+        highest = 0
+        for incident_id in incident_ids:
+            prefix, _, number = str(incident_id or '').partition('-')
+            if prefix == 'INC' and number.isdigit():
+                highest = max(highest, int(number))
+        with self._lock:
+            current = next(self._ids)
+            self._ids = itertools.count(max(current, highest + 1))
+
+    def load_default_causal_links(self) -> List[Tuple[str, str]]:
+        """Load default causal links: categories whose alerts usually share a root cause"""
+        return [
+            ('process', 'cpu'),     # a runaway process saturates the CPU
+            ('process', 'memory'),  # a leaking process exhausts memory
+            ('cpu', 'memory'),      # ... often both at once
+            ('memory', 'disk')      # memory pressure spills into swap
+        ]
+
+    def set_causal_links(self, links: List[Tuple[str, str]]):
+        """Set the category links; directly linked categories correlate on the same host"""
+        by_category = {}
+        for first, second in links:
+            link = tuple(sorted((first, second)))
+            by_category.setdefault(first, []).append(link)
+            by_category.setdefault(second, []).append(link)
+        self._links = by_category
+
+    def _keys(self, alert: Dict[str, Any]) -> List[Tuple[Tuple[Any, ...], Optional[str]]]:
+        # (key, category the matched incident must already hold, or None for a shared label)
+        metadata = alert.get('metadata') or {}
+        labels = dict(metadata.get('labels') or {})
+        if metadata.get('device') and 'device' not in labels and 'pid' not in labels:
+            labels['device'] = metadata['device']
+        host = labels.get('host', self.host)
+
+        keys = []
+        for name in self.LABEL_KEYS:
+            if labels.get(name) is not None:
+                keys.append(((name, host, labels[name]), None))
+        category = alert.get('category')
+        for link in self._links.get(category, ()):
+            keys.append((('link', host, link), link[1] if link[0] == category else link[0]))
+        return keys
+
+    def _evict(self, incident: Incident):
+        for key in incident.keys:
+            if self._by_key.get(key) == incident.id:
+                del self._by_key[key]
+
+    def _expire(self, now: float):
+        # Incidents are ordered by opening time, so stop at the first one still in its window
+        while self.incidents:
+            incident = next(iter(self.incidents.values()))
+            if len(self.incidents) <= self.max_incidents and now - incident.opened_at <= self.window:
+                break
+            self.incidents.popitem(last=False)
+            self._evict(incident)
+
+    def _notification(self, incident: Incident, alert: Dict[str, Any], update: bool) -> Dict[str, Any]:
+        root = incident.root_alert
+        message = root.get('message', '')
+        if incident.alert_count > 1:
+            message += f" (+{incident.alert_count - 1} related: {', '.join(incident.categories)})"
+        if update:
+            message = f"Update: {message}"
+            if alert is not root:
+                message += f"; latest: {alert.get('message', '')}"
+        return {
+            'id': incident.id,
+            'incident_id': incident.id,
+            'timestamp': datetime.now().isoformat(),
+            'type': 'incident',
+            'category': root.get('category', 'system'),
+            'severity': incident.severity,
+            'message': message,
+            'alert_ids': list(incident.alert_ids),
+            'update': update
+        }
+
+    def _should_notify(self, incident: Incident) -> bool:
+        # Notify on open, then only when the incident escalates or spreads to a new category
+        return (incident.notified_severity is None
+                or SEVERITY_ORDER.get(incident.severity, 0) > SEVERITY_ORDER.get(incident.notified_severity, 0)
+                or len(incident.categories) > incident.notified_categories)
+
+    def _apply(self, incident: Incident, alert: Dict[str, Any], now: float):
+        incident.updated_at = now
+        if SEVERITY_ORDER.get(alert.get('severity'), 0) > SEVERITY_ORDER.get(incident.severity, 0):
+            incident.severity = alert['severity']
+        if alert.get('category') not in incident.categories:
+            incident.categories.append(alert.get('category'))
+
+    def _decide(self, incident: Incident, alert: Dict[str, Any], update: bool,
+                count_suppressed: bool = True) -> Optional[Dict[str, Any]]:
+        if not self._should_notify(incident):
+            if count_suppressed:
+                incident.suppressed += 1
+            return None
+        incident.notified_severity = incident.severity
+        incident.notified_categories = len(incident.categories)
+        incident.notifications += 1
+        return self._notification(incident, alert, update)
+
+    def correlate(self, alert: Dict[str, Any]) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Assign a new alert to an incident; returns the incident ID and the
+        notification to send, or None when the alert only adds to an incident
+        that was already notified
+        """
+        now = self.clock()
+        with self._lock:
+            self._expire(now)
+            keys = self._keys(alert)
+
+            incident = None
+            for key, counterpart in keys:
+                incident_id = self._by_key.get(key)
+                candidate = self.incidents.get(incident_id) if incident_id else None
+                if candidate is None or (counterpart is not None and counterpart not in candidate.categories):
+                    continue
+                if incident is None or candidate.opened_at > incident.opened_at:
+                    incident = candidate
+
+            update = incident is not None
+            if incident is None:
+                incident = Incident(f"INC-{next(self._ids)}", alert, now)
+                self.incidents[incident.id] = incident
+                self._expire(now)
+
+            for key, _ in keys:
+                # Keys per incident are bounded
+                if key in incident.keys or len(incident.keys) < self.max_alert_ids:
+                    self._by_key[key] = incident.id
+                    incident.keys.add(key)
+            incident.alert_count += 1
+            if len(incident.alert_ids) < self.max_alert_ids:
+                incident.alert_ids.append(alert.get('id'))
+            self._apply(incident, alert, now)
+
+            return incident.id, self._decide(incident, alert, update)
+
+    def touch(self, alert: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Record activity on an alert already in an incident (e.g. an in-place
+        update or escalation); returns a notification if the incident escalated.
+        Activity does not keep the incident open past its window.
+        """
+        incident_id = alert.get('incident_id')
+        now = self.clock()
+        with self._lock:
+            self._expire(now)
+            incident = self.incidents.get(incident_id)
+            if incident is None:
+                return None
+            self._apply(incident, alert, now)
+            return self._decide(incident, alert, update=True, count_suppressed=False)
+
+    def is_open(self, incident_id: str) -> bool:
+        """Whether an incident is still within its window (and can take alerts)"""
+        with self._lock:
+            incident = self.incidents.get(incident_id)
+            return incident is not None and self.clock() - incident.opened_at <= self.window
+
+    def get_incidents(self, limit: int = 50, active_only: bool = False) -> List[Dict[str, Any]]:
+        """Get incidents, most recently opened first"""
+        now = self.clock()
+        with self._lock:
+            results = []
+            for incident in reversed(self.incidents.values()):
+                if active_only and now - incident.opened_at > self.window:
+                    break
+                results.append(incident.to_dict(self.window, now))
+                if len(results) >= limit:
+                    break
+            return results
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get incident counts and how many notifications correlation saved"""
+        with self._lock:
+            return {
+                'incidents': len(self.incidents),
+                'alerts': sum(incident.alert_count for incident in self.incidents.values()),
+                'notifications': sum(incident.notifications for incident in self.incidents.values()),
+                'suppressed': sum(incident.suppressed for incident in self.incidents.values())
+            }
@@ -0,0 +1,164 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Dict, List, Any, Iterable
+
+
+class RssSeries:
+    """
+    Bounded RSS series for one process with an incrementally fitted growth slope
+    """
+
+    __slots__ = ('name', 'create_time', 'origin', 'first_rss', 'samples', 'n', 'sum_t', 'sum_y', 'sum_tt',
+                 'sum_ty')
+
+    def __init__(self, name: str, create_time: float, origin: float, window_size: int):
+        self.name = name
+        self.create_time = create_time
+        self.origin = origin  # first sample time; timestamps are stored relative to it to keep sums well conditioned
+        self.first_rss = None
+        self.samples = deque(maxlen=window_size)
+        self.n = 0
+        self.sum_t = 0.0
+        self.sum_y = 0.0
+        self.sum_tt = 0.0
+        self.sum_ty = 0.0
+
+    def add(self, timestamp: float, rss_mb: float):
+        """Add a sample, retiring the oldest one from the running sums when full"""
+        t = timestamp - self.origin
+        if self.first_rss is None:
+            self.first_rss = rss_mb
+
+        if len(self.samples) == self.samples.maxlen:
+            old_t, old_y = self.samples[0]
+            self.n -= 1
+            self.sum_t -= old_t
+            self.sum_y -= old_y
+            self.sum_tt -= old_t * old_t
+            self.sum_ty -= old_t * old_y
+
+        self.samples.append((t, rss_mb))
+        self.n += 1
+        self.sum_t += t
+        self.sum_y += rss_mb
+        self.sum_tt += t * t
+        self.sum_ty += t * rss_mb
+
+    @property
+    def last_timestamp(self) -> float:
+        return self.samples[-1][0] + self.origin if self.samples else self.origin
+
+    @property
+    def rss_mb(self) -> float:
+        return self.samples[-1][1] if self.samples else 0.0
+
+    def slope_mb_per_hour(self) -> float:
+        """Least-squares RSS growth rate over the window"""
+        denominator = self.n * self.sum_tt - self.sum_t * self.sum_t
+        if self.n < 2 or denominator <= 0:
+            return 0.0
+        slope_per_second = (self.n * self.sum_ty - self.sum_t * self.sum_y) / denominator
+        return slope_per_second * 3600
+
+
+class LeakDetector:
+    """
+    Ranks long-lived processes by sustained RSS growth to find memory-leak suspects
+    """
+
+    def __init__(self, window_size: int = 30, min_samples: int = 6, sample_interval: float = 30.0,
+                 min_age_seconds: float = 600.0, min_slope_mb_per_hour: float = 10.0,
+                 max_processes: int = 5000):
+        self.window_size = window_size
+        self.min_samples = min_samples
+        self.sample_interval = sample_interval
+        self.min_age_seconds = min_age_seconds
+        self.min_slope_mb_per_hour = min_slope_mb_per_hour
+        self.max_processes = max_processes
+        self.series = OrderedDict()
+        self._lock = threading.Lock()
+
+    def update(self, processes: Iterable[Dict[str, Any]], timestamp: float = None):
+        """
+        Add RSS samples from a full process listing; exited processes are dropped
+        """
+        now = timestamp if timestamp is not None else time.time()
+        seen = set()
+
+        with self._lock:
+            for proc in processes:
+                pid = proc.get('pid')
+                create_time = proc.get('create_time')
+                if pid is None or not create_time:
+                    continue
+
+                # Only long-lived processes are leak candidates
+                if now - create_time < self.min_age_seconds:
+                    continue
+
+                key = (pid, create_time)
+                seen.add(key)
+
+                rss_mb = proc.get('memory_mb')
+                if rss_mb is None:
+                    memory_info = proc.get('memory_info')
+                    rss_mb = memory_info.rss / 1024 / 1024 if memory_info else 0.0
+
+                series = self.series.get(key)
+                if series is None:
+                    series = RssSeries(proc.get('name', ''), create_time, now, self.window_size)
+                    self.series[key] = series
+                elif now - series.last_timestamp < self.sample_interval:
+                    continue
+                else:
+                    self.series.move_to_end(key)
+
+                series.add(now, rss_mb)
+
+            for key in [key for key in self.series if key not in seen]:
+                del self.series[key]
+
+            # Bound memory by dropping the least recently sampled series
+            while len(self.series) > self.max_processes:
+                self.series.popitem(last=False)
+
+    def get_suspects(self, limit: int = 10, available_mb: float = None) -> List[Dict[str, Any]]:
+        """
+        Get leak suspects ranked by growth rate, with projected hours until the host runs out of memory
+        """
+        suspects = []
+
+        with self._lock:
+            for (pid, _), series in self.series.items():
+                if series.n < self.min_samples:
+                    continue
+                slope = series.slope_mb_per_hour()
+                if slope < self.min_slope_mb_per_hour:
+                    continue
+                suspects.append({
+                    'pid': pid,
+                    'name': series.name,
+                    'rss_mb': series.rss_mb,
+                    'slope_mb_per_hour': slope,
+                    'samples': series.n,
+                    # Evidence since tracking began, beyond the sliding slope window
+                    'observed_seconds': series.last_timestamp - series.origin,
+                    'growth_mb': series.rss_mb - series.first_rss,
+                    'hours_to_oom': available_mb / slope if available_mb is not None else None
+                })
+
+        suspects.sort(key=lambda x: x['slope_mb_per_hour'], reverse=True)
+        return suspects[:limit]
+
+    def get_summary(self, available_mb: float = None) -> Dict[str, Any]:
+        """Get host-level leak summary (combined growth of all suspects)"""
+        suspects = self.get_suspects(limit=len(self.series) or 1, available_mb=available_mb)
+        total_slope = sum(s['slope_mb_per_hour'] for s in suspects)
+
+        return {
+            'tracked_processes': len(self.series),
+            'suspect_count': len(suspects),
+            'combined_growth_mb_per_hour': total_slope,
+            'hours_to_oom': available_mb / total_slope if available_mb is not None and total_slope > 0 else None
+        }
@@ -0,0 +1,177 @@
+import heapq
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Any, Iterator, Optional
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _payload_text(value: Any, parts: List[str], depth: int = 0):
+    # Collect dict keys/values and list items instead of rendering str(details)
+    if depth > 4:
+        return
+    if isinstance(value, dict):
+        for key, item in value.items():
+            parts.append(str(key))
+            _payload_text(item, parts, depth + 1)
+    elif isinstance(value, (list, tuple, set)):
+        for item in value:
+            _payload_text(item, parts, depth + 1)
+    elif value is not None:
+        parts.append(str(value))
+
+
+class LogIndex:
+    """
+    Inverted index over activity entries: term -> ascending list of entry IDs,
+    plus the entries' timestamps in ID order for bisecting a time range
+
+    Entry IDs must be added in increasing order with non-decreasing timestamps.
+    Entries expire from the oldest end; expired IDs are trimmed from the posting
+    lists in batches, so adding and expiring are O(1) amortized. Prefix queries
+    bisect a sorted copy of the term dictionary, rebuilt when terms change.
+    """
+
+    def __init__(self):
+        self.postings = {}      # term -> [entry id, ...]
+        self.base_id = 0        # ID of self.entries[0]
+        self.entries = []
+        self.times = array('d')
+        self.min_id = 0         # oldest live ID
+        self.last_id = -1
+        self._sorted_terms = None
+
+    def __len__(self) -> int:
+        return self.last_id - self.min_id + 1 if self.entries else 0
+
+    def add(self, entry):
+        """Index an entry (which has id, timestamp, log_type, category, message and details)"""
+        if not self.entries:
+            self.base_id = self.min_id = entry.id
+        parts = [entry.message, str(entry.category)]
+        _payload_text(entry.details, parts)
+        tokens = set(tokenize(' '.join(parts)))
+        tokens.add(f'log_type:{entry.log_type}')
+
+        postings = self.postings
+        for term in tokens:
+            posting = postings.get(term)
+            if posting is None:
+                postings[term] = [entry.id]
+                self._sorted_terms = None
+            else:
+                posting.append(entry.id)
+        self.entries.append(entry)
+        self.times.append(entry.timestamp)
+        self.last_id = entry.id
+
+    def expire(self, min_id: int):
+        """Drop entries with IDs below min_id"""
+        self.min_id = max(self.min_id, min_id)
+        dead = self.min_id - self.base_id
+        if dead > len(self.entries) - dead and dead > 1024:
+            self._compact()
+
+    def _compact(self):
+        dead = self.min_id - self.base_id
+        del self.entries[:dead]
+        del self.times[:dead]
+        self.base_id = self.min_id
+        for term in list(self.postings):
+            posting = self.postings[term]
+            cut = bisect_left(posting, self.min_id)
+            if cut == len(posting):
+                del self.postings[term]
+                self._sorted_terms = None
+            elif cut:
+                del posting[:cut]
+
+    def clear(self):
+        self.postings.clear()
+        self._sorted_terms = None
+        self.entries = []
+        self.times = array('d')
+        self.min_id = self.base_id = self.last_id + 1
+
+    def _id_range(self, start: Optional[float], end: Optional[float]):
+        first = self.min_id
+        last = self.last_id
+        if start is not None:
+            first = max(first, self.base_id + bisect_left(self.times, start))
+        if end is not None:
+            last = min(last, self.base_id + bisect_right(self.times, end) - 1)
+        return first, last
+
+    def _prefix_posting(self, prefix: str) -> List[int]:
+        # IDs of entries with a word starting with prefix (log_type: terms are not words)
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self.postings)
+        terms = self._sorted_terms
+        matches = []
+        for position in range(bisect_left(terms, prefix), len(terms)):
+            term = terms[position]
+            if not term.startswith(prefix):
+                break
+            if ':' not in term:
+                matches.append(self.postings[term])
+        if len(matches) <= 1:
+            return matches[0] if matches else []
+        merged = []
+        for entry_id in heapq.merge(*matches):
+            if not merged or merged[-1] != entry_id:
+                merged.append(entry_id)
+        return merged
+
+    def search(self, terms: List[str], log_type: str = None, start: float = None,
+               end: float = None, prefix: bool = False) -> Iterator[Any]:
+        """
+        Yield live entries containing every term, newest first, within [start, end];
+        with prefix=True a term also matches words that start with it
+        """
+        first, last = self._id_range(start, end)
+        if not self.entries or first > last:
+            return
+
+        if not terms and not log_type:
+            for entry_id in range(last, first - 1, -1):
+                yield self.entries[entry_id - self.base_id]
+            return
+
+        postings = []
+        for term in set(terms):
+            posting = self._prefix_posting(term) if prefix else self.postings.get(term)
+            if not posting:
+                return
+            postings.append(posting)
+        if log_type:
+            posting = self.postings.get(f'log_type:{log_type}')
+            if not posting:
+                return
+            postings.append(posting)
+        postings.sort(key=len)
+        driver, others = postings[0], postings[1:]
+
+        # Walk the rarest term's postings newest first and probe the others by bisection
+        low = bisect_left(driver, first)
+        high = bisect_right(driver, last)
+        for position in range(high - 1, low - 1, -1):
+            entry_id = driver[position]
+            for posting in others:
+                index = bisect_left(posting, entry_id)
+                if index == len(posting) or posting[index] != entry_id:
+                    break
+            else:
+                yield self.entries[entry_id - self.base_id]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'entries': len(self),
+            'terms': len(self.postings),
+            'postings': sum(len(posting) for posting in self.postings.values())
+        }
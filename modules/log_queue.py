@@ -0,0 +1,203 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+import weakref
+from logging.handlers import QueueHandler, RotatingFileHandler
+from typing import Dict, Any
+
+OVERFLOW_POLICIES = ('block', 'drop_oldest', 'sample')
+
+_STOP = object()
+_listeners = weakref.WeakSet()
+
+
+class BatchedRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that tracks the file size itself and can defer flushing,
+    so a batch of records costs one write flush instead of a seek and flush each
+    """
+
+    deferred = False
+
+    def _open(self):
+        stream = super()._open()
+        stream.seek(0, 2)
+        self._size = stream.tell()
+        return stream
+
+    def flush(self):
+        if not self.deferred:
+            super().flush()
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            msg = self.format(record) + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+            # Characters approximate bytes here; rotation does not need to be exact
+            if self.maxBytes > 0 and self._size and self._size + len(msg) >= self.maxBytes:
+                self.doRollover()
+            self.stream.write(msg)
+            self._size += len(msg)
+            self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class OverflowQueueHandler(QueueHandler):
+    """
+    QueueHandler for a bounded queue with a configurable overflow policy:
+
+    - block: wait up to block_timeout for room, then drop the record
+    - drop_oldest: discard the oldest queued record to make room
+    - sample: above high_water of the queue keep only 1 in sample_rate records
+      below WARNING; drop the record when the queue is full
+    """
+
+    def __init__(self, log_queue: queue.Queue, overflow: str = 'block', block_timeout: float = 1.0,
+                 sample_rate: int = 10, high_water: float = 0.75):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unsupported overflow policy: {overflow}")
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.sample_rate = max(1, int(sample_rate))
+        self.high_water = max(1, int(log_queue.maxsize * high_water)) if log_queue.maxsize else 0
+        self.listener = None
+        self.stats = {'enqueued': 0, 'dropped': 0, 'sampled_out': 0, 'max_depth': 0}
+        self._seen = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Same process: hand the record over as is and let the listener thread format it
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        # Called under the handler lock, so the counters need no extra locking
+        log_queue = self.queue
+        if self.overflow == 'sample' and self.high_water and record.levelno < logging.WARNING:
+            self._seen += 1
+            if log_queue.qsize() >= self.high_water and self._seen % self.sample_rate:
+                self.stats['sampled_out'] += 1
+                return
+
+        try:
+            log_queue.put_nowait(record)
+        except queue.Full:
+            if not self._overflow(record):
+                self.stats['dropped'] += 1
+                return
+        self.stats['enqueued'] += 1
+        depth = log_queue.qsize()
+        if depth > self.stats['max_depth']:
+            self.stats['max_depth'] = depth
+
+    def _overflow(self, record: logging.LogRecord) -> bool:
+        log_queue = self.queue
+        if self.overflow == 'block':
+            try:
+                log_queue.put(record, timeout=self.block_timeout)
+                return True
+            except queue.Full:
+                return False
+        if self.overflow == 'drop_oldest':
+            while True:
+                try:
+                    log_queue.get_nowait()
+                    log_queue.task_done()
+                    self.stats['dropped'] += 1
+                except queue.Empty:
+                    pass
+                try:
+                    log_queue.put_nowait(record)
+                    return True
+                except queue.Full:
+                    continue
+        return False
+
+
+class LogQueueListener:
+    """
+    Single background thread that drains the log queue in batches and writes
+    each record with the file handler of its logger, flushing once per batch
+    """
+
+    def __init__(self, log_queue: queue.Queue, handlers: Dict[str, logging.Handler], batch_size: int = 256):
+        self.queue = log_queue
+        self.handlers = handlers  # logger name -> handler
+        self.batch_size = batch_size
+        self.stats = {'written': 0, 'batches': 0}
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='system-logger', daemon=True)
+        self._thread.start()
+        _listeners.add(self)
+
+    def _run(self):
+        log_queue = self.queue
+        stopping = False
+        while not stopping:
+            batch = [log_queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(log_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            used = set()
+            for record in batch:
+                if record is _STOP:
+                    stopping = True
+                    continue
+                handler = self.handlers.get(record.name)
+                if handler is None or record.levelno < handler.level:
+                    continue
+                if handler not in used:
+                    used.add(handler)
+                    handler.deferred = True
+                handler.handle(record)
+                self.stats['written'] += 1
+
+            for handler in used:
+                handler.deferred = False
+                handler.flush()
+            self.stats['batches'] += 1
+            for _ in batch:
+                log_queue.task_done()
+
+    def flush(self, timeout: float = 5) -> bool:
+        """Wait until every queued record has been written"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.queue.unfinished_tasks == 0:
+                return True
+            time.sleep(0.005)
+        return False
+
+    def stop(self, timeout: float = 5):
+        """Write out everything queued so far, stop the thread and close the handlers"""
+        if self._thread is not None and self._thread.is_alive():
+            try:
+                self.queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                pass
+            self._thread.join(timeout)
+        self._thread = None
+        _listeners.discard(self)
+        for handler in set(self.handlers.values()):
+            handler.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats, depth=self.queue.qsize(), capacity=self.queue.maxsize,
+                    running=self._thread is not None and self._thread.is_alive())
+
+
+@atexit.register
+def _stop_listeners():
+    # Runs before logging's own shutdown hook, so queued records reach the files
+    for listener in list(_listeners):
+        listener.stop()
@@ -0,0 +1,77 @@
+import mmap
+import os
+from typing import List, Tuple
+
+BLOCK_SIZE = 64 * 1024
+MMAP_THRESHOLD = 1024 * 1024
+
+
+def _tail_mapped(f, size: int, lines: int) -> Tuple[List[bytes], bool]:
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        # A final line without a newline still counts as a line
+        end = size
+        search_end = size - 1 if mapped[size - 1:size] == b'\n' else size
+        found = []
+        while len(found) < lines and end > 0:
+            newline = mapped.rfind(b'\n', 0, search_end)
+            found.append(mapped[newline + 1:end])
+            end = newline + 1
+            search_end = newline
+        found.reverse()
+        return found, end == 0
+
+
+def _tail_blocks(f, size: int, lines: int, block_size: int) -> Tuple[List[bytes], bool]:
+    position = size
+    blocks = []
+    newlines = 0
+    trailing = None
+    # n complete lines need n newlines before the end of the last line
+    while position > 0 and newlines - (1 if trailing else 0) < lines:
+        read = min(block_size, position)
+        position -= read
+        f.seek(position)
+        block = f.read(read)
+        if trailing is None:
+            trailing = block.endswith(b'\n')
+        blocks.append(block)
+        newlines += block.count(b'\n')
+
+    found = b''.join(reversed(blocks)).splitlines(keepends=True)
+    exhausted = position == 0 and len(found) <= lines
+    return found[-lines:], exhausted
+
+
+def tail_file(path: str, lines: int, block_size: int = BLOCK_SIZE,
+              mmap_threshold: int = MMAP_THRESHOLD) -> Tuple[List[bytes], bool]:
+    """
+    Read the last lines of a file from its end; returns the lines (oldest first,
+    newline kept) and whether the whole file was consumed. Files of at least
+    mmap_threshold bytes are scanned through mmap, smaller ones in blocks.
+    """
+    if lines <= 0:
+        return [], False
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return [], True
+        if size >= mmap_threshold:
+            return _tail_mapped(f, size, lines)
+        return _tail_blocks(f, size, lines, block_size)
+
+
+def tail_log(path: str, lines: int, backups: int = 5) -> List[bytes]:
+    """
+    Get the last lines of a rotating log, continuing into the rotated backups
+    (path.1 is the newest) when the live file holds fewer lines
+    """
+    found, exhausted = tail_file(path, lines) if os.path.exists(path) else ([], True)
+    for index in range(1, backups + 1):
+        if not exhausted or len(found) >= lines:
+            break
+        backup = f"{path}.{index}"
+        if not os.path.exists(backup):
+            break
+        older, exhausted = tail_file(backup, lines - len(found))
+        found = older + found
+    return found
@@ -1,23 +1,94 @@
 import logging
 import os
 import json
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from datetime import datetime
+from typing import Dict, List, Any, Iterator, Optional
+import queue
 import threading
-from logging.handlers import RotatingFileHandler
+import time
+from collections import deque
+from itertools import islice
+from .log_queue import BatchedRotatingFileHandler, OverflowQueueHandler, LogQueueListener
+from .log_index import LogIndex, tokenize
+from .log_tail import tail_log
+from .stream_export import iter_export
+
+def _snapshot(value: Any) -> Any:
+    # Copy dicts and lists (not their leaf values), far cheaper than encoding them
+    if isinstance(value, dict):
+        return {key: _snapshot(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_snapshot(item) for item in value]
+    if isinstance(value, set):
+        return set(value)
+    return value
+
+class LazyJSON:
+    """
+    Log argument rendered as JSON only when a handler formats the record (on the
+    listener thread). The payload's containers are copied when the record is
+    created, since the caller may keep mutating them after the log call returns.
+    """
+    
+    __slots__ = ('payload', 'options')
+    
+    def __init__(self, payload: Any, **options):
+        self.payload = _snapshot(payload)
+        self.options = options
+    
+    def __str__(self) -> str:
+        return json.dumps(self.payload, **self.options)
+
+class ActivityEntry:
+    """One in-memory activity log entry (timestamp is epoch seconds)"""
+    
+    __slots__ = ('id', 'timestamp', 'log_type', 'category', 'message', 'details')
+    
+    def __init__(self, entry_id: int, timestamp: float, log_type: str, category: str, message: str,
+                 details: Dict[str, Any]):
+        self.id = entry_id
+        self.timestamp = timestamp
+        self.log_type = log_type
+        self.category = category
+        self.message = message
+        self.details = details
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'timestamp': datetime.fromtimestamp(self.timestamp).isoformat(),
+            'log_type': self.log_type,
+            'category': self.category,
+            'message': self.message,
+            'details': self.details
+        }
 
 class SystemLogger:
     """
     Comprehensive logging system for system monitoring activities
     """
     
-    def __init__(self, log_dir: str = "logs"):
+    def __init__(self, log_dir: str = "logs", queue_size: int = 10000, overflow: str = 'block',
+                 sample_rate: int = 10):
         self.log_dir = log_dir
         self.ensure_log_directory()
         self.loggers = {}
-        self.activity_log = []
+        # Activity entries oldest first, plus one deque per log type in the same order
+        self.activity_log = deque()
+        self.activity_by_type = {}
         self.max_activity_entries = 1000
+        self._activity_lock = threading.Lock()
+        self._next_activity_id = 0
+        # Search index, brought up to date with new entries when a search runs
+        self.activity_index = LogIndex()
+        
+        # All loggers share one bounded queue; a single listener thread writes the files
+        self.queue_handler = OverflowQueueHandler(queue.Queue(queue_size), overflow=overflow,
+                                                  sample_rate=sample_rate)
+        self.file_handlers = {}
         self.setup_loggers()
+        self.listener = LogQueueListener(self.queue_handler.queue, self.file_handlers)
+        self.queue_handler.listener = self.listener
+        self.listener.start()
         
     def ensure_log_directory(self):
         """Ensure log directory exists"""
@@ -70,16 +141,20 @@ class SystemLogger:
         )
     
     def _create_logger(self, name: str, filename: str, level: int) -> logging.Logger:
-        """Create a logger with rotating file handler"""
+        """Create a logger that queues records for a rotating file handler"""
         logger = logging.getLogger(name)
         logger.setLevel(level)
         
-        # Remove existing handlers to avoid duplicates
+        # Remove existing handlers to avoid duplicates; a previous SystemLogger's
+        # listener is stopped once its queued records are written
         for handler in logger.handlers[:]:
             logger.removeHandler(handler)
+            previous = getattr(handler, 'listener', None)
+            if previous is not None and handler is not self.queue_handler:
+                previous.stop()
         
-        # Create rotating file handler (max 10MB, keep 5 backups)
-        handler = RotatingFileHandler(
+        # Create rotating file handler (max 10MB, keep 5 backups), written by the listener thread
+        handler = BatchedRotatingFileHandler(
             filename, 
             maxBytes=10*1024*1024,  # 10MB
             backupCount=5
@@ -91,40 +166,56 @@ class SystemLogger:
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         handler.setFormatter(formatter)
+        self.file_handlers[name] = handler
         
-        logger.addHandler(handler)
+        logger.addHandler(self.queue_handler)
         return logger
     
+    def flush(self, timeout: float = 5) -> bool:
+        """Wait until every queued log record has been written to its file"""
+        return self.listener.flush(timeout)
+    
+    def close(self, timeout: float = 5):
+        """Write out queued records and stop the listener thread"""
+        for logger in self.loggers.values():
+            logger.removeHandler(self.queue_handler)
+        self.listener.stop(timeout)
+    
+    def get_queue_stats(self) -> Dict[str, Any]:
+        """Get log queue counters: enqueued, dropped, sampled out, depth and batches written"""
+        return dict(self.listener.get_stats(), overflow=self.queue_handler.overflow,
+                    **self.queue_handler.stats)
+    
     def log_system_event(self, event_type: str, message: str, details: Dict[str, Any] = None):
         """Log a system event"""
-        self.loggers['system'].info(f"[{event_type}] {message}")
+        logger = self.loggers['system']
+        logger.info("[%s] %s", event_type, message)
         
-        if details:
-            self.loggers['system'].debug(f"Details: {json.dumps(details, indent=2)}")
+        # The system logger runs at INFO, so details are normally never serialized
+        if details and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Details: %s", LazyJSON(details, indent=2, default=str))
         
         self._add_to_activity_log('system', event_type, message, details)
     
     def log_monitoring_data(self, component: str, data: Dict[str, Any]):
         """Log monitoring data"""
         message = f"Monitoring data for {component}"
-        self.loggers['monitoring'].debug(f"{message}: {json.dumps(data, default=str)}")
+        logger = self.loggers['monitoring']
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s: %s", message, LazyJSON(data, default=str))
         
         self._add_to_activity_log('monitoring', component, message, data)
     
     def log_healing_action(self, action: str, success: bool, message: str, details: Dict[str, Any] = None):
         """Log a healing action"""
-        level = 'INFO' if success else 'WARNING'
+        level = logging.INFO if success else logging.WARNING
         status = 'SUCCESS' if success else 'FAILED'
         
-        log_message = f"[{action}] {status}: {message}"
-        
-        if success:
-            self.loggers['healing'].info(log_message)
-        else:
-            self.loggers['healing'].warning(log_message)
+        logger = self.loggers['healing']
+        logger.log(level, "[%s] %s: %s", action, status, message)
         
-        if details:
-            self.loggers['healing'].debug(f"Details: {json.dumps(details, default=str)}")
+        if details and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Details: %s", LazyJSON(details, default=str))
         
         self._add_to_activity_log('healing', action, message, {
             'success': success,
@@ -133,14 +224,14 @@ class SystemLogger:
     
     def log_alert(self, alert: Dict[str, Any]):
         """Log an alert"""
-        message = f"[{alert['severity'].upper()}] {alert['category']}: {alert['message']}"
-        
         if alert['severity'] == 'critical':
-            self.loggers['alerts'].error(message)
+            level = logging.ERROR
         elif alert['severity'] == 'warning':
-            self.loggers['alerts'].warning(message)
+            level = logging.WARNING
         else:
-            self.loggers['alerts'].info(message)
+            level = logging.INFO
+        self.loggers['alerts'].log(level, "[%s] %s: %s", alert['severity'].upper(),
+                                   alert['category'], alert['message'])
         
         self._add_to_activity_log('alerts', alert['category'], alert['message'], alert)
     
@@ -169,37 +260,39 @@ class SystemLogger:
     def _add_to_activity_log(self, log_type: str, category: str, message: str, 
                             details: Dict[str, Any] = None):
         """Add entry to in-memory activity log"""
-        activity_entry = {
-            'timestamp': datetime.now().isoformat(),
-            'log_type': log_type,
-            'category': category,
-            'message': message,
-            'details': details or {}
-        }
-        
-        self.activity_log.append(activity_entry)
-        
-        # Keep only recent entries
-        if len(self.activity_log) > self.max_activity_entries:
-            self.activity_log.pop(0)
+        with self._activity_lock:
+            entry = ActivityEntry(self._next_activity_id, time.time(), log_type, category, message,
+                                  details or {})
+            self._next_activity_id += 1
+            self.activity_log.append(entry)
+            by_type = self.activity_by_type.get(log_type)
+            if by_type is None:
+                by_type = self.activity_by_type[log_type] = deque()
+            by_type.append(entry)
+            
+            # Keep only recent entries; the oldest entry is also the oldest of its type
+            while len(self.activity_log) > self.max_activity_entries:
+                self._evict_oldest()
+    
+    def _evict_oldest(self):
+        entry = self.activity_log.popleft()
+        self.activity_by_type[entry.log_type].popleft()
+    
+    def get_recent_entries(self, limit: int = 50, log_type: str = None) -> List[ActivityEntry]:
+        """Get the newest activity entries, newest first, without sorting or copying the log"""
+        with self._activity_lock:
+            entries = self.activity_by_type.get(log_type, ()) if log_type else self.activity_log
+            return list(islice(reversed(entries), limit))
     
     def get_recent_activity(self, limit: int = 50, log_type: str = None) -> List[Dict[str, Any]]:
         """Get recent activity log entries"""
-        filtered_log = self.activity_log
-        
-        if log_type:
-            filtered_log = [entry for entry in filtered_log if entry['log_type'] == log_type]
-        
-        # Sort by timestamp (newest first)
-        filtered_log.sort(key=lambda x: x['timestamp'], reverse=True)
-        
-        return filtered_log[:limit]
+        return [entry.to_dict() for entry in self.get_recent_entries(limit, log_type)]
     
     def get_log_statistics(self) -> Dict[str, Any]:
         """Get logging statistics"""
-        now = datetime.now()
-        last_hour = now - timedelta(hours=1)
-        last_day = now - timedelta(days=1)
+        now = time.time()
+        last_hour = now - 3600
+        last_day = now - 86400
         
         stats = {
             'total_entries': len(self.activity_log),
@@ -207,25 +300,26 @@ class SystemLogger:
             'last_day': 0,
             'by_type': {},
             'by_category': {},
-            'log_files': {}
+            'log_files': {},
+            'queue': self.get_queue_stats()
         }
         
-        # Count entries by time period and type
-        for entry in self.activity_log:
-            entry_time = datetime.fromisoformat(entry['timestamp'])
+        with self._activity_lock:
+            # Count by type
+            stats['by_type'] = {log_type: len(entries) for log_type, entries in self.activity_by_type.items()
+                                if entries}
             
-            if entry_time > last_hour:
-                stats['last_hour'] += 1
-            if entry_time > last_day:
+            # Count by time period (newest first, so stop at the first entry older than a day)
+            for entry in reversed(self.activity_log):
+                if entry.timestamp <= last_day:
+                    break
                 stats['last_day'] += 1
-            
-            # Count by type
-            log_type = entry['log_type']
-            stats['by_type'][log_type] = stats['by_type'].get(log_type, 0) + 1
+                if entry.timestamp > last_hour:
+                    stats['last_hour'] += 1
             
             # Count by category
-            category = entry['category']
-            stats['by_category'][category] = stats['by_category'].get(category, 0) + 1
+            for entry in self.activity_log:
+                stats['by_category'][entry.category] = stats['by_category'].get(entry.category, 0) + 1
         
         # Get log file sizes
         for log_name in self.loggers.keys():
@@ -245,96 +339,88 @@ class SystemLogger:
     def search_logs(self, query: str, log_type: str = None, 
                    start_date: datetime = None, end_date: datetime = None,
                    limit: int = 100) -> List[Dict[str, Any]]:
-        """Search log entries"""
-        results = []
-        
-        for entry in self.activity_log:
-            # Filter by log type
-            if log_type and entry['log_type'] != log_type:
-                continue
-            
-            # Filter by date range
-            entry_time = datetime.fromisoformat(entry['timestamp'])
-            if start_date and entry_time < start_date:
-                continue
-            if end_date and entry_time > end_date:
-                continue
-            
-            # Search in message and details
-            if (query.lower() in entry['message'].lower() or
-                query.lower() in str(entry['details']).lower()):
-                results.append(entry)
-        
-        # Sort by timestamp (newest first)
-        results.sort(key=lambda x: x['timestamp'], reverse=True)
-        
-        return results[:limit]
+        """
+        Search log entries for all words of the query (in message, category or
+        details), newest first. Each query word matches words that start with
+        it, so "kill" finds "Killed" and "kill_high_cpu_processes".
+        """
+        start = start_date.timestamp() if start_date else None
+        end = end_date.timestamp() if end_date else None
+        terms = tokenize(query)
+        
+        if not terms and query.strip():
+            # No word characters to index (e.g. "%"): fall back to a substring scan
+            query = query.lower()
+            results = []
+            for entry in self.get_recent_entries(self.max_activity_entries, log_type):
+                if end is not None and entry.timestamp > end:
+                    continue
+                if start is not None and entry.timestamp < start:
+                    break
+                if query in entry.message.lower() or query in str(entry.details).lower():
+                    results.append(entry.to_dict())
+                    if len(results) >= limit:
+                        break
+            return results
+        
+        with self._activity_lock:
+            self._update_index()
+            matches = list(islice(self.activity_index.search(terms, log_type, start, end, prefix=True), limit))
+        return [entry.to_dict() for entry in matches]
+    
+    def _update_index(self):
+        # Index entries added since the last search, then drop evicted ones
+        index = self.activity_index
+        if not self.activity_log:
+            index.clear()
+            return
+        new_entries = []
+        for entry in reversed(self.activity_log):
+            if entry.id <= index.last_id:
+                break
+            new_entries.append(entry)
+        for entry in reversed(new_entries):
+            index.add(entry)
+        index.expire(self.activity_log[0].id)
+    
+    EXPORT_FIELDS = ['timestamp', 'log_type', 'category', 'message']
+
+    def iter_export_logs(self, log_type: str = None, format: str = 'json',
+                         start_date: datetime = None, end_date: datetime = None) -> Iterator[str]:
+        """Stream log entries (newest first) as json, ndjson or csv text chunks"""
+        entries = self.get_recent_entries(self.max_activity_entries, log_type)
+        start = start_date.timestamp() if start_date else float('-inf')
+        end = end_date.timestamp() if end_date else float('inf')
+        
+        return iter_export((entry.to_dict() for entry in entries if start <= entry.timestamp <= end),
+                           format, fieldnames=self.EXPORT_FIELDS)
     
     def export_logs(self, log_type: str = None, format: str = 'json', 
                    start_date: datetime = None, end_date: datetime = None) -> str:
         """Export log entries"""
-        entries = self.get_recent_activity(limit=self.max_activity_entries, log_type=log_type)
-        
-        # Filter by date range if specified
-        if start_date or end_date:
-            filtered_entries = []
-            for entry in entries:
-                entry_time = datetime.fromisoformat(entry['timestamp'])
-                if start_date and entry_time < start_date:
-                    continue
-                if end_date and entry_time > end_date:
-                    continue
-                filtered_entries.append(entry)
-            entries = filtered_entries
-        
-        if format.lower() == 'json':
-            return json.dumps(entries, indent=2, default=str)
-        elif format.lower() == 'csv':
-            import csv
-            import io
-            
-            output = io.StringIO()
-            if entries:
-                fieldnames = ['timestamp', 'log_type', 'category', 'message']
-                writer = csv.DictWriter(output, fieldnames=fieldnames)
-                writer.writeheader()
-                
-                for entry in entries:
-                    row = {
-                        'timestamp': entry['timestamp'],
-                        'log_type': entry['log_type'],
-                        'category': entry['category'],
-                        'message': entry['message']
-                    }
-                    writer.writerow(row)
-            
-            return output.getvalue()
-        else:
-            raise ValueError(f"Unsupported export format: {format}")
+        return ''.join(self.iter_export_logs(log_type, format, start_date, end_date))
     
     def cleanup_old_logs(self, days: int = 30):
         """Clean up old log entries from memory"""
-        cutoff_date = datetime.now() - timedelta(days=days)
+        cutoff = time.time() - days * 86400
         
-        self.activity_log = [
-            entry for entry in self.activity_log
-            if datetime.fromisoformat(entry['timestamp']) > cutoff_date
-        ]
+        with self._activity_lock:
+            while self.activity_log and self.activity_log[0].timestamp <= cutoff:
+                self._evict_oldest()
         
         self.log_system_event('cleanup', f"Cleaned up log entries older than {days} days")
     
-    def get_log_file_content(self, log_name: str, lines: int = 100) -> str:
-        """Get recent content from a log file"""
+    def get_log_file_content(self, log_name: str, lines: int = 100, follow_rotated: bool = True) -> str:
+        """Get recent content from a log file (and its rotated backups, if it holds fewer lines)"""
         log_file = os.path.join(self.log_dir, f"{log_name}.log")
         
         if not os.path.exists(log_file):
             return f"Log file {log_name}.log not found"
         
+        handler = self.file_handlers.get(log_name)
+        backups = (handler.backupCount if handler else 5) if follow_rotated else 0
         try:
-            with open(log_file, 'r', encoding='utf-8') as f:
-                # Read all lines and return the last N lines
-                all_lines = f.readlines()
-                recent_lines = all_lines[-lines:] if len(all_lines) > lines else all_lines
-                return ''.join(recent_lines)
+            # Read backwards from the end, so the cost follows the lines returned, not the file size
+            return b''.join(tail_log(log_file, lines, backups)).decode('utf-8', errors='replace')
         except Exception as e:
             return f"Error reading log file: {e}"
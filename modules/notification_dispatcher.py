@@ -0,0 +1,369 @@
+import queue
+import smtplib
+import subprocess
+import threading
+import time
+from collections import deque
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+from typing import Dict, List, Any, Callable, Optional
+
+SEVERITY_ORDER = {'info': 0, 'warning': 1, 'critical': 2}
+
+
+def highest_severity(alerts: List[Dict[str, Any]]) -> str:
+    return max((alert.get('severity', 'info') for alert in alerts), key=lambda s: SEVERITY_ORDER.get(s, 0))
+
+
+class SmtpSession:
+    """
+    Persistent SMTP session reused across sends, reconnecting when the server drops it
+    """
+
+    def __init__(self, smtp_factory: Callable[..., smtplib.SMTP] = smtplib.SMTP,
+                 timeout: float = 30, probe_after: float = 30):
+        self.smtp_factory = smtp_factory
+        self.timeout = timeout
+        self.probe_after = probe_after  # idle seconds after which the session is checked with NOOP
+        self.connects = 0
+        self._server = None
+        self._key = None
+        self._last_used = 0.0
+        self._lock = threading.Lock()
+
+    def _connect(self, settings: Dict[str, Any]) -> smtplib.SMTP:
+        key = (settings['smtp_server'], settings['smtp_port'], settings.get('username'))
+
+        if self._server is not None and self._key == key:
+            if time.time() - self._last_used < self.probe_after:
+                return self._server
+            try:
+                if self._server.noop()[0] == 250:
+                    return self._server
+            except (smtplib.SMTPException, OSError):
+                pass
+
+        self.close()
+        server = self.smtp_factory(settings['smtp_server'], settings['smtp_port'], timeout=self.timeout)
+        if settings.get('use_tls', True):
+            server.starttls()
+        if settings.get('username') and settings.get('password'):
+            server.login(settings['username'], settings['password'])
+
+        self._server = server
+        self._key = key
+        self.connects += 1
+        return server
+
+    def send(self, settings: Dict[str, Any], from_addr: str, recipients: List[str], message: str):
+        """Send a message, reconnecting once if the session was dropped"""
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    server = self._connect(settings)
+                    server.sendmail(from_addr, recipients, message)
+                    self._last_used = time.time()
+                    return
+                except (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, OSError):
+                    self.close()
+                    if attempt == 1:
+                        raise
+
+    def close(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+        self._server = None
+        self._key = None
+
+
+class NotificationChannel:
+    """
+    A notification channel; alerts arriving within coalesce_seconds are delivered as one batch
+    """
+
+    name = ''
+    default_coalesce_seconds = 2.0
+
+    def __init__(self, settings_provider: Callable[[], Dict[str, Any]]):
+        self.settings_provider = settings_provider
+
+    @property
+    def settings(self) -> Dict[str, Any]:
+        return self.settings_provider().get(self.name, {})
+
+    @property
+    def coalesce_seconds(self) -> float:
+        return self.settings.get('coalesce_seconds', self.default_coalesce_seconds)
+
+    def enabled(self) -> bool:
+        return bool(self.settings.get('enabled'))
+
+    def deliver(self, alerts: List[Dict[str, Any]]):
+        """Deliver a batch of alerts; raises on failure"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class EmailChannel(NotificationChannel):
+    """E-mail notifications over a pooled SMTP session"""
+
+    name = 'email'
+    default_coalesce_seconds = 30.0
+
+    def __init__(self, settings_provider: Callable[[], Dict[str, Any]], session: SmtpSession = None):
+        super().__init__(settings_provider)
+        self.session = session or SmtpSession()
+
+    def enabled(self) -> bool:
+        settings = self.settings
+        return bool(settings.get('enabled') and settings.get('smtp_server') and settings.get('recipients'))
+
+    @staticmethod
+    def format_message(alerts: List[Dict[str, Any]], sender: str, recipients: List[str]) -> MIMEMultipart:
+        msg = MIMEMultipart()
+        msg['From'] = sender
+        msg['To'] = ', '.join(recipients)
+
+        if len(alerts) == 1:
+            alert = alerts[0]
+            msg['Subject'] = f"System Alert - {alert['severity'].title()}: {alert['category'].title()}"
+        else:
+            msg['Subject'] = f"System Alerts - {len(alerts)} new, highest {highest_severity(alerts).title()}"
+
+        sections = [
+            f"Timestamp: {alert['timestamp']}\n"
+            f"Severity: {alert['severity'].title()}\n"
+            f"Category: {alert['category'].title()}\n"
+            f"Message: {alert['message']}\n"
+            f"Alert ID: {alert['id']}"
+            for alert in alerts
+        ]
+        body = "System Alert Notification\n\n" + "\n\n".join(sections) + \
+               "\n\nThis is an automated message from the Self-Healing System Monitor.\n"
+        msg.attach(MIMEText(body, 'plain'))
+        return msg
+
+    def deliver(self, alerts: List[Dict[str, Any]]):
+        settings = self.settings
+        recipients = [r for r in settings.get('recipients', []) if r]
+        sender = settings.get('username') or settings.get('sender', 'system-monitor@localhost')
+        msg = self.format_message(alerts, sender, recipients)
+        self.session.send(settings, sender, recipients, msg.as_string())
+
+    def close(self):
+        self.session.close()
+
+
+class DesktopChannel(NotificationChannel):
+    """Windows balloon notifications; a batch becomes a single toast"""
+
+    name = 'desktop'
+
+    def deliver(self, alerts: List[Dict[str, Any]]):
+        if len(alerts) == 1:
+            title = f"System Alert - {alerts[0]['severity'].title()}"
+            message = alerts[0]['message']
+        else:
+            title = f"{len(alerts)} System Alerts - {highest_severity(alerts).title()}"
+            message = "; ".join(alert['message'] for alert in alerts[:3])
+            if len(alerts) > 3:
+                message += f" (+{len(alerts) - 3} more)"
+        message = message.replace('"', "'")
+
+        ps_script = f"""
+        Add-Type -AssemblyName System.Windows.Forms
+        $notification = New-Object System.Windows.Forms.NotifyIcon
+        $notification.Icon = [System.Drawing.SystemIcons]::Warning
+        $notification.BalloonTipIcon = [System.Windows.Forms.ToolTipIcon]::Warning
+        $notification.BalloonTipText = "{message}"
+        $notification.BalloonTipTitle = "{title}"
+        $notification.Visible = $true
+        $notification.ShowBalloonTip(5000)
+        """
+
+        subprocess.run(['powershell', '-Command', ps_script], capture_output=True, check=False, timeout=10)
+
+
+class SoundChannel(NotificationChannel):
+    """System sounds; a batch plays once, for its highest severity"""
+
+    name = 'sound'
+
+    def deliver(self, alerts: List[Dict[str, Any]]):
+        import winsound
+
+        severity = highest_severity(alerts)
+        if severity == 'critical':
+            winsound.MessageBeep(winsound.MB_ICONHAND)
+        elif severity == 'warning':
+            winsound.MessageBeep(winsound.MB_ICONEXCLAMATION)
+        else:
+            winsound.MessageBeep(winsound.MB_ICONASTERISK)
+
+
+class NotificationDispatcher:
+    """
+    Background notification delivery: alerts are queued without blocking, coalesced
+    per channel and delivered on a worker thread, with latency and backlog metrics
+    """
+
+    def __init__(self, channels: List[NotificationChannel], max_queue: int = 1000,
+                 max_batch: int = 50, latency_window: int = 500):
+        self.channels = {channel.name: channel for channel in channels}
+        self.max_batch = max_batch
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._pending = {name: [] for name in self.channels}  # name -> [(alert, enqueued_at)]
+        self._latencies = {name: deque(maxlen=latency_window) for name in self.channels}
+        self.stats = {
+            name: {'delivered': 0, 'batches': 0, 'failed': 0, 'last_error': None}
+            for name in self.channels
+        }
+        self.enqueued = 0
+        self.dropped = 0
+        self._flush_requested = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, alert: Dict[str, Any]):
+        """Queue an alert for delivery; the oldest queued alert is dropped if the queue is full"""
+        item = (alert, time.time())
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                break
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+        self.enqueued += 1
+        self._idle.clear()
+        self._ensure_worker()
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="notification-dispatcher", daemon=True)
+                self._thread.start()
+
+    def _next_deadline(self) -> Optional[float]:
+        deadlines = [
+            pending[0][1] + self.channels[name].coalesce_seconds
+            for name, pending in self._pending.items() if pending
+        ]
+        return min(deadlines) if deadlines else None
+
+    def _run(self):
+        while not self._stop.is_set():
+            deadline = self._next_deadline()
+            timeout = 1.0 if deadline is None else max(0.0, min(1.0, deadline - time.time()))
+
+            try:
+                alert, enqueued_at = self._queue.get(timeout=timeout)
+                if alert is None:
+                    raise queue.Empty  # wake-up from flush()
+                for name, channel in self.channels.items():
+                    try:
+                        if channel.enabled():
+                            self._pending[name].append((alert, enqueued_at))
+                    except Exception:
+                        continue
+            except queue.Empty:
+                pass
+
+            force = self._flush_requested.is_set() and self._queue.empty()
+            self._deliver_due(force=force)
+
+            if self._queue.empty() and not any(self._pending.values()):
+                self._flush_requested.clear()
+                self._idle.set()
+
+        self._deliver_due(force=True)
+        self._idle.set()
+
+    def _deliver_due(self, force: bool = False):
+        now = time.time()
+        for name, pending in self._pending.items():
+            if not pending:
+                continue
+            channel = self.channels[name]
+            if not force and len(pending) < self.max_batch and now - pending[0][1] < channel.coalesce_seconds:
+                continue
+
+            batch = pending[:self.max_batch]
+            del pending[:self.max_batch]
+            stats = self.stats[name]
+            try:
+                channel.deliver([alert for alert, _ in batch])
+                delivered_at = time.time()
+                self._latencies[name].extend(delivered_at - enqueued_at for _, enqueued_at in batch)
+                stats['delivered'] += len(batch)
+                stats['batches'] += 1
+            except Exception as e:
+                stats['failed'] += len(batch)
+                stats['last_error'] = str(e)
+
+    def flush(self, timeout: float = 10) -> bool:
+        """Deliver everything queued or pending now, ignoring coalescing windows"""
+        if self._thread is None:
+            return True
+
+        deadline = time.time() + timeout
+        while True:
+            self._flush_requested.set()
+            try:
+                self._queue.put_nowait((None, None))
+            except queue.Full:
+                pass  # the worker is busy draining anyway
+            if not self._idle.wait(max(0.0, deadline - time.time())):
+                return False
+            # An alert submitted while the worker went idle is picked up on its next pass
+            if self._queue.empty() and not any(self._pending.values()):
+                return True
+            self._idle.clear()
+
+    def shutdown(self, timeout: float = 10):
+        """Deliver what is pending, stop the worker and close channel connections"""
+        self.flush(timeout)
+        self._stop.set()
+        try:
+            self._queue.put_nowait((None, None))  # wake the worker instead of waiting out its poll
+        except queue.Full:
+            pass
+        if self._thread:
+            self._thread.join(timeout)
+        for channel in self.channels.values():
+            channel.close()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get backlog, drop counts and per-channel delivery latency"""
+        channels = {}
+        for name in self.channels:
+            latencies = sorted(self._latencies[name])
+            channels[name] = dict(
+                self.stats[name],
+                pending=len(self._pending[name]),
+                latency_avg=sum(latencies) / len(latencies) if latencies else None,
+                latency_p95=latencies[int(0.95 * (len(latencies) - 1))] if latencies else None,
+                latency_max=latencies[-1] if latencies else None
+            )
+
+        return {
+            'queued': self._queue.qsize(),
+            'backlog': self._queue.qsize() + sum(len(p) for p in self._pending.values()),
+            'enqueued': self.enqueued,
+            'dropped': self.dropped,
+            'running': self._thread is not None and self._thread.is_alive(),
+            'channels': channels
+        }
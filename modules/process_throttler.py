@@ -0,0 +1,291 @@
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+import psutil
+
+
+class ThrottleLedger:
+    """
+    Record of every throttle applied to a process and how to undo it
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self._lock = threading.Lock()
+
+    def record(self, pid: int, entry: Dict[str, Any]):
+        """Record (or extend) the throttle state for a process"""
+        with self._lock:
+            existing = self.entries.get(pid)
+            if existing and existing['create_time'] == entry['create_time']:
+                # Keep the original values captured by the first throttle
+                for key, value in entry['original'].items():
+                    existing['original'].setdefault(key, value)
+                existing['applied'] = sorted(set(existing['applied']) | set(entry['applied']))
+            else:
+                self.entries[pid] = entry
+
+    def get(self, pid: int) -> Optional[Dict[str, Any]]:
+        """Get the ledger entry for a process"""
+        with self._lock:
+            return self.entries.get(pid)
+
+    def remove(self, pid: int) -> Optional[Dict[str, Any]]:
+        """Remove and return the ledger entry for a process"""
+        with self._lock:
+            return self.entries.pop(pid, None)
+
+    def retain(self, pid: int, applied: List[str], error: str):
+        """Keep only the throttles that could not be undone, with the reason"""
+        with self._lock:
+            entry = self.entries.get(pid)
+            if entry is not None:
+                entry['applied'] = list(applied)
+                entry['release_error'] = error
+
+    def pids(self) -> List[int]:
+        """Get throttled process IDs"""
+        with self._lock:
+            return list(self.entries.keys())
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Get a serializable view of the ledger"""
+        with self._lock:
+            return [
+                {
+                    'pid': pid,
+                    'name': entry['name'],
+                    'applied': ', '.join(entry['applied']),
+                    'original_nice': entry['original'].get('nice'),
+                    'original_affinity': entry['original'].get('affinity'),
+                    'original_cgroup': entry['original'].get('cgroup'),
+                    'throttled_at': entry['throttled_at'],
+                    'release_error': entry.get('release_error')
+                }
+                for pid, entry in self.entries.items()
+            ]
+
+
+class ProcessThrottler:
+    """
+    Reversible CPU throttling via nice, CPU affinity and cgroup v2 cpu.max
+    """
+
+    def __init__(self, cgroup_root: str = '/sys/fs/cgroup', proc_root: str = '/proc',
+                 slice_name: str = 'healer-throttle.slice', nice_value: int = 10,
+                 cpu_limit_percent: float = 50.0, cpu_period_us: int = 100000):
+        self.cgroup_root = cgroup_root
+        self.proc_root = proc_root
+        self.slice_name = slice_name
+        self.nice_value = nice_value
+        self.cpu_limit_percent = cpu_limit_percent
+        self.cpu_period_us = cpu_period_us
+        self.ledger = ThrottleLedger()
+
+    def get_available_methods(self) -> List[str]:
+        """Get throttling methods supported on this host"""
+        methods = ['nice']
+        if hasattr(psutil.Process, 'cpu_affinity'):
+            methods.append('affinity')
+        if self._cgroup_v2_available():
+            methods.append('cgroup')
+        return methods
+
+    def _cgroup_v2_available(self) -> bool:
+        """Check for a writable unified cgroup hierarchy"""
+        controllers = os.path.join(self.cgroup_root, 'cgroup.controllers')
+        return os.path.exists(controllers) and os.access(self.cgroup_root, os.W_OK)
+
+    def _slice_path(self) -> str:
+        return os.path.join(self.cgroup_root, self.slice_name)
+
+    def _process_cgroup_path(self, pid: int) -> str:
+        return os.path.join(self._slice_path(), f"pid-{pid}")
+
+    def _read_current_cgroup(self, pid: int) -> Optional[str]:
+        """Read a process's cgroup v2 path from /proc/<pid>/cgroup"""
+        try:
+            with open(os.path.join(self.proc_root, str(pid), 'cgroup'), 'r') as f:
+                for line in f:
+                    if line.startswith('0::'):
+                        return line[3:].strip()
+        except OSError:
+            pass
+        return None
+
+    def _write_cgroup_file(self, path: str, value: str):
+        with open(path, 'w') as f:
+            f.write(value)
+
+    def _apply_cgroup(self, pid: int, original: Dict[str, Any]):
+        """Move a process into its own child of the throttle slice with a cpu.max limit"""
+        slice_path = self._slice_path()
+        if not os.path.isdir(slice_path):
+            os.makedirs(slice_path)
+            try:
+                # Delegate the cpu controller so children can set cpu.max
+                self._write_cgroup_file(os.path.join(self.cgroup_root, 'cgroup.subtree_control'), '+cpu')
+                self._write_cgroup_file(os.path.join(slice_path, 'cgroup.subtree_control'), '+cpu')
+            except OSError:
+                pass
+
+        process_path = self._process_cgroup_path(pid)
+        os.makedirs(process_path, exist_ok=True)
+
+        quota = int(self.cpu_period_us * self.cpu_limit_percent / 100)
+        original.setdefault('cgroup', self._read_current_cgroup(pid) or '/')
+        self._write_cgroup_file(os.path.join(process_path, 'cpu.max'), f"{quota} {self.cpu_period_us}")
+        self._write_cgroup_file(os.path.join(process_path, 'cgroup.procs'), str(pid))
+
+    def _release_cgroup(self, pid: int, original_cgroup: str):
+        """Move a process back to its original cgroup and remove its throttle group"""
+        target = os.path.join(self.cgroup_root, original_cgroup.lstrip('/'))
+        try:
+            self._write_cgroup_file(os.path.join(target, 'cgroup.procs'), str(pid))
+        except OSError:
+            pass
+
+        process_path = self._process_cgroup_path(pid)
+        try:
+            os.rmdir(process_path)
+        except OSError:
+            # Outside a real cgroupfs the interface files are ordinary files
+            for name in ('cpu.max', 'cgroup.procs'):
+                try:
+                    os.remove(os.path.join(process_path, name))
+                except OSError:
+                    pass
+            try:
+                os.rmdir(process_path)
+            except OSError:
+                pass
+
+    def throttle(self, pid: int, methods: List[str] = None) -> Dict[str, Any]:
+        """
+        Throttle a process with the given methods, recording originals in the ledger
+        """
+        available = self.get_available_methods()
+        methods = [m for m in (methods or available) if m in available]
+
+        try:
+            process = psutil.Process(pid)
+            name = process.name()
+            create_time = process.create_time()
+        except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
+            return {'success': False, 'pid': pid, 'applied': [], 'message': str(e)}
+
+        original = {}
+        applied = []
+        errors = []
+
+        for method in methods:
+            try:
+                if method == 'nice':
+                    current = process.nice()
+                    if os.name == 'nt':
+                        # Windows exposes priority classes rather than nice values
+                        lower = current in (psutil.NORMAL_PRIORITY_CLASS, psutil.ABOVE_NORMAL_PRIORITY_CLASS,
+                                            psutil.HIGH_PRIORITY_CLASS)
+                        target = psutil.BELOW_NORMAL_PRIORITY_CLASS
+                    else:
+                        lower = current < self.nice_value
+                        target = self.nice_value
+                    if lower:
+                        original['nice'] = current
+                        process.nice(target)
+                        applied.append('nice')
+                elif method == 'affinity':
+                    current = process.cpu_affinity()
+                    if len(current) > 1:
+                        original['affinity'] = current
+                        process.cpu_affinity(current[-1:])
+                        applied.append('affinity')
+                elif method == 'cgroup':
+                    self._apply_cgroup(pid, original)
+                    applied.append('cgroup')
+            except (psutil.Error, OSError, ValueError) as e:
+                errors.append(f"{method}: {e}")
+
+        if applied:
+            self.ledger.record(pid, {
+                'name': name,
+                'create_time': create_time,
+                'original': original,
+                'applied': applied,
+                'throttled_at': datetime.now().isoformat()
+            })
+
+        return {
+            'success': bool(applied),
+            'pid': pid,
+            'name': name,
+            'applied': applied,
+            'message': '; '.join(errors) if errors else f"Throttled with {', '.join(applied) or 'nothing'}"
+        }
+
+    def release(self, pid: int) -> Dict[str, Any]:
+        """
+        Undo every throttle recorded for a process; throttles that cannot be undone
+        (e.g. lowering nice again without privileges) stay in the ledger
+        """
+        entry = self.ledger.get(pid)
+        if entry is None:
+            return {'success': False, 'pid': pid, 'message': "Process not throttled"}
+
+        original = entry['original']
+        restored = []
+        errors = []
+
+        if 'cgroup' in entry['applied']:
+            self._release_cgroup(pid, original.get('cgroup', '/'))
+            restored.append('cgroup')
+
+        try:
+            process = psutil.Process(pid)
+            if process.create_time() != entry['create_time']:
+                # PID was reused; only the throttle group needed cleaning up
+                self.ledger.remove(pid)
+                return {'success': True, 'pid': pid, 'restored': restored, 'message': "Process exited"}
+        except psutil.NoSuchProcess:
+            self.ledger.remove(pid)
+            return {'success': True, 'pid': pid, 'restored': restored, 'message': "Process exited"}
+        except psutil.Error as e:
+            process = None
+            errors.append(str(e))
+
+        if process is not None:
+            for method in ('nice', 'affinity'):
+                if method not in entry['applied'] or method not in original:
+                    continue
+                try:
+                    if method == 'nice':
+                        process.nice(original['nice'])
+                    else:
+                        process.cpu_affinity(original['affinity'])
+                    restored.append(method)
+                except psutil.NoSuchProcess:
+                    self.ledger.remove(pid)
+                    return {'success': True, 'pid': pid, 'restored': restored, 'message': "Process exited"}
+                except psutil.AccessDenied:
+                    errors.append(f"{method}: access denied (restoring it needs elevated privileges)")
+                except (psutil.Error, OSError, ValueError) as e:
+                    errors.append(f"{method}: {e}")
+
+        remaining = [method for method in entry['applied'] if method not in restored]
+        if remaining:
+            message = '; '.join(errors) or f"Could not restore {', '.join(remaining)}"
+            self.ledger.retain(pid, remaining, message)
+            return {'success': False, 'pid': pid, 'restored': restored, 'pending': remaining, 'message': message}
+
+        self.ledger.remove(pid)
+        return {'success': True, 'pid': pid, 'restored': restored, 'message': f"Restored {', '.join(restored)}"}
+
+    def release_all(self) -> List[Dict[str, Any]]:
+        """Undo every recorded throttle"""
+        return [self.release(pid) for pid in self.ledger.pids()]
+
+    def get_ledger(self) -> List[Dict[str, Any]]:
+        """Get the throttle ledger"""
+        return self.ledger.to_list()
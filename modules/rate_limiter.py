@@ -0,0 +1,276 @@
+import threading
+import time
+from typing import Dict, List, Any, Callable, Optional
+
+
+class TokenBucket:
+    """
+    Token bucket: bursts up to capacity, refilled continuously at refill_per_hour
+    """
+
+    def __init__(self, capacity: float, refill_per_hour: float, clock: Callable[[], float] = time.time):
+        self.capacity = capacity
+        self.refill_per_hour = refill_per_hour
+        self.clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_per_hour / 3600)
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def can_acquire(self, count: float = 1) -> bool:
+        return self.tokens >= count
+
+    def try_acquire(self, count: float = 1) -> bool:
+        """Take tokens if available"""
+        self._refill()
+        if self._tokens < count:
+            return False
+        self._tokens -= count
+        return True
+
+    def seconds_until_available(self, count: float = 1) -> float:
+        missing = count - self.tokens
+        if missing <= 0:
+            return 0.0
+        if self.refill_per_hour <= 0:
+            return float('inf')
+        return missing * 3600 / self.refill_per_hour
+
+
+class ExponentialBackoff:
+    """
+    Delay that doubles after each consecutive failure, up to max_delay
+    """
+
+    def __init__(self, base_delay: float = 30.0, factor: float = 2.0, max_delay: float = 1800.0,
+                 clock: Callable[[], float] = time.time):
+        self.base_delay = base_delay
+        self.factor = factor
+        self.max_delay = max_delay
+        self.clock = clock
+        self.failures = 0
+        self.retry_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        delay = min(self.max_delay, self.base_delay * self.factor ** (self.failures - 1))
+        self.retry_at = self.clock() + delay
+
+    def record_success(self):
+        self.failures = 0
+        self.retry_at = None
+
+    def remaining(self) -> float:
+        if self.retry_at is None:
+            return 0.0
+        return max(0.0, self.retry_at - self.clock())
+
+
+class CircuitBreaker:
+    """
+    Opens after failure_threshold consecutive ineffective runs; after reset_timeout
+    one trial run is allowed (half-open) and its outcome closes or re-opens it
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 900.0,
+                 clock: Callable[[], float] = time.time):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._state = self.CLOSED
+        self.consecutive_ineffective = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self._state
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN:
+            return not self.trial_in_flight
+        return False
+
+    def on_start(self):
+        if self.state == self.HALF_OPEN:
+            self.trial_in_flight = True
+
+    def record(self, effective: bool) -> Optional[str]:
+        """Record a run outcome; returns the new state if it changed"""
+        previous = self.state
+        self.trial_in_flight = False
+
+        if effective:
+            self.consecutive_ineffective = 0
+            self._state = self.CLOSED
+            self.opened_at = None
+        else:
+            self.consecutive_ineffective += 1
+            if previous == self.HALF_OPEN or self.consecutive_ineffective >= self.failure_threshold:
+                self._state = self.OPEN
+                self.opened_at = self.clock()
+
+        current = self.state
+        if current != previous:
+            return current
+        return None
+
+    def reset(self):
+        self._state = self.CLOSED
+        self.consecutive_ineffective = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+
+class ActionRateLimiter:
+    """
+    Per-action token buckets, failure backoff and circuit breakers for healing actions
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self.limits = self.load_default_limits()
+        self.on_transition = None  # callback(action, new_state, breaker_dict)
+        self.buckets = {}
+        self.backoffs = {}
+        self.breakers = {}
+        self._lock = threading.Lock()
+
+    def load_default_limits(self) -> Dict[str, Any]:
+        """Load default limits; destructive actions get token buckets"""
+        return {
+            'default': {
+                'bucket': None,
+                'backoff': {'base_delay': 30, 'max_delay': 1800},
+                'breaker': {'failure_threshold': 3, 'reset_timeout': 900}
+            },
+            'kill_high_cpu_processes': {
+                'bucket': {'capacity': 3, 'refill_per_hour': 6}
+            },
+            'terminate_leak_suspects': {
+                'bucket': {'capacity': 1, 'refill_per_hour': 2}
+            },
+            'throttle_high_cpu_processes': {
+                'bucket': {'capacity': 5, 'refill_per_hour': 20}
+            },
+            'restart_services': {
+                'bucket': {'capacity': 3, 'refill_per_hour': 6}
+            }
+        }
+
+    def _limit(self, action: str, key: str) -> Optional[Dict[str, Any]]:
+        limits = self.limits.get(action, {})
+        if key in limits:
+            return limits[key]
+        return self.limits['default'].get(key)
+
+    def _get(self, action: str):
+        """Get (or create) the bucket, backoff and breaker for an action"""
+        if action not in self.breakers:
+            bucket = self._limit(action, 'bucket')
+            self.buckets[action] = TokenBucket(clock=self.clock, **bucket) if bucket else None
+            self.backoffs[action] = ExponentialBackoff(clock=self.clock, **self._limit(action, 'backoff'))
+            self.breakers[action] = CircuitBreaker(clock=self.clock, **self._limit(action, 'breaker'))
+        return self.buckets[action], self.backoffs[action], self.breakers[action]
+
+    def check(self, action: str) -> Optional[str]:
+        """Get the reason an action is blocked ('circuit_open', 'backoff', 'rate_limited'), or None"""
+        with self._lock:
+            return self._blocked(action)
+
+    def _blocked(self, action: str) -> Optional[str]:
+        bucket, backoff, breaker = self._get(action)
+        if not breaker.allow():
+            return 'circuit_open'
+        if backoff.remaining() > 0:
+            return 'backoff'
+        if bucket and not bucket.can_acquire():
+            return 'rate_limited'
+        return None
+
+    def acquire(self, action: str) -> Optional[str]:
+        """
+        Consume a token when an action actually starts; returns the reason it is
+        blocked instead (as check() does), or None once it has started
+        """
+        with self._lock:
+            reason = self._blocked(action)
+            if reason:
+                return reason
+            bucket, _, breaker = self._get(action)
+            if bucket and not bucket.try_acquire():
+                return 'rate_limited'
+            breaker.on_start()
+            return None
+
+    def record(self, action: str, succeeded: bool, effective: bool):
+        """Record a run: failures back off, ineffective runs count towards opening the breaker"""
+        with self._lock:
+            _, backoff, breaker = self._get(action)
+            if succeeded:
+                backoff.record_success()
+            else:
+                backoff.record_failure()
+            transition = breaker.record(effective)
+            state = self._describe(action) if transition else None
+
+        if transition and self.on_transition:
+            try:
+                self.on_transition(action, transition, state)
+            except Exception:
+                pass
+
+    def get_breaker_state(self, action: str) -> Optional[str]:
+        """Get an action's breaker state, or None if it has never been checked"""
+        with self._lock:
+            breaker = self.breakers.get(action)
+            return breaker.state if breaker else None
+
+    def _describe(self, action: str) -> Dict[str, Any]:
+        bucket, backoff, breaker = self.buckets[action], self.backoffs[action], self.breakers[action]
+        return {
+            'action': action,
+            'breaker': breaker.state,
+            'consecutive_ineffective': breaker.consecutive_ineffective,
+            'failure_threshold': breaker.failure_threshold,
+            'opened_at': breaker.opened_at,
+            'consecutive_failures': backoff.failures,
+            'backoff_remaining': backoff.remaining(),
+            'tokens': bucket.tokens if bucket else None,
+            'capacity': bucket.capacity if bucket else None
+        }
+
+    def get_states(self) -> List[Dict[str, Any]]:
+        """Get limiter state for every action seen so far"""
+        with self._lock:
+            return [self._describe(action) for action in self.breakers]
+
+    def reset(self, action: str = None):
+        """Close breakers, clear backoff and refill buckets for one action or all actions"""
+        with self._lock:
+            for name in ([action] if action else list(self.breakers.keys())):
+                if name not in self.breakers:
+                    continue
+                self.breakers[name].reset()
+                self.backoffs[name].record_success()
+                bucket = self.buckets[name]
+                if bucket:
+                    bucket._tokens = float(bucket.capacity)
@@ -0,0 +1,495 @@
+import bisect
+import math
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Any, Iterator, Optional, Union
+
+import numpy as np
+
+COMPARATORS = {
+    '>': np.greater,
+    '>=': np.greater_equal,
+    '<': np.less,
+    '<=': np.less_equal,
+    '==': np.equal,
+    '!=': np.not_equal
+}
+
+NAN = float('nan')
+
+
+class SeriesWindow:
+    """
+    Sliding time window over one series, aggregated incrementally as samples
+    arrive and expire; the aggregate is NaN (never breaching) until the series
+    has been observed for min_coverage of the window
+    """
+
+    __slots__ = ('window', 'min_coverage', 'samples', 'first_seen', 'last_seen')
+
+    def __init__(self, window: float, min_coverage: float = 1.0):
+        self.window = window
+        self.min_coverage = min_coverage
+        self.samples = deque()  # (timestamp, value), oldest first
+        self.first_seen = None
+        self.last_seen = None
+
+    def push(self, timestamp: float, value: float) -> float:
+        """Add a sample, expire old ones and return the current aggregate"""
+        if self.first_seen is None:
+            self.first_seen = timestamp
+        self.last_seen = timestamp
+        self.samples.append((timestamp, value))
+        self._added(timestamp, value)
+
+        cutoff = timestamp - self.window
+        while self.samples[0][0] < cutoff:
+            self._expired(*self.samples.popleft())
+
+        if timestamp - self.first_seen < self.window * self.min_coverage:
+            return NAN
+        return self._value()
+
+    def _added(self, timestamp: float, value: float):
+        pass
+
+    def _expired(self, timestamp: float, value: float):
+        pass
+
+    def _value(self) -> float:
+        raise NotImplementedError
+
+
+class AvgWindow(SeriesWindow):
+    """Mean over the window from a running sum"""
+
+    __slots__ = ('total',)
+
+    def __init__(self, window: float, min_coverage: float = 1.0):
+        super().__init__(window, min_coverage)
+        self.total = 0.0
+
+    def _added(self, timestamp: float, value: float):
+        self.total += value
+
+    def _expired(self, timestamp: float, value: float):
+        self.total -= value
+
+    def _value(self) -> float:
+        return self.total / len(self.samples)
+
+
+class MaxWindow(SeriesWindow):
+    """Maximum over the window from a monotonic deque"""
+
+    __slots__ = ('candidates',)
+    sign = 1.0
+
+    def __init__(self, window: float, min_coverage: float = 1.0):
+        super().__init__(window, min_coverage)
+        self.candidates = deque()  # (timestamp, sign * value), decreasing
+
+    def _added(self, timestamp: float, value: float):
+        key = self.sign * value
+        while self.candidates and self.candidates[-1][1] <= key:
+            self.candidates.pop()
+        self.candidates.append((timestamp, key))
+
+    def _expired(self, timestamp: float, value: float):
+        if self.candidates and self.candidates[0][0] <= timestamp:
+            self.candidates.popleft()
+
+    def _value(self) -> float:
+        return self.sign * self.candidates[0][1]
+
+
+class MinWindow(MaxWindow):
+    """Minimum over the window (a sustained-breach condition for '>' rules)"""
+
+    __slots__ = ()
+    sign = -1.0
+
+
+class RateWindow(SeriesWindow):
+    """Change per second between the oldest and newest sample in the window"""
+
+    __slots__ = ()
+
+    def _value(self) -> float:
+        (first_t, first_v), (last_t, last_v) = self.samples[0], self.samples[-1]
+        if last_t <= first_t:
+            return NAN
+        return (last_v - first_v) / (last_t - first_t)
+
+
+class PercentileWindow(SeriesWindow):
+    """Percentile over the window from a sorted list of the window's values"""
+
+    __slots__ = ('percentile', 'ordered')
+
+    def __init__(self, window: float, min_coverage: float = 1.0, percentile: float = 95.0):
+        super().__init__(window, min_coverage)
+        self.percentile = percentile
+        self.ordered = []
+
+    def _added(self, timestamp: float, value: float):
+        bisect.insort(self.ordered, value)
+
+    def _expired(self, timestamp: float, value: float):
+        del self.ordered[bisect.bisect_left(self.ordered, value)]
+
+    def _value(self) -> float:
+        # Nearest-rank percentile
+        rank = max(1, math.ceil(self.percentile / 100 * len(self.ordered)))
+        return self.ordered[rank - 1]
+
+
+WINDOWS = {
+    'avg': AvgWindow,
+    'max': MaxWindow,
+    'min': MinWindow,
+    'rate': RateWindow,
+    'percentile': PercentileWindow
+}
+
+AGGREGATES = ('last',) + tuple(WINDOWS)
+
+
+def series_name(labels: Dict[str, Any]) -> Optional[str]:
+    """Get a short display name for a series, or None for a host-wide series"""
+    if labels.get('device'):
+        return labels['device']
+    if labels.get('nic'):
+        return labels['nic']
+    if labels.get('pid') is not None:
+        return f"{labels.get('name')} (PID {labels['pid']})"
+    if labels.get('core') is not None:
+        return f"core {labels['core']}"
+    return None
+
+
+class MetricFrame:
+    """
+    A snapshot flattened into metric families: each family is a list of series
+    labels and a float array holding one value per series
+    """
+
+    def __init__(self, timestamp: float = None):
+        self.timestamp = time.time() if timestamp is None else timestamp  # epoch seconds
+        self.families = {}       # metric -> (labels, values)
+        self._label_arrays = {}  # (id(labels), key) -> array of label values
+
+    def add(self, metric: str, labels: List[Dict[str, Any]], values):
+        self.families[metric] = (labels, np.asarray(values, dtype=np.float64))
+
+    def get(self, metric: str):
+        return self.families.get(metric)
+
+    def label_array(self, labels: List[Dict[str, Any]], key: str) -> np.ndarray:
+        """Get one label's values as an array (cached; process families share their labels)"""
+        cache_key = (id(labels), key)
+        array = self._label_arrays.get(cache_key)
+        if array is None:
+            array = np.array([series.get(key) for series in labels], dtype=object)
+            self._label_arrays[cache_key] = array
+        return array
+
+    def series_keys(self, labels: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """Get the series names of a family (cached like label arrays)"""
+        cache_key = (id(labels), None)
+        keys = self._label_arrays.get(cache_key)
+        if keys is None:
+            keys = self._label_arrays[cache_key] = [series_name(series) for series in labels]
+        return keys
+
+    def series_count(self) -> int:
+        return sum(len(values) for _, values in self.families.values())
+
+
+def build_frame(snapshot: Dict[str, Any]) -> MetricFrame:
+    """
+    Flatten a SystemMonitor snapshot (or check_thresholds() system data) into a MetricFrame
+
+    Families: cpu.percent, cpu.core_percent, memory.percent, memory.swap_percent,
+    disk.percent, net.error_rate, net.drop_rate, net.errors, net.drops,
+    process.cpu_percent, process.memory_mb, process.memory_percent,
+    process.zombie and leak.hours_to_oom. The frame is stamped with the
+    snapshot's timestamp, which windowed rules use as the sample time.
+    """
+    timestamp = snapshot.get('timestamp')
+    frame = MetricFrame(datetime.fromisoformat(timestamp).timestamp() if isinstance(timestamp, str) else timestamp)
+
+    if 'cpu_percent' in snapshot:
+        frame.add('cpu.percent', [{}], [snapshot['cpu_percent']])
+    cores = snapshot.get('cpu_per_core') or []
+    if cores:
+        frame.add('cpu.core_percent', [{'core': index} for index in range(len(cores))], cores)
+
+    memory = snapshot.get('memory')
+    if isinstance(memory, dict):
+        frame.add('memory.percent', [{}], [memory.get('percent', 0)])
+        if 'swap_percent' in memory:
+            frame.add('memory.swap_percent', [{}], [memory['swap_percent']])
+    elif 'memory_percent' in snapshot:
+        frame.add('memory.percent', [{}], [snapshot['memory_percent']])
+
+    disks = snapshot.get('disks', snapshot.get('disk_usage')) or []
+    if disks:
+        frame.add('disk.percent',
+                  [{'device': disk.get('device', 'Unknown'), 'mountpoint': disk.get('mountpoint')} for disk in disks],
+                  [disk.get('percent', 0) for disk in disks])
+
+    nics = snapshot.get('nics') or []
+    if nics:
+        labels = [{'nic': nic['nic']} for nic in nics]
+        frame.add('net.error_rate', labels, [nic.get('error_rate', 0) for nic in nics])
+        frame.add('net.drop_rate', labels, [nic.get('drop_rate', 0) for nic in nics])
+        frame.add('net.errors', labels, [nic.get('errors', 0) for nic in nics])
+        frame.add('net.drops', labels, [nic.get('drops', 0) for nic in nics])
+
+    processes = snapshot.get('processes') or []
+    if processes:
+        labels = []
+        cpu, memory_mb, memory_percent, zombie = [], [], [], []
+        for proc in processes:
+            labels.append({'pid': proc.get('pid'), 'name': proc.get('name'), 'status': proc.get('status')})
+            cpu.append(proc.get('cpu_percent') or 0)
+            memory_mb.append(proc.get('memory_mb') or 0)
+            memory_percent.append(proc.get('memory_percent') or 0)
+            zombie.append(1.0 if proc.get('status') == 'zombie' else 0.0)
+        frame.add('process.cpu_percent', labels, cpu)
+        frame.add('process.memory_mb', labels, memory_mb)
+        frame.add('process.memory_percent', labels, memory_percent)
+        frame.add('process.zombie', labels, zombie)
+
+    # Only the fastest-growing suspect raises a leak issue
+    suspects = snapshot.get('leak_suspects') or []
+    if suspects and suspects[0].get('hours_to_oom') is not None:
+        top = suspects[0]
+        frame.add('leak.hours_to_oom',
+                  [{'pid': top['pid'], 'name': top['name'], 'slope_mb_per_hour': top['slope_mb_per_hour']}],
+                  [top['hours_to_oom']])
+
+    return frame
+
+
+class CompiledRule:
+    """
+    A rule compiled to a comparator ufunc and a threshold array, one entry per
+    severity level (most severe first); thresholds are edited in place
+
+    Windowed rules keep a SeriesWindow per series and compare its aggregate
+    instead of the latest value.
+    """
+
+    __slots__ = ('name', 'category', 'metric', 'compare', 'levels', 'thresholds',
+                 'level_names', 'match', 'exclude', 'rule', 'aggregate', 'window',
+                 'min_coverage', 'percentile', 'windows')
+
+    def __init__(self, rule: Dict[str, Any]):
+        comparator = rule.get('comparator', '>')
+        if comparator not in COMPARATORS:
+            raise ValueError(f"Unknown comparator {comparator!r} in rule {rule.get('name')!r}")
+        aggregate = rule.get('aggregate', 'last')
+        if aggregate not in AGGREGATES:
+            raise ValueError(f"Unknown aggregate {aggregate!r} in rule {rule.get('name')!r}")
+        if aggregate != 'last' and not rule.get('window', 0) > 0:
+            raise ValueError(f"Rule {rule.get('name')!r} needs a window (seconds) for {aggregate!r}")
+        if not rule.get('levels'):
+            raise ValueError(f"Rule {rule.get('name')!r} has no severity levels")
+
+        self.rule = rule
+        self.name = rule['name']
+        self.category = rule.get('category', self.name)
+        self.metric = rule['metric']
+        self.compare = COMPARATORS[comparator]
+        self.levels = rule['levels']
+        self.level_names = [level['name'] for level in self.levels]
+        self.thresholds = np.array([level['threshold'] for level in self.levels], dtype=np.float64)
+        self.match = {key: list(values) for key, values in rule.get('match', {}).items()}
+        self.exclude = {key: list(values) for key, values in rule.get('exclude', {}).items()}
+        self.aggregate = aggregate
+        self.window = float(rule.get('window', 0))
+        self.min_coverage = float(rule.get('min_coverage', 1.0))
+        self.percentile = float(rule.get('percentile', 95.0))
+        self.windows = {}  # series name -> SeriesWindow
+
+    def set_threshold(self, level_name: str, value: float) -> bool:
+        if level_name not in self.level_names:
+            return False
+        index = self.level_names.index(level_name)
+        self.thresholds[index] = value
+        self.levels[index]['threshold'] = value
+        return True
+
+    @staticmethod
+    def _label_mask(frame: MetricFrame, labels: List[Dict[str, Any]], key: str, values: List[Any]) -> np.ndarray:
+        # Element-wise equality: label arrays mix None and strings, so no sorting
+        array = frame.label_array(labels, key)
+        mask = np.zeros(len(array), dtype=bool)
+        for value in values:
+            mask |= array == value
+        return mask
+
+    def _new_window(self) -> SeriesWindow:
+        if self.aggregate == 'percentile':
+            return PercentileWindow(self.window, self.min_coverage, self.percentile)
+        return WINDOWS[self.aggregate](self.window, self.min_coverage)
+
+    def _aggregate(self, frame: MetricFrame, labels: List[Dict[str, Any]], values: np.ndarray) -> np.ndarray:
+        timestamp = frame.timestamp
+        windows = self.windows
+        aggregated = []
+        for key, value in zip(frame.series_keys(labels), values.tolist()):
+            window = windows.get(key)
+            if window is None:
+                window = windows[key] = self._new_window()
+            aggregated.append(window.push(timestamp, value))
+
+        # Forget series (e.g. exited processes) not seen for a whole window
+        if len(windows) > len(labels):
+            cutoff = timestamp - self.window
+            for key in [key for key, window in windows.items() if window.last_seen < cutoff]:
+                del windows[key]
+        return np.array(aggregated, dtype=np.float64)
+
+    def evaluate(self, frame: MetricFrame) -> Optional['RuleResult']:
+        family = frame.get(self.metric)
+        if family is None:
+            return None
+        labels, values = family
+        if self.aggregate != 'last':
+            values = self._aggregate(frame, labels, values)
+
+        # One comparison per (level, series); the first matching level is the most severe
+        matches = self.compare(values[np.newaxis, :], self.thresholds[:, np.newaxis])
+        levels = np.where(matches.any(axis=0), matches.argmax(axis=0), -1)
+
+        for key, allowed in self.match.items():
+            levels[~self._label_mask(frame, labels, key, allowed)] = -1
+        for key, excluded in self.exclude.items():
+            levels[self._label_mask(frame, labels, key, excluded)] = -1
+
+        return RuleResult(self, labels, values, levels)
+
+
+class RuleResult:
+    """The outcome of one rule over every series of its metric family"""
+
+    __slots__ = ('rule', 'labels', 'values', 'levels')
+
+    def __init__(self, rule: CompiledRule, labels: List[Dict[str, Any]], values: np.ndarray, levels: np.ndarray):
+        self.rule = rule
+        self.labels = labels
+        self.values = values
+        self.levels = levels  # index into rule.levels per series, -1 when not breached
+
+    def level_name(self, index: int) -> Optional[str]:
+        level = self.levels[index]
+        return self.rule.level_names[level] if level >= 0 else None
+
+    def breaches(self) -> np.ndarray:
+        return np.flatnonzero(self.levels >= 0)
+
+
+class RuleEngine:
+    """
+    Declarative threshold rules compiled once and evaluated in a single batched
+    pass over every series of a snapshot
+
+    A rule is a dict: name, category, metric (a MetricFrame family), comparator,
+    aggregate, levels ([{'name', 'threshold', ...}], most severe first), optional
+    match/exclude label filters and a message template formatted with the value,
+    threshold and series labels. Levels may carry extra fields for the caller.
+
+    aggregate is 'last' (the sampled value) or one of avg, max, min, rate and
+    percentile over the last window seconds, with optional min_coverage (the
+    fraction of the window a series must have been observed for, default 1.0)
+    and percentile (default 95). "avg CPU > 80% for 5 minutes" is
+    {'metric': 'cpu.percent', 'aggregate': 'avg', 'window': 300, ...}.
+    """
+
+    def __init__(self, rules: List[Dict[str, Any]] = None):
+        self.rules = []
+        self._by_name = {}
+        self.last_evaluation = {'rules': 0, 'series': 0, 'duration_ms': 0.0}
+        self._lock = threading.Lock()
+        self.set_rules(rules or [])
+
+    def set_rules(self, rules: List[Dict[str, Any]]):
+        """Replace the rule set (compiles every rule; threshold edits don't need this)"""
+        compiled = [CompiledRule(rule) for rule in rules]
+        with self._lock:
+            # Rules whose window is unchanged keep their series history
+            for rule in compiled:
+                previous = self._by_name.get(rule.name)
+                if previous is not None and (previous.metric, previous.aggregate, previous.window,
+                                             previous.min_coverage, previous.percentile) == \
+                        (rule.metric, rule.aggregate, rule.window, rule.min_coverage, rule.percentile):
+                    rule.windows = previous.windows
+            self.rules = compiled
+            self._by_name = {rule.name: rule for rule in compiled}
+
+    def get_rule(self, name: str) -> Optional[Dict[str, Any]]:
+        rule = self._by_name.get(name)
+        return rule.rule if rule else None
+
+    def set_threshold(self, rule_name: str, level_name: str, value: float) -> bool:
+        """Change one level's threshold in place; takes effect on the next evaluation"""
+        rule = self._by_name.get(rule_name)
+        return rule is not None and rule.set_threshold(level_name, float(value))
+
+    def set_thresholds(self, rule_name: str, levels: Dict[str, float]) -> bool:
+        """Change several levels of one rule, e.g. {'warning': 80, 'critical': 95}"""
+        results = [self.set_threshold(rule_name, level, value) for level, value in levels.items()]
+        return bool(results) and all(results)
+
+    def get_thresholds(self) -> Dict[str, Dict[str, float]]:
+        """Get every rule's thresholds by level name"""
+        return {
+            rule.name: dict(zip(rule.level_names, rule.thresholds.tolist()))
+            for rule in self.rules
+        }
+
+    def evaluate(self, source: Union[MetricFrame, Dict[str, Any]]) -> List[RuleResult]:
+        """Evaluate every rule against a frame (or a snapshot, flattened first)"""
+        frame = source if isinstance(source, MetricFrame) else build_frame(source)
+        started = time.perf_counter()
+
+        results = []
+        series = 0
+        with self._lock:  # windowed rules keep per-series state
+            for rule in self.rules:
+                result = rule.evaluate(frame)
+                if result is not None:
+                    results.append(result)
+                    series += len(result.values)
+
+        self.last_evaluation = {
+            'rules': len(self.rules),
+            'series': series,
+            'duration_ms': (time.perf_counter() - started) * 1000
+        }
+        return results
+
+    @staticmethod
+    def findings(results: List[RuleResult]) -> Iterator[Dict[str, Any]]:
+        """Yield one finding per breached series, in rule order"""
+        for result in results:
+            rule = result.rule
+            for index in result.breaches():
+                level = rule.levels[result.levels[index]]
+                value = float(result.values[index])
+                labels = result.labels[index]
+                template = level.get('message', rule.rule.get('message', '{value:.1f}'))
+                yield {
+                    'rule': rule.name,
+                    'category': rule.category,
+                    'level': level,
+                    'value': value,
+                    'threshold': float(rule.thresholds[result.levels[index]]),
+                    'labels': labels,
+                    'message': template.format_map(dict(labels, value=value, threshold=level['threshold']))
+                }
@@ -0,0 +1,199 @@
+import threading
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+
+_UNSET = object()
+
+SERIES_LABELS = {
+    'cpu': 'CPU usage',
+    'memory': 'memory usage',
+    'disk': 'disk usage'
+}
+
+
+class SeriesState:
+    """
+    Evaluation state for one metric series (e.g. CPU, or one disk device)
+    """
+
+    __slots__ = ('key', 'breaches', 'recoveries', 'alert_id', 'level', 'peak')
+
+    def __init__(self, key: Tuple[str, ...]):
+        self.key = key
+        self.breaches = 0     # consecutive samples over the warning threshold
+        self.recoveries = 0   # consecutive samples under the clear threshold
+        self.alert_id = None  # the series' open alert, if any
+        self.level = None
+        self.peak = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'series': '/'.join(self.key),
+            'breaches': self.breaches,
+            'recoveries': self.recoveries,
+            'alert_id': self.alert_id,
+            'level': self.level,
+            'peak': self.peak
+        }
+
+
+class RuleEvaluator:
+    """
+    Stateful threshold evaluation with consecutive-check debouncing and hysteresis
+
+    An alert opens only after consecutive_checks breaches in a row, is updated in
+    place while the breach lasts (escalating from warning to critical), and is
+    resolved once the value stays below warning_threshold - clear_margin for
+    clear_checks samples.
+    """
+
+    def __init__(self, alert_manager):
+        self.alert_manager = alert_manager
+        self.series = {}
+        self._lock = threading.Lock()
+
+    def _rule(self, category: str) -> Dict[str, Any]:
+        return self.alert_manager.alert_rules.get(category, {})
+
+    @staticmethod
+    def _level(value: float, rule: Dict[str, Any]) -> Optional[str]:
+        if value >= rule['critical_threshold']:
+            return 'critical'
+        if value >= rule['warning_threshold']:
+            return 'warning'
+        return None
+
+    @staticmethod
+    def _message(category: str, level: str, value: float, device: str = None) -> str:
+        label = SERIES_LABELS.get(category, f'{category} usage')
+        if device:
+            label += f' on {device}'
+        prefix = 'Critical' if level == 'critical' else 'High'
+        return f'{prefix} {label}: {value:.1f}%'
+
+    def evaluate(self, category: str, value: float, device: str = None,
+                 level: Optional[str] = _UNSET, labels: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
+        """
+        Feed one sample; returns the alert if it was opened or escalated by this sample
+
+        level is the sample's breach level ('critical', 'warning' or None) when the
+        rule engine has already computed it; otherwise it is derived from the rule.
+        labels (e.g. pid, device) are kept on the alert for incident correlation.
+        """
+        rule = self._rule(category)
+        if 'warning_threshold' not in rule or 'critical_threshold' not in rule:
+            return None
+
+        key = (category, device) if device else (category,)
+        required = max(1, int(rule.get('consecutive_checks', 1)))
+        clear_threshold = rule.get('clear_threshold', rule['warning_threshold'] - rule.get('clear_margin', 0.0))
+        clear_checks = max(1, int(rule.get('clear_checks', 1)))
+        if level is _UNSET:
+            level = self._level(value, rule)
+        now = datetime.now().isoformat()
+
+        with self._lock:
+            state = self.series.get(key)
+            if state is None:
+                state = self.series[key] = SeriesState(key)
+
+            # A manually resolved or evicted alert no longer belongs to the series
+            alert = self.alert_manager.store.get(state.alert_id) if state.alert_id else None
+            if alert is None or alert['resolved']:
+                state.alert_id = None
+                state.level = None
+
+            if state.alert_id is None:
+                state.recoveries = 0
+                if level is None:
+                    state.breaches = 0
+                    state.peak = None
+                    return None
+
+                state.breaches += 1
+                state.peak = value if state.peak is None else max(state.peak, value)
+                if state.breaches < required:
+                    return None
+
+                threshold_key = 'critical_threshold' if level == 'critical' else 'warning_threshold'
+                alert = self.alert_manager.add_alert(
+                    'threshold', category,
+                    self._message(category, level, value, device),
+                    level,
+                    {
+                        'value': value,
+                        'threshold': rule[threshold_key],
+                        'device': device,
+                        'labels': labels or {},
+                        'peak': state.peak,
+                        'breaches': state.breaches,
+                        'first_seen': now,
+                        'last_seen': now
+                    }
+                )
+                state.alert_id = alert['id']
+                state.level = level
+                return alert
+
+            # Open alert: update it in place until the series recovers
+            if value < clear_threshold:
+                state.recoveries += 1
+                if state.recoveries >= clear_checks:
+                    self.alert_manager.resolve_alert(
+                        state.alert_id, f"Recovered: {value:.1f}% below {clear_threshold:.1f}%")
+                    state.alert_id = None
+                    state.level = None
+                    state.breaches = 0
+                    state.recoveries = 0
+                    state.peak = None
+                return None
+
+            state.recoveries = 0
+            if level is not None:
+                state.breaches += 1
+            state.peak = max(state.peak or value, value)
+
+            metadata = dict(alert['metadata'], value=value, peak=state.peak,
+                            breaches=state.breaches, last_seen=now)
+            changes = {'metadata': metadata, 'updated_at': now}
+            escalated = level == 'critical' and state.level != 'critical'
+            if escalated:
+                state.level = 'critical'
+                metadata['threshold'] = rule['critical_threshold']
+                changes['severity'] = 'critical'
+            if level is not None:
+                # Word the message by the alert's severity, which stays critical until the alert clears
+                changes['message'] = self._message(category, state.level or level, value, device)
+
+            alert = self.alert_manager.update_alert(state.alert_id, notify=escalated, **changes)
+            return alert if escalated else None
+
+    def adopt_open_alerts(self) -> int:
+        """Re-attach open threshold alerts to their series (e.g. after restoring from a journal)"""
+        adopted = 0
+        with self._lock:
+            for alert in self.alert_manager.store.query(states=['open', 'acknowledged']):
+                if alert.get('type') != 'threshold':
+                    continue
+                metadata = alert.get('metadata', {})
+                device = metadata.get('device')
+                key = (alert['category'], device) if device else (alert['category'],)
+                if key in self.series:
+                    continue
+                state = self.series[key] = SeriesState(key)
+                state.alert_id = alert['id']
+                state.level = alert['severity']
+                state.breaches = metadata.get('breaches', 0)
+                state.peak = metadata.get('peak')
+                adopted += 1
+        return adopted
+
+    def get_series_states(self) -> List[Dict[str, Any]]:
+        """Get the evaluation state of every tracked series"""
+        with self._lock:
+            return [state.to_dict() for state in self.series.values()]
+
+    def reset(self):
+        """Forget all series state (open alerts are left as they are)"""
+        with self._lock:
+            self.series.clear()
@@ -1,33 +1,107 @@
 import os
-import subprocess
 import psutil
 import gc
 import tempfile
 import shutil
+import threading
 import time
 from datetime import datetime
 from typing import Dict, List, Any, Optional
-import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from .healing_planner import HealingPlanner
+from .healing_executor import HealingExecutor, HealingJob
+from .healing_actions import HealingActionRegistry
+from .healing_effectiveness import EffectivenessTracker
+from .process_throttler import ProcessThrottler
 
 class SelfHealer:
     """
     Self-healing system management class for automatic issue resolution
     """
     
-    def __init__(self):
+    def __init__(self, action_registry: HealingActionRegistry = None):
         self.healing_log = []
         self.max_log_entries = 100
         self.healing_active = False
-        self.healing_thread = None
-        self.stop_healing = threading.Event()
+        self.sampler = None
+        self._issues_token = None
+        self.planner = HealingPlanner()
+        self.executor = HealingExecutor()
+        self.action_profiles = self.load_default_action_profiles()
+        self.actions = action_registry or HealingActionRegistry()
+        self.effectiveness = EffectivenessTracker()
+        self.throttler = ProcessThrottler()
+        self.throttle_release_threshold = 60.0  # CPU % below which throttles are lifted
+        self.protected_processes = [
+            'System', 'System Idle Process', 'Registry', 'dwm.exe', 
+            'winlogon.exe', 'csrss.exe', 'smss.exe', 'explorer.exe',
+            'svchost.exe', 'lsass.exe', 'services.exe', 'wininet.exe'
+        ]
+        self.set_cpu_healing_mode('throttle')
+        self.leak_termination_enabled = False
+        self.planner.limiter.on_transition = self._on_breaker_transition
+        
+    def load_default_action_profiles(self) -> Dict[str, Any]:
+        """Load default executor settings for each healing action"""
+        return {
+            'throttle_high_cpu_processes': {
+                'method': 'throttle_high_cpu_processes',
+                'priority': 1,
+                'deadline': 30,  # seconds
+                'resource_class': 'cpu'
+            },
+            'kill_high_cpu_processes': {
+                'method': 'kill_high_cpu_processes',
+                'priority': 1,
+                'deadline': 30,
+                'resource_class': 'cpu'
+            },
+            'free_memory': {
+                'method': 'free_memory',
+                'priority': 2,
+                'deadline': 60,
+                'resource_class': 'subprocess'
+            },
+            'terminate_leak_suspects': {
+                'method': 'terminate_leak_suspects',
+                'priority': 2,
+                'deadline': 30,
+                'resource_class': 'cpu'
+            },
+            'restart_services': {
+                'method': 'restart_unresponsive_services',
+                'priority': 3,
+                'deadline': 120,
+                'resource_class': 'subprocess'
+            },
+            'clean_temp_files': {
+                'method': 'clean_temp_files',
+                'priority': 4,
+                'deadline': 300,
+                'resource_class': 'io'
+            },
+            'disk_cleanup': {
+                'method': 'disk_cleanup',
+                'priority': 5,
+                'deadline': 180,
+                'resource_class': 'subprocess'
+            },
+            'optimize_startup': {
+                'method': 'optimize_startup_programs',
+                'priority': 8,
+                'deadline': 60,
+                'resource_class': 'io'
+            }
+        }
         
-    def log_action(self, action: str, success: bool, message: str):
-        """Log healing actions"""
+    def log_action(self, action: str, success: bool, message: str, breaker: str = None):
+        """Log healing actions with the action's circuit breaker state"""
         log_entry = {
             'timestamp': datetime.now().isoformat(),
             'action': action,
             'success': success,
-            'message': message
+            'message': message,
+            'breaker': breaker or self.planner.limiter.get_breaker_state(action)
         }
         self.healing_log.append(log_entry)
         
@@ -41,11 +115,7 @@ class SelfHealer:
         Kill processes consuming excessive CPU
         """
         if exclude_processes is None:
-            exclude_processes = [
-                'System', 'System Idle Process', 'Registry', 'dwm.exe', 
-                'winlogon.exe', 'csrss.exe', 'smss.exe', 'explorer.exe',
-                'svchost.exe', 'lsass.exe', 'services.exe', 'wininet.exe'
-            ]
+            exclude_processes = self.protected_processes
         
         try:
             killed_processes = []
@@ -98,67 +168,156 @@ class SelfHealer:
                 'killed_processes': []
             }
     
+    def throttle_high_cpu_processes(self, cpu_threshold: float = 80.0,
+                                    exclude_processes: List[str] = None,
+                                    methods: List[str] = None) -> Dict[str, Any]:
+        """
+        Throttle processes consuming excessive CPU instead of killing them
+        """
+        if exclude_processes is None:
+            exclude_processes = self.protected_processes
+        
+        try:
+            throttled_processes = []
+            
+            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent']):
+                try:
+                    cpu_usage = proc.info['cpu_percent']
+                    process_name = proc.info['name']
+                    
+                    if (cpu_usage and cpu_usage > cpu_threshold and 
+                        process_name not in exclude_processes and
+                        proc.info['pid'] != os.getpid()):
+                        
+                        result = self.throttler.throttle(proc.info['pid'], methods=methods)
+                        if result['success']:
+                            throttled_processes.append({
+                                'pid': proc.info['pid'],
+                                'name': process_name,
+                                'cpu_percent': cpu_usage,
+                                'applied': result['applied']
+                            })
+                        
+                except (psutil.NoSuchProcess, psutil.AccessDenied, 
+                       psutil.ZombieProcess, PermissionError):
+                    continue
+            
+            message = f"Throttled {len(throttled_processes)} high CPU processes"
+            self.log_action("throttle_high_cpu_processes", True, message)
+            
+            return {
+                'success': True,
+                'message': message,
+                'throttled_processes': throttled_processes
+            }
+            
+        except Exception as e:
+            error_msg = f"Error throttling high CPU processes: {e}"
+            self.log_action("throttle_high_cpu_processes", False, error_msg)
+            return {
+                'success': False,
+                'message': error_msg,
+                'throttled_processes': []
+            }
+    
+    def release_throttles(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Lift recorded throttles once CPU load has normalized (or unconditionally with force)
+        """
+        if not self.throttler.ledger.pids():
+            return {'success': True, 'message': "No throttled processes", 'released': []}
+        
+        try:
+            cpu_percent = psutil.cpu_percent(interval=None)
+            if not force and cpu_percent >= self.throttle_release_threshold:
+                return {
+                    'success': True,
+                    'message': f"CPU still at {cpu_percent:.1f}%, keeping throttles",
+                    'released': []
+                }
+            
+            results = self.throttler.release_all()
+            released = [r for r in results if r['success']]
+            failed = [r for r in results if not r['success']]
+            message = f"Released throttles on {len(released)} processes"
+            if failed:
+                message += f"; {len(failed)} still throttled ({failed[0]['message']})"
+            self.log_action("release_throttles", not failed, message)
+            
+            return {'success': not failed, 'message': message, 'released': released, 'failed': failed}
+            
+        except Exception as e:
+            error_msg = f"Error releasing throttles: {e}"
+            self.log_action("release_throttles", False, error_msg)
+            return {'success': False, 'message': error_msg, 'released': []}
+    
+    def get_throttled_processes(self) -> List[Dict[str, Any]]:
+        """Get the reversible-throttle ledger"""
+        return self.throttler.get_ledger()
+    
+    def set_cpu_healing_mode(self, mode: str):
+        """
+        Choose whether CPU issues throttle offenders ('throttle') or kill them ('kill');
+        throttle mode never falls back to killing when throttling is cooling down
+        """
+        kill = {'action': 'kill_high_cpu_processes', 'method': 'kill_high_cpu_processes',
+                'kwargs': {'cpu_threshold': 75.0}}
+        throttle = {'action': 'throttle_high_cpu_processes', 'method': 'throttle_high_cpu_processes',
+                    'kwargs': {'cpu_threshold': 75.0}}
+        
+        if mode == 'throttle':
+            self.planner.action_rules['cpu']['actions'] = [throttle]
+        elif mode == 'kill':
+            self.planner.action_rules['cpu']['actions'] = [kill]
+        else:
+            raise ValueError(f"Unknown CPU healing mode: {mode}")
+        self.cpu_healing_mode = mode
+    
+    def set_leak_termination(self, enabled: bool, min_observed_minutes: float = 60.0,
+                             min_growth_mb: float = 512.0):
+        """
+        Opt in to (or out of) terminating memory leak suspects automatically; a suspect
+        must have been tracked for min_observed_minutes and grown by min_growth_mb
+        """
+        actions = [entry for entry in self.planner.action_rules['memory']['actions']
+                   if entry['action'] != 'terminate_leak_suspects']
+        if enabled:
+            # issue_kwargs maps method arguments to fields carried on the issue
+            actions.append({'action': 'terminate_leak_suspects', 'method': 'terminate_leak_suspects',
+                            'kwargs': {'min_observed_seconds': min_observed_minutes * 60,
+                                       'min_growth_mb': min_growth_mb},
+                            'issue_kwargs': {'leak_suspects': 'leak_suspects'}})
+        self.planner.action_rules['memory']['actions'] = actions
+        self.leak_termination_enabled = enabled
+    
     def free_memory(self) -> Dict[str, Any]:
         """
         Free up system memory using various techniques
+        
+        The memory freed is measured by the effectiveness tracker after its
+        settling window, like every other action, not from an immediate delta.
         """
         try:
-            # Get initial memory usage
-            initial_memory = psutil.virtual_memory()
-            initial_used = initial_memory.used
-            
             actions_taken = []
             
             # 1. Force garbage collection
             gc.collect()
             actions_taken.append("Python garbage collection")
             
-            # 2. Clear system caches (Windows specific)
-            try:
-                # Clear DNS cache
-                subprocess.run(['ipconfig', '/flushdns'], 
-                             capture_output=True, check=False)
-                actions_taken.append("DNS cache flush")
-            except:
-                pass
-            
-            # 3. Empty working sets of processes (Windows specific)
-            try:
-                # This requires admin privileges, so we'll try but not fail if it doesn't work
-                subprocess.run(['rundll32.exe', 'advapi32.dll,ProcessIdleTasks'], 
-                             capture_output=True, check=False, timeout=10)
-                actions_taken.append("Process idle tasks")
-            except:
-                pass
-            
-            # 4. Clear standby memory (requires admin rights)
-            try:
-                # This is a more aggressive approach - use with caution
-                subprocess.run(['powershell', '-Command', 
-                              'Get-Process | Where-Object {$_.WorkingSet -gt 100MB} | ForEach-Object {$_.CloseMainWindow()}'],
-                             capture_output=True, check=False, timeout=15)
-                actions_taken.append("Large process cleanup")
-            except:
-                pass
-            
-            # Get final memory usage
-            final_memory = psutil.virtual_memory()
-            final_used = final_memory.used
-            
-            memory_freed = initial_used - final_used
-            memory_freed_mb = memory_freed / (1024 * 1024)
+            # 2. Platform-specific cache and working set cleanup
+            category_result = self.actions.run_category('memory')
+            actions_taken.extend(category_result['operations'])
             
             message = f"Memory optimization completed. Actions: {', '.join(actions_taken)}"
-            if memory_freed > 0:
-                message += f". Freed: {memory_freed_mb:.1f} MB"
             
             self.log_action("free_memory", True, message)
             
             return {
                 'success': True,
                 'message': message,
-                'memory_freed_mb': memory_freed_mb,
-                'actions_taken': actions_taken
+                'operations': category_result['operations'],
+                'actions_taken': actions_taken,
+                'skipped_actions': category_result['skipped']
             }
             
         except Exception as e:
@@ -167,10 +326,73 @@ class SelfHealer:
             return {
                 'success': False,
                 'message': error_msg,
-                'memory_freed_mb': 0,
+                'operations': [],
                 'actions_taken': []
             }
     
+    def terminate_leak_suspects(self, leak_suspects: List[Dict[str, Any]] = None,
+                                max_hours_to_oom: float = 6.0, max_terminations: int = 1,
+                                exclude_processes: List[str] = None, min_observed_seconds: float = 3600.0,
+                                min_growth_mb: float = 512.0) -> Dict[str, Any]:
+        """
+        Terminate the fastest-growing leak suspects that would exhaust memory soon,
+        only after sustained growth (tracked for min_observed_seconds and grown by min_growth_mb)
+        """
+        if exclude_processes is None:
+            exclude_processes = self.protected_processes
+        
+        try:
+            terminated_processes = []
+            
+            for suspect in leak_suspects or []:
+                if len(terminated_processes) >= max_terminations:
+                    break
+                if suspect.get('hours_to_oom') is None or suspect['hours_to_oom'] > max_hours_to_oom:
+                    continue
+                if suspect['name'] in exclude_processes or suspect['pid'] == os.getpid():
+                    continue
+                if (suspect.get('observed_seconds', 0) < min_observed_seconds or
+                        suspect.get('growth_mb', 0) < min_growth_mb):
+                    continue
+                
+                try:
+                    process = psutil.Process(suspect['pid'])
+                    process.terminate()
+                    try:
+                        process.wait(timeout=5)
+                    except psutil.TimeoutExpired:
+                        process.kill()
+                    
+                    terminated_processes.append({
+                        'pid': suspect['pid'],
+                        'name': suspect['name'],
+                        'rss_mb': suspect['rss_mb'],
+                        'slope_mb_per_hour': suspect['slope_mb_per_hour']
+                    })
+                except (psutil.NoSuchProcess, psutil.AccessDenied, 
+                       psutil.ZombieProcess, PermissionError):
+                    continue
+            
+            message = f"Terminated {len(terminated_processes)} memory leak suspects"
+            if terminated_processes:
+                message += ": " + ', '.join(f"{p['name']} ({p['slope_mb_per_hour']:.0f} MB/h)" for p in terminated_processes)
+            self.log_action("terminate_leak_suspects", True, message)
+            
+            return {
+                'success': True,
+                'message': message,
+                'terminated_processes': terminated_processes
+            }
+            
+        except Exception as e:
+            error_msg = f"Error terminating leak suspects: {e}"
+            self.log_action("terminate_leak_suspects", False, error_msg)
+            return {
+                'success': False,
+                'message': error_msg,
+                'terminated_processes': []
+            }
+    
     def clean_temp_files(self) -> Dict[str, Any]:
         """
         Clean temporary files and folders
@@ -255,61 +477,44 @@ class SelfHealer:
                 'space_freed_mb': 0
             }
     
-    def restart_unresponsive_services(self) -> Dict[str, Any]:
+    def restart_unresponsive_services(self, services: Dict[str, List[str]] = None) -> Dict[str, Any]:
         """
-        Restart unresponsive Windows services
+        Check watched services concurrently and restart stopped ones in dependency order
         """
         try:
-            restarted_services = []
-            
-            # Common services that might need restarting
-            critical_services = [
-                'Spooler',  # Print Spooler
-                'BITS',     # Background Intelligent Transfer Service
-                'Themes',   # Themes service
-                'AudioSrv', # Windows Audio
-                'AudioEndpointBuilder',  # Windows Audio Endpoint Builder
-            ]
+            kwargs = {'services': services} if services is not None else {}
+            category_result = self.actions.run_category('service', **kwargs)
             
-            for service_name in critical_services:
-                try:
-                    # Check service status using sc command
-                    result = subprocess.run(
-                        ['sc', 'query', service_name],
-                        capture_output=True,
-                        text=True,
-                        timeout=10
-                    )
-                    
-                    if result.returncode == 0:
-                        # Parse output to check if service is running
-                        if 'STOPPED' in result.stdout or 'STOP_PENDING' in result.stdout:
-                            # Try to start the service
-                            start_result = subprocess.run(
-                                ['sc', 'start', service_name],
-                                capture_output=True,
-                                text=True,
-                                timeout=30
-                            )
-                            
-                            if start_result.returncode == 0:
-                                restarted_services.append(service_name)
-                        
-                        elif 'RUNNING' in result.stdout:
-                            # Service is running, check if it's responsive
-                            # For now, we'll skip restarting running services
-                            pass
-                            
-                except (subprocess.TimeoutExpired, subprocess.CalledProcessError):
-                    continue
+            restarted_services = []
+            failed_services = []
+            service_statuses = {}
+            errors = []
+            success = True
+            for result in category_result['results'].values():
+                restarted_services.extend(result.get('restarted_services', []))
+                failed_services.extend(result.get('failed_services', []))
+                service_statuses.update(result.get('service_statuses', {}))
+                success = success and result.get('success', False)
+                if not result.get('success') and not result.get('skipped'):
+                    errors.append(result.get('message', ''))
             
             message = f"Restarted {len(restarted_services)} services: {', '.join(restarted_services)}"
-            self.log_action("restart_services", True, message)
+            if failed_services:
+                message += f"; failed: {', '.join(failed_services)}"
+            if errors:
+                message += f"; errors: {'; '.join(errors)}"
+            if not category_result['results']:
+                message = "No service manager available on this host"
+            success = success and not failed_services
+            self.log_action("restart_services", success, message)
             
             return {
-                'success': True,
+                'success': success,
                 'message': message,
-                'restarted_services': restarted_services
+                'restarted_services': restarted_services,
+                'failed_services': failed_services,
+                'service_statuses': service_statuses,
+                'skipped_actions': category_result['skipped']
             }
             
         except Exception as e:
@@ -321,6 +526,23 @@ class SelfHealer:
                 'restarted_services': []
             }
     
+    def set_watched_services(self, services: Dict[str, List[str]]):
+        """
+        Set the services checked by restart_unresponsive_services (name -> names it depends on)
+        """
+        self.actions.configure_services(services)
+    
+    def get_watched_services(self) -> Dict[str, List[str]]:
+        """Get the watched services and their dependencies"""
+        return dict(self.actions.services)
+    
+    def set_failed_unit_discovery(self, enabled: bool):
+        """
+        Opt in to (or out of) restarting every unit systemd reports as failed
+        while no services are watched
+        """
+        self.actions.set_failed_unit_discovery(enabled)
+    
     def optimize_startup_programs(self) -> Dict[str, Any]:
         """
         Disable unnecessary startup programs
@@ -369,24 +591,9 @@ class SelfHealer:
             space_freed = 0
             operations = []
             
-            # Run Windows Disk Cleanup utility
-            try:
-                # This will open the disk cleanup dialog
-                subprocess.run(['cleanmgr', '/sagerun:1'], 
-                             capture_output=True, check=False, timeout=60)
-                operations.append("Windows Disk Cleanup")
-            except:
-                pass
-            
-            # Clear Recycle Bin (requires PowerShell)
-            try:
-                result = subprocess.run([
-                    'powershell', '-Command',
-                    'Clear-RecycleBin -Force -ErrorAction SilentlyContinue'
-                ], capture_output=True, check=False, timeout=30)
-                operations.append("Recycle Bin cleanup")
-            except:
-                pass
+            # Run platform-specific cleanup tools
+            category_result = self.actions.run_category('disk')
+            operations.extend(category_result['operations'])
             
             message = f"Disk cleanup completed. Operations: {', '.join(operations)}"
             self.log_action("disk_cleanup", True, message)
@@ -395,7 +602,8 @@ class SelfHealer:
                 'success': True,
                 'message': message,
                 'space_freed_mb': space_freed,
-                'operations': operations
+                'operations': operations,
+                'skipped_actions': category_result['skipped']
             }
             
         except Exception as e:
@@ -408,63 +616,141 @@ class SelfHealer:
                 'operations': []
             }
     
-    def auto_heal(self, issues: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def submit_action(self, action: str, priority: int = None, deadline: float = None,
+                      category: str = None, on_complete=None, **kwargs) -> HealingJob:
+        """
+        Submit a healing action to the executor and return its job handle
+        
+        The run is measured before and after a settling window, and the delta
+        is attributed to the action for the given issue category.
+        """
+        profile = self.action_profiles.get(action)
+        if profile is None:
+            raise ValueError(f"Unknown healing action: {action}")
+        
+        return self.executor.submit(
+            action,
+            self._run_measured,
+            action,
+            profile['method'],
+            category,
+            priority=profile['priority'] if priority is None else priority,
+            deadline=profile['deadline'] if deadline is None else deadline,
+            resource_class=profile['resource_class'],
+            on_complete=on_complete,
+            **kwargs
+        )
+    
+    def _run_measured(self, action: str, method: str, category: str, **kwargs) -> Dict[str, Any]:
+        """Run an action between effectiveness measurements"""
+        measurement = self.effectiveness.begin(action, category)
+        result = getattr(self, method)(**kwargs)
+        self.effectiveness.complete(measurement, result)
+        return result
+    
+    def get_effectiveness_statistics(self) -> List[Dict[str, Any]]:
+        """Get measured effectiveness statistics per action and issue category"""
+        return self.effectiveness.get_statistics()
+    
+    def get_job_status(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Get status of a submitted healing job"""
+        job = self.executor.get_job(job_id)
+        return job.to_dict() if job else None
+    
+    def get_jobs(self, limit: int = 50, active_only: bool = False) -> List[Dict[str, Any]]:
+        """Get status of recent healing jobs"""
+        return self.executor.get_jobs(limit=limit, active_only=active_only)
+    
+    def auto_heal(self, issues: List[Dict[str, Any]], wait: bool = True) -> Dict[str, Any]:
         """
         Automatically resolve detected issues
+        
+        Planned actions run in parallel on the executor. With wait=False the
+        job handles are returned immediately so callers can poll progress.
         """
         healing_results = []
+        skipped_actions = []
+        submitted = []
         
         try:
-            for issue in issues:
-                category = issue.get('category', '')
-                severity = issue.get('severity', '')
+            # Coalesce issues into distinct actions, honouring cooldowns and in-flight runs
+            plan = self.planner.plan(issues, ranker=self.effectiveness.rank_actions)
+            skipped_actions.extend(plan['skipped'])
+            
+            # Lift throttles once CPU pressure is gone
+            if not any(issue.get('category') == 'cpu' for issue in issues):
+                self.release_throttles()
+            
+            for step in plan['actions']:
+                action = step['action']
                 
-                if category == 'cpu' and severity in ['high', 'medium']:
-                    # High CPU usage - try to kill resource-heavy processes
-                    result = self.kill_high_cpu_processes(cpu_threshold=75.0)
-                    healing_results.append({
-                        'issue': issue['message'],
-                        'action': 'kill_high_cpu_processes',
-                        'result': result
+                refusal = self.planner.begin(action)
+                if refusal:
+                    skipped_actions.append({
+                        'action': action,
+                        'reason': refusal,
+                        'issues': step['issues']
                     })
+                    continue
                 
-                elif category == 'memory' and severity in ['high', 'medium']:
-                    # High memory usage - try to free memory
-                    result = self.free_memory()
-                    healing_results.append({
-                        'issue': issue['message'],
-                        'action': 'free_memory',
-                        'result': result
-                    })
+                try:
+                    job = self.submit_action(
+                        action,
+                        category=step['category'],
+                        on_complete=lambda result, name=action: self.planner.finish(name, result),
+                        **step['kwargs']
+                    )
+                except Exception:
+                    self.planner.finish(action, None)
+                    raise
+                submitted.append((step, job))
+            
+            if not wait:
+                message = f"Auto-healing submitted {len(submitted)} actions"
+                if skipped_actions:
+                    message += f", {len(skipped_actions)} skipped"
+                # Continuous healing calls this every sample; only log cycles that did something
+                if submitted:
+                    self.log_action("auto_heal", True, message)
                 
-                elif category == 'disk' and severity in ['high', 'medium']:
-                    # High disk usage - clean temp files
-                    result = self.clean_temp_files()
-                    healing_results.append({
-                        'issue': issue['message'],
-                        'action': 'clean_temp_files',
-                        'result': result
-                    })
+                return {
+                    'success': True,
+                    'message': message,
+                    'jobs': [job.to_dict() for _, job in submitted],
+                    'skipped_actions': skipped_actions
+                }
+            
+            for step, job in submitted:
+                issue_messages = [issue.get('message', '') for issue in step['issues']]
                 
-                elif category == 'process':
-                    # Process issues - restart services
-                    result = self.restart_unresponsive_services()
-                    healing_results.append({
-                        'issue': issue['message'],
-                        'action': 'restart_services',
-                        'result': result
-                    })
+                try:
+                    result = job.result()
+                except FutureTimeoutError:
+                    result = {'success': False, 'message': f"{step['action']} exceeded its deadline"}
+                except Exception as e:
+                    result = {'success': False, 'message': f"{step['action']} failed: {e}"}
+                
+                healing_results.append({
+                    'issue': '; '.join(issue_messages),
+                    'issues': issue_messages,
+                    'action': step['action'],
+                    'job_id': job.job_id,
+                    'result': result
+                })
             
             successful_healings = sum(1 for r in healing_results if r['result']['success'])
             total_healings = len(healing_results)
             
             message = f"Auto-healing completed: {successful_healings}/{total_healings} successful"
+            if skipped_actions:
+                message += f", {len(skipped_actions)} skipped"
             self.log_action("auto_heal", True, message)
             
             return {
                 'success': True,
                 'message': message,
                 'healing_results': healing_results,
+                'skipped_actions': skipped_actions,
                 'successful_count': successful_healings,
                 'total_count': total_healings
             }
@@ -476,53 +762,98 @@ class SelfHealer:
                 'success': False,
                 'message': error_msg,
                 'healing_results': healing_results,
+                'skipped_actions': skipped_actions,
                 'successful_count': 0,
                 'total_count': 0
             }
     
+    def _on_breaker_transition(self, action: str, state: str, details: Dict[str, Any]):
+        """Log circuit breaker transitions"""
+        if state == 'open':
+            reset_timeout = self.planner.limiter.breakers[action].reset_timeout
+            message = (f"{action} circuit opened after {details['consecutive_ineffective']} ineffective runs; "
+                       f"retrying in {reset_timeout:.0f}s")
+        else:
+            message = f"{action} circuit {state.replace('_', '-')}"
+        self.log_action(f"circuit_breaker:{action}", state != 'open', message, breaker=state)
+    
+    def get_breaker_states(self) -> List[Dict[str, Any]]:
+        """Get token bucket, backoff and circuit breaker state per healing action"""
+        return self.planner.limiter.get_states()
+    
+    def reset_breakers(self, action: str = None):
+        """Close circuit breakers and clear backoff for one action or all actions"""
+        self.planner.limiter.reset(action)
+    
     def get_healing_log(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get recent healing log entries"""
         return self.healing_log[-limit:] if self.healing_log else []
     
-    def start_continuous_healing(self, check_interval: int = 300):
-        """Start continuous healing process"""
+    def start_continuous_healing(self, check_interval: int = None, sampler=None):
+        """
+        Start continuous healing by subscribing to issues published by the shared sampler
+        
+        Healing reacts within one sample period of detection. check_interval,
+        if given, sets the sample period (seconds) of the sampler.
+        """
         if self.healing_active:
             return {"success": False, "message": "Healing already active"}
         
-        self.healing_active = True
-        self.stop_healing.clear()
+        if sampler is None:
+            from .system_sampler import get_shared_sampler
+            sampler = get_shared_sampler()
         
-        def healing_loop():
-            from .system_monitor import SystemMonitor
-            monitor = SystemMonitor()
-            
-            while not self.stop_healing.is_set():
-                try:
-                    issues = monitor.detect_issues()
-                    if issues:
-                        self.auto_heal(issues)
-                    
-                    # Wait for next check or stop signal
-                    self.stop_healing.wait(check_interval)
-                    
-                except Exception as e:
-                    self.log_action("continuous_healing", False, f"Error in healing loop: {e}")
-                    time.sleep(30)  # Wait before retrying
+        if check_interval:
+            sampler.sample_interval = check_interval
         
-        self.healing_thread = threading.Thread(target=healing_loop, daemon=True)
-        self.healing_thread.start()
+        self.sampler = sampler
+        self._issues_token = sampler.bus.subscribe('issues', self._on_issues)
+        self.healing_active = True
+        sampler.start()
         
         return {"success": True, "message": "Continuous healing started"}
     
+    def _on_issues(self, event: Dict[str, Any]):
+        """Heal the issues published for one sample"""
+        if not self.healing_active:
+            return
+        
+        try:
+            issues = event['issues']
+            if issues:
+                self.auto_heal(issues, wait=False)
+            else:
+                self.release_throttles()
+        except Exception as e:
+            self.log_action("continuous_healing", False, f"Error handling issues: {e}")
+    
     def stop_continuous_healing(self):
         """Stop continuous healing process"""
         if not self.healing_active:
             return {"success": False, "message": "Healing not active"}
         
         self.healing_active = False
-        self.stop_healing.set()
         
-        if self.healing_thread:
-            self.healing_thread.join(timeout=5)
+        if self.sampler:
+            self.sampler.bus.unsubscribe(self._issues_token)
+            # Stop the sampler once nobody is listening for issues any more
+            if self.sampler.bus.subscriber_count('issues') == 0:
+                self.sampler.stop()
         
         return {"success": True, "message": "Continuous healing stopped"}
+
+
+_shared_healer = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_healer() -> SelfHealer:
+    """
+    Get the process-wide healer shared by every session, so continuous healing
+    subscribes to the shared sampler once, with one set of cooldowns and limits
+    """
+    global _shared_healer
+    with _shared_lock:
+        if _shared_healer is None:
+            _shared_healer = SelfHealer()
+        return _shared_healer
@@ -0,0 +1,227 @@
+import asyncio
+import contextvars
+import threading
+import time
+import weakref
+from graphlib import TopologicalSorter, CycleError
+from typing import Dict, List, Any, Awaitable, Callable, Tuple
+
+CommandExecutor = Callable[[List[str], float], Awaitable[Dict[str, Any]]]
+
+
+async def subprocess_executor(args: List[str], timeout: float) -> Dict[str, Any]:
+    """Run a command as an asyncio subprocess, killing it when the deadline passes"""
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+    except OSError as e:
+        return {'returncode': None, 'stdout': '', 'stderr': str(e)}
+
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        return {'returncode': None, 'stdout': '', 'stderr': f"Timed out after {timeout}s"}
+
+    return {
+        'returncode': process.returncode,
+        'stdout': stdout.decode(errors='replace'),
+        'stderr': stderr.decode(errors='replace')
+    }
+
+
+class ScriptedCommandExecutor:
+    """
+    Fake command executor that answers from a script instead of spawning processes
+    """
+
+    def __init__(self, responses: Dict[Tuple[str, ...], Dict[str, Any]] = None, delay: float = 0.0):
+        self.responses = responses or {}
+        self.delay = delay
+        self.calls = []
+
+    def set_response(self, args: List[str], returncode: int = 0, stdout: str = '', stderr: str = ''):
+        """Script the result for a command"""
+        self.responses[tuple(args)] = {'returncode': returncode, 'stdout': stdout, 'stderr': stderr}
+
+    async def __call__(self, args: List[str], timeout: float) -> Dict[str, Any]:
+        self.calls.append(list(args))
+        if self.delay:
+            if self.delay > timeout:
+                await asyncio.sleep(timeout)
+                return {'returncode': None, 'stdout': '', 'stderr': f"Timed out after {timeout}s"}
+            await asyncio.sleep(self.delay)
+        return dict(self.responses.get(tuple(args), {'returncode': 1, 'stdout': '', 'stderr': 'unscripted command'}))
+
+
+class AsyncCommandRunner:
+    """
+    Runs commands concurrently with a concurrency cap and per-call deadlines
+    """
+
+    def __init__(self, max_concurrency: int = 4, default_timeout: float = 10.0,
+                 executor: CommandExecutor = None):
+        self.max_concurrency = max_concurrency
+        self.default_timeout = default_timeout
+        self.executor = executor or subprocess_executor
+        # Semaphores are bound to the event loop that uses them: run_sync() creates one per
+        # call (carried in a context variable), other loops get one each
+        self._slots = contextvars.ContextVar(f'command_slots_{id(self)}', default=None)
+        self._loop_semaphores = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        semaphore = self._slots.get()
+        if semaphore is None:
+            loop = asyncio.get_running_loop()
+            with self._lock:
+                semaphore = self._loop_semaphores.get(loop)
+                if semaphore is None:
+                    semaphore = self._loop_semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    async def run(self, args: List[str], timeout: float = None) -> Dict[str, Any]:
+        """Run one command, waiting for a free slot first"""
+        async with self._semaphore():
+            started = time.time()
+            result = await self.executor(args, timeout or self.default_timeout)
+            result['duration'] = time.time() - started
+            return result
+
+    async def run_many(self, commands: List[List[str]], timeout: float = None) -> List[Dict[str, Any]]:
+        """Run several commands concurrently, preserving order of results"""
+        return await asyncio.gather(*(self.run(args, timeout) for args in commands))
+
+    def run_sync(self, coroutine_factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Run a coroutine on a fresh event loop from synchronous code (safe from several threads at once)"""
+        async def bounded():
+            # Created inside the new loop; tasks spawned by the coroutine inherit it
+            self._slots.set(asyncio.Semaphore(self.max_concurrency))
+            return await coroutine_factory()
+
+        return asyncio.run(bounded())
+
+
+class ServiceManager:
+    """
+    Concurrent service health checks with dependency-ordered restarts
+    """
+
+    BACKENDS = ('systemd', 'windows')
+
+    def __init__(self, backend: str, services: Dict[str, List[str]], runner: AsyncCommandRunner = None,
+                 check_timeout: float = 10.0, restart_timeout: float = 30.0):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown service backend: {backend}")
+        self.backend = backend
+        self.services = services  # service name -> names it depends on
+        self.runner = runner or AsyncCommandRunner()
+        self.check_timeout = check_timeout
+        self.restart_timeout = restart_timeout
+
+    def _status_command(self, name: str) -> List[str]:
+        if self.backend == 'systemd':
+            return ['systemctl', 'is-active', name]
+        return ['sc', 'query', name]
+
+    def _restart_command(self, name: str) -> List[str]:
+        if self.backend == 'systemd':
+            return ['systemctl', 'restart', name]
+        return ['sc', 'start', name]
+
+    def _parse_status(self, result: Dict[str, Any]) -> str:
+        """Map command output to running / stopped / unknown"""
+        output = result.get('stdout', '')
+        if self.backend == 'systemd':
+            state = output.strip()
+            if state == 'active':
+                return 'running'
+            if state in ('inactive', 'failed', 'deactivating'):
+                return 'stopped'
+            return 'unknown'
+
+        if result.get('returncode') != 0:
+            return 'unknown'
+        if 'STOPPED' in output or 'STOP_PENDING' in output:
+            return 'stopped'
+        if 'RUNNING' in output:
+            return 'running'
+        return 'unknown'
+
+    def restart_order(self, names: List[str]) -> List[List[str]]:
+        """Group services into levels; each level only depends on earlier levels"""
+        wanted = set(names)
+        graph = {name: [dep for dep in self.services.get(name, []) if dep in wanted] for name in names}
+
+        sorter = TopologicalSorter(graph)
+        try:
+            sorter.prepare()
+        except CycleError:
+            # Fall back to one service at a time in configured order
+            return [[name] for name in names]
+
+        levels = []
+        while sorter.is_active():
+            ready = sorted(sorter.get_ready())
+            levels.append(ready)
+            sorter.done(*ready)
+        return levels
+
+    async def check_all(self) -> Dict[str, str]:
+        """Query every configured service concurrently"""
+        names = list(self.services.keys())
+        results = await self.runner.run_many([self._status_command(name) for name in names],
+                                             timeout=self.check_timeout)
+        return {name: self._parse_status(result) for name, result in zip(names, results)}
+
+    async def restart(self, names: List[str]) -> Dict[str, bool]:
+        """Restart services level by level; dependents of a failed restart are skipped"""
+        outcome = {}
+
+        for level in self.restart_order(names):
+            runnable = [name for name in level
+                        if all(outcome.get(dep, True) for dep in self.services.get(name, []))]
+            for name in level:
+                if name not in runnable:
+                    outcome[name] = False
+
+            results = await self.runner.run_many([self._restart_command(name) for name in runnable],
+                                                 timeout=self.restart_timeout)
+            for name, result in zip(runnable, results):
+                outcome[name] = result.get('returncode') == 0
+
+        return outcome
+
+    async def check_and_restart_async(self) -> Dict[str, Any]:
+        """Check all services and restart the stopped ones"""
+        statuses = await self.check_all()
+        stopped = [name for name, state in statuses.items() if state == 'stopped']
+        outcome = await self.restart(stopped) if stopped else {}
+
+        return {
+            'statuses': statuses,
+            'restarted_services': [name for name, ok in outcome.items() if ok],
+            'failed_services': [name for name, ok in outcome.items() if not ok]
+        }
+
+    def check_and_restart(self) -> Dict[str, Any]:
+        """Synchronous entry point for check_and_restart_async()"""
+        return self.runner.run_sync(self.check_and_restart_async)
+
+
+def load_default_services(platform_name: str) -> Dict[str, List[str]]:
+    """Default services to watch per platform (name -> dependencies)"""
+    if platform_name == 'Windows':
+        return {
+            'Spooler': [],               # Print Spooler
+            'BITS': [],                  # Background Intelligent Transfer Service
+            'Themes': [],                # Themes service
+            'AudioEndpointBuilder': [],  # Windows Audio Endpoint Builder
+            'AudioSrv': ['AudioEndpointBuilder']  # Windows Audio
+        }
+    # Nothing is watched on Linux until services are chosen (or failed-unit discovery is enabled)
+    return {}
@@ -0,0 +1,130 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import zlib
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Union, IO
+
+EXPORT_FORMATS = ('json', 'ndjson', 'csv')
+CHUNK_SIZE = 64 * 1024
+
+
+def coalesce(chunks: Iterable[str], size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Join small chunks into pieces of roughly size characters"""
+    pending = []
+    pending_size = 0
+    for chunk in chunks:
+        pending.append(chunk)
+        pending_size += len(chunk)
+        if pending_size >= size:
+            yield ''.join(pending)
+            pending = []
+            pending_size = 0
+    if pending:
+        yield ''.join(pending)
+
+
+def iter_json_array(records: Iterable[Dict[str, Any]], indent: Optional[int] = 2) -> Iterator[str]:
+    """Yield a JSON array one record at a time (same text as json.dumps(list, indent=indent))"""
+    separator = '\n' + ' ' * indent if indent is not None else ''
+    first = True
+    for record in records:
+        text = json.dumps(record, indent=indent, default=str)
+        if indent is not None:
+            # JSON strings cannot hold raw newlines, so this only re-indents the structure
+            text = text.replace('\n', separator)
+        yield ('[' if first else ',') + separator + text
+        first = False
+    yield '[]' if first else ('\n]' if indent is not None else ']')
+
+
+def iter_ndjson(records: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Yield newline-delimited JSON, one record per line"""
+    for record in records:
+        yield json.dumps(record, default=str) + '\n'
+
+
+def iter_csv(records: Iterable[Dict[str, Any]], fieldnames: List[str] = None) -> Iterator[str]:
+    """
+    Yield CSV rows; fieldnames default to the first record's keys and other keys
+    are ignored. Nothing (not even a header) is yielded for no records.
+    """
+    buffer = io.StringIO()
+    writer = None
+    for record in records:
+        if writer is None:
+            writer = csv.DictWriter(buffer, fieldnames=fieldnames or list(record.keys()),
+                                    extrasaction='ignore', restval='')
+            writer.writeheader()
+        writer.writerow(record)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def iter_export(records: Iterable[Dict[str, Any]], format: str = 'json',
+                fieldnames: List[str] = None) -> Iterator[str]:
+    """Stream records as json, ndjson or csv text chunks"""
+    format = format.lower()
+    if format == 'json':
+        chunks = iter_json_array(records)
+    elif format == 'ndjson':
+        chunks = iter_ndjson(records)
+    elif format == 'csv':
+        chunks = iter_csv(records, fieldnames)
+    else:
+        raise ValueError(f"Unsupported export format: {format}")
+    return coalesce(chunks)
+
+
+def encode_chunks(chunks: Iterable[Union[str, bytes]], encoding: str = 'utf-8') -> Iterator[bytes]:
+    for chunk in chunks:
+        yield chunk.encode(encoding) if isinstance(chunk, str) else chunk
+
+
+def gzip_chunks(chunks: Iterable[Union[str, bytes]], level: int = 6) -> Iterator[bytes]:
+    """Gzip a chunk stream incrementally (the output is a regular .gz file)"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in encode_chunks(chunks):
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def write_chunks(chunks: Iterable[Union[str, bytes]], target: Union[str, IO[bytes]],
+                 compress: bool = False) -> int:
+    """
+    Write a chunk stream to a path or binary file object; returns the bytes written.
+    A path ending in .gz is compressed even if compress is False.
+    """
+    if isinstance(target, str):
+        with open(target, 'wb') as f:
+            return write_chunks(chunks, f, compress or target.endswith('.gz'))
+
+    data = gzip_chunks(chunks) if compress else encode_chunks(chunks)
+    written = 0
+    for chunk in data:
+        target.write(chunk)
+        written += len(chunk)
+    return written
+
+
+def spool_chunks(chunks: Iterable[Union[str, bytes]], compress: bool = False) -> IO[bytes]:
+    """
+    Write a chunk stream to a temporary file and return it reopened for reading
+    (a plain BufferedReader, as st.download_button accepts), e.g. for a download
+    button; the file is unlinked right away where the OS allows it
+    """
+    fd, path = tempfile.mkstemp(prefix='export-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write_chunks(chunks, f, compress)
+        reader = open(path, 'rb')
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass  # e.g. Windows keeps an open file; the temp directory is cleaned up later
+    return reader
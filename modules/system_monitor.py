@@ -4,6 +4,8 @@ import platform
 import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Any
+from .leak_detector import LeakDetector
+from .rule_engine import RuleEngine
 
 class SystemMonitor:
     """
@@ -17,11 +19,82 @@ class SystemMonitor:
         self.disk_history = []
         self.network_history = []
         self.max_history = 100  # Keep last 100 readings
+        self.leak_detector = LeakDetector()
+        self.rule_engine = RuleEngine(self.load_default_issue_rules())
+    
+    def load_default_issue_rules(self) -> List[Dict[str, Any]]:
+        """Load default issue detection rules (see RuleEngine for the rule format)"""
+        return [
+            {
+                # Sustained load only: the lowest sample of the last 30 s must exceed the threshold
+                'name': 'cpu', 'category': 'cpu', 'metric': 'cpu.percent', 'comparator': '>',
+                'aggregate': 'min', 'window': 30,
+                'levels': [
+                    {'name': 'critical', 'threshold': 90, 'type': 'critical', 'severity': 'high',
+                     'message': 'Critical CPU usage: {value:.1f}%'},
+                    {'name': 'warning', 'threshold': 75, 'type': 'warning', 'severity': 'medium',
+                     'message': 'High CPU usage: {value:.1f}%'}
+                ]
+            },
+            {
+                'name': 'memory', 'category': 'memory', 'metric': 'memory.percent', 'comparator': '>', 'aggregate': 'last',
+                'levels': [
+                    {'name': 'critical', 'threshold': 95, 'type': 'critical', 'severity': 'high',
+                     'message': 'Critical memory usage: {value:.1f}%'},
+                    {'name': 'warning', 'threshold': 85, 'type': 'warning', 'severity': 'medium',
+                     'message': 'High memory usage: {value:.1f}%'}
+                ]
+            },
+            {
+                'name': 'disk', 'category': 'disk', 'metric': 'disk.percent', 'comparator': '>', 'aggregate': 'last',
+                'levels': [
+                    {'name': 'critical', 'threshold': 95, 'type': 'critical', 'severity': 'high',
+                     'message': 'Critical disk usage on {device}: {value:.1f}%'},
+                    {'name': 'warning', 'threshold': 85, 'type': 'warning', 'severity': 'medium',
+                     'message': 'High disk usage on {device}: {value:.1f}%'}
+                ]
+            },
+            {
+                # Suspects come from the RSS series fed by the process scan
+                'name': 'leak', 'category': 'memory', 'metric': 'leak.hours_to_oom', 'comparator': '<', 'aggregate': 'last',
+                'message': 'Possible memory leak: {name} (PID: {pid}) growing {slope_mb_per_hour:.1f} MB/h, '
+                           'memory exhausted in ~{value:.1f} h',
+                'levels': [
+                    {'name': 'critical', 'threshold': 4, 'type': 'warning', 'severity': 'high'},
+                    {'name': 'warning', 'threshold': 24, 'type': 'warning', 'severity': 'medium'}
+                ]
+            },
+            {
+                'name': 'zombie_process', 'category': 'process', 'metric': 'process.zombie', 'comparator': '==',
+                'aggregate': 'last',
+                'levels': [
+                    {'name': 'warning', 'threshold': 1, 'type': 'warning', 'severity': 'medium',
+                     'message': 'Zombie process detected: {name} (PID: {pid})'}
+                ]
+            },
+            {
+                'name': 'process_cpu', 'category': 'process', 'metric': 'process.cpu_percent', 'comparator': '>',
+                'aggregate': 'min', 'window': 30,
+                'exclude': {'name': ['System Idle Process', 'System'], 'status': ['zombie']},
+                'levels': [
+                    {'name': 'warning', 'threshold': 50, 'type': 'warning', 'severity': 'medium',
+                     'message': 'High CPU process: {name} using {value:.1f}% CPU'}
+                ]
+            }
+        ]
+    
+    def get_issue_thresholds(self) -> Dict[str, Dict[str, float]]:
+        """Get issue rule thresholds by rule and level name"""
+        return self.rule_engine.get_thresholds()
+    
+    def set_issue_thresholds(self, rule_name: str, levels: Dict[str, float]) -> bool:
+        """Edit issue rule thresholds live, e.g. set_issue_thresholds('cpu', {'warning': 80})"""
+        return self.rule_engine.set_thresholds(rule_name, levels)
         
-    def get_cpu_usage(self) -> float:
-        """Get current CPU usage percentage"""
+    def get_cpu_usage(self, interval: float = 1) -> float:
+        """Get current CPU usage percentage (interval=None measures since the previous call without blocking)"""
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
+            cpu_percent = psutil.cpu_percent(interval=interval)
             self.cpu_history.append({
                 'timestamp': datetime.now(),
                 'value': cpu_percent
@@ -135,6 +208,26 @@ class SystemMonitor:
         except Exception as e:
             raise Exception(f"Error getting network stats: {e}")
     
+    def get_nic_counters(self) -> List[Dict[str, Any]]:
+        """Get per-interface packet counters with error and drop rates (% of packets since boot)"""
+        try:
+            nics = []
+            for nic, counters in psutil.net_io_counters(pernic=True).items():
+                packets = counters.packets_sent + counters.packets_recv
+                errors = counters.errin + counters.errout
+                drops = counters.dropin + counters.dropout
+                nics.append({
+                    'nic': nic,
+                    'packets': packets,
+                    'errors': errors,
+                    'drops': drops,
+                    'error_rate': errors / packets * 100 if packets else 0.0,
+                    'drop_rate': drops / packets * 100 if packets else 0.0
+                })
+            return nics
+        except Exception:
+            return []
+    
     def get_running_processes(self) -> List[Dict[str, Any]]:
         """Get list of running processes with detailed information"""
         try:
@@ -172,11 +265,22 @@ class SystemMonitor:
                     
                 except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
                     continue
+            
+            # Feed per-process RSS series for leak detection
+            self.leak_detector.update(processes)
                     
             return sorted(processes, key=lambda x: x.get('cpu_percent', 0), reverse=True)
         except Exception as e:
             raise Exception(f"Error getting running processes: {e}")
     
+    def get_leak_suspects(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Get memory-leak suspects ranked by RSS growth rate"""
+        try:
+            available_mb = psutil.virtual_memory().available / 1024 / 1024
+            return self.leak_detector.get_suspects(limit=limit, available_mb=available_mb)
+        except Exception as e:
+            raise Exception(f"Error getting leak suspects: {e}")
+    
     def get_system_info(self) -> Dict[str, Any]:
         """Get general system information"""
         try:
@@ -225,88 +329,57 @@ class SystemMonitor:
         except Exception:
             return {}
     
+    def collect_snapshot(self, cpu_interval: float = 1, include_processes: bool = True) -> Dict[str, Any]:
+        """Collect the metrics issue detection works from in a single pass"""
+        snapshot = {
+            'timestamp': datetime.now().isoformat(),
+            'cpu_percent': self.get_cpu_usage(interval=cpu_interval),
+            'cpu_per_core': psutil.cpu_percent(interval=None, percpu=True),
+            'memory': self.get_memory_usage(),
+            'disks': self.get_disk_usage(),
+            'nics': self.get_nic_counters()
+        }
+        
+        if include_processes:
+            snapshot['processes'] = self.get_running_processes()
+            snapshot['leak_suspects'] = self.get_leak_suspects(limit=5)
+        
+        return snapshot
+    
     def detect_issues(self) -> List[Dict[str, Any]]:
         """Detect system issues based on thresholds"""
+        try:
+            return self.evaluate_issues(self.collect_snapshot())
+        except Exception as e:
+            return [{
+                'type': 'error',
+                'category': 'system',
+                'message': f'Error during system monitoring: {e}',
+                'severity': 'high',
+                'timestamp': datetime.now().isoformat()
+            }]
+    
+    def evaluate_issues(self, snapshot: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Evaluate the issue rules against a collected snapshot in one batched pass"""
         issues = []
         
         try:
-            # CPU usage check
-            cpu_percent = self.get_cpu_usage()
-            if cpu_percent > 90:
-                issues.append({
-                    'type': 'critical',
-                    'category': 'cpu',
-                    'message': f'Critical CPU usage: {cpu_percent:.1f}%',
-                    'severity': 'high',
-                    'timestamp': datetime.now().isoformat()
-                })
-            elif cpu_percent > 75:
-                issues.append({
-                    'type': 'warning',
-                    'category': 'cpu',
-                    'message': f'High CPU usage: {cpu_percent:.1f}%',
-                    'severity': 'medium',
-                    'timestamp': datetime.now().isoformat()
-                })
-            
-            # Memory usage check
-            memory = self.get_memory_usage()
-            if memory['percent'] > 95:
-                issues.append({
-                    'type': 'critical',
-                    'category': 'memory',
-                    'message': f'Critical memory usage: {memory["percent"]:.1f}%',
-                    'severity': 'high',
-                    'timestamp': datetime.now().isoformat()
-                })
-            elif memory['percent'] > 85:
+            timestamp = datetime.now().isoformat()
+            for finding in self.rule_engine.findings(self.rule_engine.evaluate(snapshot)):
+                level = finding['level']
                 issues.append({
-                    'type': 'warning',
-                    'category': 'memory',
-                    'message': f'High memory usage: {memory["percent"]:.1f}%',
-                    'severity': 'medium',
-                    'timestamp': datetime.now().isoformat()
+                    'type': level.get('type', level['name']),
+                    'category': finding['category'],
+                    'message': finding['message'],
+                    'severity': level.get('severity', 'medium'),
+                    'timestamp': timestamp
                 })
             
-            # Disk usage check
-            disks = self.get_disk_usage()
-            for disk in disks:
-                if disk['percent'] > 95:
-                    issues.append({
-                        'type': 'critical',
-                        'category': 'disk',
-                        'message': f'Critical disk usage on {disk["device"]}: {disk["percent"]:.1f}%',
-                        'severity': 'high',
-                        'timestamp': datetime.now().isoformat()
-                    })
-                elif disk['percent'] > 85:
-                    issues.append({
-                        'type': 'warning',
-                        'category': 'disk',
-                        'message': f'High disk usage on {disk["device"]}: {disk["percent"]:.1f}%',
-                        'severity': 'medium',
-                        'timestamp': datetime.now().isoformat()
-                    })
-            
-            # Check for unresponsive processes
-            processes = self.get_running_processes()
-            for proc in processes:
-                if proc.get('status') == 'zombie':
-                    issues.append({
-                        'type': 'warning',
-                        'category': 'process',
-                        'message': f'Zombie process detected: {proc["name"]} (PID: {proc["pid"]})',
-                        'severity': 'medium',
-                        'timestamp': datetime.now().isoformat()
-                    })
-                elif proc.get('cpu_percent', 0) > 50 and proc.get('name') not in ['System Idle Process', 'System']:
-                    issues.append({
-                        'type': 'warning',
-                        'category': 'process',
-                        'message': f'High CPU process: {proc["name"]} using {proc["cpu_percent"]:.1f}% CPU',
-                        'severity': 'medium',
-                        'timestamp': datetime.now().isoformat()
-                    })
+            # Memory issues carry the leak suspects so healing can target them
+            leak_suspects = snapshot.get('leak_suspects', [])
+            for issue in issues:
+                if issue['category'] == 'memory':
+                    issue['leak_suspects'] = leak_suspects
                     
         except Exception as e:
             issues.append({
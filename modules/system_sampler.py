@@ -0,0 +1,134 @@
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from .event_bus import EventBus
+from .system_monitor import SystemMonitor
+
+SNAPSHOT_TOPIC = 'snapshot'
+ISSUES_TOPIC = 'issues'
+
+
+class IssueDetector:
+    """
+    Subscribes to snapshots and publishes the issues found in each one
+    """
+
+    def __init__(self, bus: EventBus, monitor: SystemMonitor):
+        self.bus = bus
+        self.monitor = monitor
+        self.latest_issues = []
+        self.latest_timestamp = None
+        self.token = bus.subscribe(SNAPSHOT_TOPIC, self.on_snapshot)
+
+    def on_snapshot(self, snapshot: Dict[str, Any]):
+        """Evaluate a snapshot and publish its issues (an empty list signals a healthy sample)"""
+        issues = self.monitor.evaluate_issues(snapshot)
+        self.latest_issues = issues
+        self.latest_timestamp = snapshot['timestamp']
+        self.bus.publish(ISSUES_TOPIC, {
+            'timestamp': snapshot['timestamp'],
+            'issues': issues
+        })
+
+
+class SystemSampler:
+    """
+    Single collector that samples the system periodically and publishes snapshots on the event bus
+    """
+
+    def __init__(self, bus: EventBus = None, monitor: SystemMonitor = None,
+                 sample_interval: float = 5.0, process_interval: float = 15.0):
+        self.bus = bus or EventBus()
+        self.monitor = monitor or SystemMonitor()
+        self.sample_interval = sample_interval
+        self.process_interval = process_interval  # full process scans are the expensive part
+        self.detector = IssueDetector(self.bus, self.monitor)
+        self.latest_snapshot = None
+        self.samples_taken = 0
+        self.last_sample_duration = 0.0
+        self._last_process_scan = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        """Start sampling (idempotent)"""
+        with self._lock:
+            if self.running:
+                return False
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._sample_loop, name="system-sampler", daemon=True)
+            self._thread.start()
+            return True
+
+    def stop(self, timeout: float = 5):
+        """Stop sampling"""
+        with self._lock:
+            self._stop.set()
+            thread = self._thread
+        if thread:
+            thread.join(timeout=timeout)
+
+    def sample(self) -> Dict[str, Any]:
+        """Collect one snapshot and publish it"""
+        started = time.time()
+        include_processes = started - self._last_process_scan >= self.process_interval
+
+        # cpu_interval=None averages CPU since the previous sample instead of sleeping
+        snapshot = self.monitor.collect_snapshot(cpu_interval=None, include_processes=include_processes)
+
+        if include_processes:
+            self._last_process_scan = started
+        elif self.latest_snapshot and 'processes' in self.latest_snapshot:
+            snapshot['processes'] = self.latest_snapshot['processes']
+            snapshot['leak_suspects'] = self.latest_snapshot.get('leak_suspects', [])
+
+        self.latest_snapshot = snapshot
+        self.samples_taken += 1
+        self.last_sample_duration = time.time() - started
+        self.bus.publish(SNAPSHOT_TOPIC, snapshot)
+        return snapshot
+
+    def _sample_loop(self):
+        while not self._stop.is_set():
+            try:
+                self.sample()
+            except Exception as e:
+                self.bus.publish('sampler_error', {'timestamp': datetime.now().isoformat(), 'error': str(e)})
+            self._stop.wait(self.sample_interval)
+
+    def get_latest_issues(self) -> Optional[List[Dict[str, Any]]]:
+        """Get issues from the most recent sample, or None if nothing was sampled yet"""
+        if self.detector.latest_timestamp is None:
+            return None
+        return self.detector.latest_issues
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get sampler status"""
+        return {
+            'running': self.running,
+            'sample_interval': self.sample_interval,
+            'samples_taken': self.samples_taken,
+            'last_sample_duration': self.last_sample_duration,
+            'last_sample': self.latest_snapshot['timestamp'] if self.latest_snapshot else None,
+            'bus': self.bus.get_stats()
+        }
+
+
+_shared_sampler = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_sampler() -> SystemSampler:
+    """Get the process-wide sampler shared by every session"""
+    global _shared_sampler
+    with _shared_lock:
+        if _shared_sampler is None:
+            _shared_sampler = SystemSampler()
+        return _shared_sampler
@@ -0,0 +1,430 @@
+import heapq
+import http.client
+import itertools
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Any, Callable, Optional
+from urllib.parse import urlsplit
+
+from .notification_dispatcher import NotificationChannel, highest_severity
+
+# Connection errors that mean a pooled keep-alive connection went stale
+STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, http.client.CannotSendRequest,
+                           BrokenPipeError, ConnectionResetError, ConnectionAbortedError)
+
+DEFAULT_RETRY_PATH = os.path.join('logs', 'webhook_retry.json')
+
+
+class WebhookError(Exception):
+    """A failed webhook delivery; retryable errors go to the retry queue"""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class WebhookEndpoint:
+    """
+    One webhook URL with a pool of keep-alive connections, at most
+    max_concurrency of them in use at a time
+    """
+
+    def __init__(self, url: str, headers: Dict[str, str] = None, max_concurrency: int = 2,
+                 timeout: float = 5.0):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f"Invalid webhook URL: {url}")
+
+        self.url = url
+        self.headers = dict(headers or {})
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.timeout = timeout
+        self._scheme = parts.scheme
+        self._host = parts.hostname
+        self._port = parts.port
+        self._path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        self._idle = queue.LifoQueue()  # most recently used connection first
+        self.connections_opened = 0
+
+    def _connection(self) -> http.client.HTTPConnection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            self.connections_opened += 1
+            if self._scheme == 'https':
+                return http.client.HTTPSConnection(self._host, self._port, timeout=self.timeout)
+            return http.client.HTTPConnection(self._host, self._port, timeout=self.timeout)
+
+    def post(self, body: bytes):
+        """POST a JSON body, retrying once on a stale pooled connection; raises WebhookError"""
+        headers = dict({'Content-Type': 'application/json', 'Connection': 'keep-alive'}, **self.headers)
+
+        for attempt in range(2):
+            conn = self._connection()
+            reused = conn.sock is not None
+            try:
+                conn.request('POST', self._path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+            except STALE_CONNECTION_ERRORS as e:
+                conn.close()
+                if reused and attempt == 0:
+                    continue
+                raise WebhookError(f"{self.url}: {e}")
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                raise WebhookError(f"{self.url}: {e}")
+
+            if response.will_close:
+                conn.close()
+            else:
+                self._idle.put(conn)
+
+            if response.status >= 300:
+                # Server errors and throttling are worth retrying; other client errors are not
+                retryable = response.status >= 500 or response.status in (408, 429)
+                raise WebhookError(f"{self.url}: HTTP {response.status}", retryable=retryable)
+            return
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class WebhookNotifier:
+    """
+    Background webhook delivery: per-endpoint worker threads (the endpoint's
+    concurrency limit) over pooled connections, and a bounded retry queue with
+    exponential backoff that is persisted across restarts
+    """
+
+    def __init__(self, retry_path: str = DEFAULT_RETRY_PATH,
+                 max_pending: int = 1000, max_retry: int = 1000, base_delay: float = 2.0,
+                 max_delay: float = 300.0, max_attempts: int = 8, metrics_window: int = 500,
+                 clock: Callable[[], float] = time.time,
+                 endpoint_config: Callable[[str], Optional[Dict[str, Any]]] = None):
+        self.retry_path = retry_path
+        # url -> {'headers', 'max_concurrency', 'timeout'} (or None), used to register the
+        # endpoint of a persisted retry before it is sent
+        self.endpoint_config = endpoint_config
+        self.max_pending = max_pending  # queued batches per endpoint
+        self.max_retry = max_retry      # batches waiting for a retry, across endpoints
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self.metrics_window = metrics_window
+        self.clock = clock
+        self.endpoints = {}  # url -> WebhookEndpoint
+        self.stats = {}      # url -> counters
+        self._queues = {}    # url -> queue of batches
+        self._workers = {}   # url -> [threads]
+        self._latencies = {}
+        self._delivered_at = {}  # url -> deque of (time, alert count) for throughput
+        self._retry = []         # heap of (due, seq, batch)
+        self._retry_seq = itertools.count()
+        self._retry_dirty = False
+        self._held = {}          # url -> batches waiting for their endpoint to be configured
+        self._retry_wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._retry_thread = None
+        self._lock = threading.Lock()
+        self._load_retry_queue()
+
+    def endpoint(self, url: str, headers: Dict[str, str] = None, max_concurrency: int = 2,
+                 timeout: float = 5.0) -> WebhookEndpoint:
+        """Get (or create) an endpoint and its workers"""
+        with self._lock:
+            endpoint = self.endpoints.get(url)
+            if endpoint is None:
+                endpoint = self.endpoints[url] = WebhookEndpoint(url, headers, max_concurrency, timeout)
+                self.stats[url] = {'batches': 0, 'delivered': 0, 'failed': 0, 'retried': 0,
+                                   'dropped': 0, 'in_flight': 0, 'last_error': None}
+                self._queues[url] = queue.Queue()
+                self._latencies[url] = deque(maxlen=self.metrics_window)
+                self._delivered_at[url] = deque()
+            else:
+                endpoint.headers = dict(headers or endpoint.headers)
+            self._ensure_workers(url)
+            held = self._held.pop(url, [])
+            if held:
+                self._retry_dirty = True
+        for batch in held:
+            batch['enqueued_at'] = self.clock()
+            self._queues[url].put(batch)
+        return endpoint
+
+    def _ensure_workers(self, url: str):
+        workers = [thread for thread in self._workers.get(url, []) if thread.is_alive()]
+        while len(workers) < self.endpoints[url].max_concurrency:
+            thread = threading.Thread(target=self._work, args=(url,), name=f"webhook-{len(workers)}", daemon=True)
+            thread.start()
+            workers.append(thread)
+        self._workers[url] = workers
+
+        if self._retry_thread is None or not self._retry_thread.is_alive():
+            self._retry_thread = threading.Thread(target=self._retry_loop, name="webhook-retry", daemon=True)
+            self._retry_thread.start()
+
+    def submit(self, url: str, payload: Dict[str, Any], alert_count: int = 1, attempts: int = 0):
+        """Queue a payload for an endpoint without blocking; the oldest batch is dropped when full"""
+        batch = {'url': url, 'body': json.dumps(payload, default=str), 'alerts': alert_count,
+                 'attempts': attempts, 'enqueued_at': self.clock()}
+        pending = self._queues[url]
+        while pending.qsize() >= self.max_pending:
+            try:
+                dropped = pending.get_nowait()
+                pending.task_done()
+                self.stats[url]['dropped'] += dropped['alerts']
+            except queue.Empty:
+                break
+        pending.put(batch)
+
+    def _work(self, url: str):
+        endpoint = self.endpoints[url]
+        pending = self._queues[url]
+        stats = self.stats[url]
+        while not self._stop.is_set():
+            try:
+                batch = pending.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            with self._lock:
+                stats['in_flight'] += 1
+            try:
+                endpoint.post(batch['body'].encode('utf-8'))
+                now = self.clock()
+                with self._lock:
+                    stats['batches'] += 1
+                    stats['delivered'] += batch['alerts']
+                    self._latencies[url].append(now - batch['enqueued_at'])
+                    self._delivered_at[url].append((now, batch['alerts']))
+            except WebhookError as e:
+                with self._lock:
+                    stats['last_error'] = str(e)
+                self._schedule_retry(batch, e.retryable)
+            except Exception as e:
+                with self._lock:
+                    stats['last_error'] = str(e)
+                self._schedule_retry(batch, True)
+            finally:
+                with self._lock:
+                    stats['in_flight'] -= 1
+                pending.task_done()
+
+    def _schedule_retry(self, batch: Dict[str, Any], retryable: bool):
+        stats = self.stats[batch['url']]
+        batch['attempts'] += 1
+        with self._lock:
+            if not retryable or batch['attempts'] >= self.max_attempts:
+                stats['failed'] += batch['alerts']
+                return
+            if len(self._retry) >= self.max_retry:
+                stats['dropped'] += batch['alerts']
+                return
+            delay = min(self.max_delay, self.base_delay * 2 ** (batch['attempts'] - 1))
+            heapq.heappush(self._retry, (self.clock() + delay, next(self._retry_seq), batch))
+            stats['retried'] += 1
+            self._retry_dirty = True
+        self._retry_wakeup.set()
+
+    def _retry_loop(self):
+        while not self._stop.is_set():
+            with self._lock:
+                due = []
+                now = self.clock()
+                while self._retry and self._retry[0][0] <= now:
+                    due.append(heapq.heappop(self._retry)[2])
+                if due:
+                    self._retry_dirty = True
+                wait = min(1.0, self._retry[0][0] - now) if self._retry else 1.0
+
+            for batch in due:
+                url = batch['url']
+                if url not in self.endpoints:
+                    config = self.endpoint_config(url) if self.endpoint_config else None
+                    if config is None:
+                        # Never send without the endpoint's configured headers; wait for it to be registered
+                        with self._lock:
+                            self._held.setdefault(url, []).append(batch)
+                        continue
+                    self.endpoint(url, config.get('headers'), config.get('max_concurrency', 2),
+                                  config.get('timeout', 5.0))
+                batch['enqueued_at'] = self.clock()
+                self._queues[url].put(batch)
+
+            self._persist_retry_queue()
+            self._retry_wakeup.wait(max(0.01, wait))
+            self._retry_wakeup.clear()
+
+    def _persist_retry_queue(self, extra: List[Dict[str, Any]] = None):
+        with self._lock:
+            if not self._retry_dirty and not extra:
+                return
+            entries = [{'due': due, 'batch': batch} for due, _, batch in self._retry]
+            entries.extend({'due': 0, 'batch': batch} for held in self._held.values() for batch in held)
+            self._retry_dirty = False
+        entries.extend({'due': 0, 'batch': batch} for batch in extra or [])
+
+        try:
+            directory = os.path.dirname(self.retry_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = self.retry_path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f)
+            os.replace(temp_path, self.retry_path)
+        except OSError:
+            pass
+
+    def _load_retry_queue(self):
+        if not self.retry_path or not os.path.exists(self.retry_path):
+            return
+        try:
+            with open(self.retry_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        for entry in entries[:self.max_retry]:
+            heapq.heappush(self._retry, (entry['due'], next(self._retry_seq), entry['batch']))
+        if self._retry:
+            self._retry_thread = threading.Thread(target=self._retry_loop, name="webhook-retry", daemon=True)
+            self._retry_thread.start()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get per-endpoint throughput, latency, retry and connection metrics"""
+        now = self.clock()
+        endpoints = {}
+        with self._lock:
+            for url, stats in self.stats.items():
+                delivered_at = self._delivered_at[url]
+                while delivered_at and delivered_at[0][0] < now - 60:
+                    delivered_at.popleft()
+                latencies = sorted(self._latencies[url])
+                endpoints[url] = dict(
+                    stats,
+                    queued=self._queues[url].qsize(),
+                    connections_opened=self.endpoints[url].connections_opened,
+                    alerts_per_second=sum(count for _, count in delivered_at) / 60,
+                    latency_avg=sum(latencies) / len(latencies) if latencies else None,
+                    latency_p95=latencies[int(0.95 * (len(latencies) - 1))] if latencies else None,
+                    latency_max=latencies[-1] if latencies else None
+                )
+            return {'retry_queue': len(self._retry), 'held': sum(len(held) for held in self._held.values()),
+                    'endpoints': endpoints}
+
+    def flush(self, timeout: float = 10) -> bool:
+        """Wait until nothing is queued or in flight (pending retries are not waited for)"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if all(pending.unfinished_tasks == 0 for pending in list(self._queues.values())):
+                return True
+            time.sleep(0.01)
+        return False
+
+    def close(self, timeout: float = 5):
+        """Stop the workers, persisting undelivered batches with the retry queue"""
+        self.flush(timeout)
+        self._stop.set()
+        self._retry_wakeup.set()
+        for threads in self._workers.values():
+            for thread in threads:
+                thread.join(timeout)
+
+        leftover = []
+        for pending in self._queues.values():
+            while True:
+                try:
+                    leftover.append(pending.get_nowait())
+                except queue.Empty:
+                    break
+        with self._lock:
+            self._retry_dirty = True
+        self._persist_retry_queue(extra=leftover)
+
+        for endpoint in self.endpoints.values():
+            endpoint.close()
+
+
+class WebhookChannel(NotificationChannel):
+    """
+    HTTP webhook and chat notifications; a batch becomes one POST per endpoint
+
+    Settings: endpoints ([{'url', 'headers', 'format', 'max_concurrency'}]),
+    where format is 'json' (the alerts) or 'chat' (Slack/Mattermost-style text).
+    """
+
+    name = 'webhook'
+    default_coalesce_seconds = 1.0
+
+    def __init__(self, settings_provider: Callable[[], Dict[str, Any]], notifier: WebhookNotifier = None):
+        super().__init__(settings_provider)
+        self._notifier = notifier
+        self._lock = threading.Lock()
+
+    @property
+    def notifier(self) -> WebhookNotifier:
+        # Created on first use, so a disabled channel starts no threads and reads no retry file
+        with self._lock:
+            if self._notifier is None:
+                self._notifier = WebhookNotifier(endpoint_config=lambda url: self.endpoint_configs().get(url))
+            return self._notifier
+
+    def endpoint_configs(self) -> Dict[str, Dict[str, Any]]:
+        """Get the configured endpoints by URL"""
+        settings = self.settings
+        configs = {}
+        for config in settings.get('endpoints', []):
+            config = dict(config) if isinstance(config, dict) else {'url': config}
+            config.setdefault('timeout', settings.get('timeout', 5.0))
+            configs[config['url']] = config
+        return configs
+
+    def resume(self):
+        """Start delivering retries persisted by a previous run, without waiting for a new alert"""
+        if not self.enabled():
+            return
+        if self._notifier is None and not os.path.exists(DEFAULT_RETRY_PATH):
+            return
+        for url, config in self.endpoint_configs().items():
+            self.notifier.endpoint(url, config.get('headers'), config.get('max_concurrency', 2),
+                                   config['timeout'])
+
+    def enabled(self) -> bool:
+        settings = self.settings
+        return bool(settings.get('enabled') and settings.get('endpoints'))
+
+    @staticmethod
+    def format_payload(alerts: List[Dict[str, Any]], payload_format: str = 'json') -> Dict[str, Any]:
+        if payload_format == 'chat':
+            lines = [f"[{alert['severity'].upper()}] {alert['category']}: {alert['message']}" for alert in alerts]
+            title = f"{len(alerts)} system alert(s), highest {highest_severity(alerts)}"
+            return {'text': title + "\n" + "\n".join(lines)}
+        return {
+            'source': 'self-healing-system-monitor',
+            'count': len(alerts),
+            'highest_severity': highest_severity(alerts),
+            'alerts': alerts
+        }
+
+    def deliver(self, alerts: List[Dict[str, Any]]):
+        """Hand the batch to the notifier; delivery and retries happen in the background"""
+        for url, config in self.endpoint_configs().items():
+            self.notifier.endpoint(url, config.get('headers'), config.get('max_concurrency', 2),
+                                   config['timeout'])
+            self.notifier.submit(url, self.format_payload(alerts, config.get('format', 'json')),
+                                 alert_count=len(alerts))
+
+    def get_metrics(self) -> Optional[Dict[str, Any]]:
+        return self._notifier.get_metrics() if self._notifier else None
+
+    def close(self):
+        if self._notifier:
+            self._notifier.close()
@@ -19,13 +19,13 @@ st.markdown("### Real-time System Monitoring Overview")
 # Initialize session state components
 if 'monitor' not in st.session_state:
     from modules.system_monitor import SystemMonitor
-    from modules.self_healer import SelfHealer
-    from modules.alerts import AlertManager
+    from modules.self_healer import get_shared_healer
+    from modules.alerts import get_shared_alert_manager
     from modules.logger import SystemLogger
     
     st.session_state.monitor = SystemMonitor()
-    st.session_state.healer = SelfHealer()
-    st.session_state.alert_manager = AlertManager()
+    st.session_state.healer = get_shared_healer()
+    st.session_state.alert_manager = get_shared_alert_manager()
     st.session_state.logger = SystemLogger()
 
 # Auto-refresh toggle
@@ -74,8 +74,14 @@ try:
         st.write(disk_status)
     
     with col4:
-        active_alerts = len(st.session_state.alert_manager.get_active_alerts())
-        alert_status = "🟢 No Issues" if active_alerts == 0 else f"⚠️ {active_alerts} Active"
+        active_alerts = st.session_state.alert_manager.get_active_alert_count()
+        critical_alerts = st.session_state.alert_manager.get_critical_alert_count()
+        if active_alerts == 0:
+            alert_status = "🟢 No Issues"
+        elif critical_alerts:
+            alert_status = f"🔴 {critical_alerts} Critical · {active_alerts} Active"
+        else:
+            alert_status = f"⚠️ {active_alerts} Active"
         st.metric("Active Alerts", active_alerts)
         st.write(alert_status)
 
@@ -224,6 +230,36 @@ try:
                 st.info(f"🔵 **{alert_time}** - {alert['message']}")
     else:
         st.success("🟢 No recent alerts - system is running smoothly!")
+    
+    # Background notification delivery
+    notification_metrics = st.session_state.alert_manager.get_notification_metrics()
+    if notification_metrics['enqueued']:
+        channel_summaries = []
+        for channel, channel_metrics in notification_metrics['channels'].items():
+            if channel_metrics['delivered'] or channel_metrics['failed']:
+                summary = f"{channel}: {channel_metrics['delivered']} sent"
+                if channel_metrics['latency_p95'] is not None:
+                    summary += f", p95 {channel_metrics['latency_p95']:.1f}s"
+                if channel_metrics['failed']:
+                    summary += f", {channel_metrics['failed']} failed"
+                channel_summaries.append(summary)
+        # Webhook hand-offs are delivered in the background; report the endpoints themselves
+        webhook_metrics = notification_metrics.get('webhook')
+        for url, endpoint_metrics in (webhook_metrics or {}).get('endpoints', {}).items():
+            summary = (f"{url}: {endpoint_metrics['delivered']} delivered, "
+                       f"{endpoint_metrics['alerts_per_second']:.1f}/s")
+            if endpoint_metrics['latency_p95'] is not None:
+                summary += f", p95 {endpoint_metrics['latency_p95']:.2f}s"
+            if endpoint_metrics['failed'] or endpoint_metrics['queued']:
+                summary += f", {endpoint_metrics['queued']} queued, {endpoint_metrics['failed']} failed"
+            channel_summaries.append(summary)
+        if webhook_metrics and webhook_metrics['retry_queue']:
+            channel_summaries.append(f"webhook retries pending: {webhook_metrics['retry_queue']}")
+        st.caption(
+            f"📨 Notifications - backlog {notification_metrics['backlog']}, "
+            f"dropped {notification_metrics['dropped']}"
+            + (f" | {' | '.join(channel_summaries)}" if channel_summaries else "")
+        )
 except Exception as e:
     st.error(f"Error loading alerts: {e}")
 
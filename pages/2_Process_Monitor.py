@@ -19,13 +19,13 @@ st.markdown("### Real-time Process Monitoring and Management")
 # Initialize session state components
 if 'monitor' not in st.session_state:
     from modules.system_monitor import SystemMonitor
-    from modules.self_healer import SelfHealer
-    from modules.alerts import AlertManager
+    from modules.self_healer import get_shared_healer
+    from modules.alerts import get_shared_alert_manager
     from modules.logger import SystemLogger
     
     st.session_state.monitor = SystemMonitor()
-    st.session_state.healer = SelfHealer()
-    st.session_state.alert_manager = AlertManager()
+    st.session_state.healer = get_shared_healer()
+    st.session_state.alert_manager = get_shared_alert_manager()
     st.session_state.logger = SystemLogger()
 
 # Sidebar controls
@@ -170,6 +170,32 @@ try:
         )
         st.plotly_chart(fig_status, use_container_width=True)
     
+    # Memory leak suspects
+    st.header("🧪 Memory Leak Suspects")
+    
+    try:
+        leak_suspects = st.session_state.monitor.get_leak_suspects(limit=10)
+        
+        if leak_suspects:
+            leak_df = pd.DataFrame(leak_suspects)
+            leak_df['hours_to_oom'] = leak_df['hours_to_oom'].round(1)
+            leak_df = leak_df[['name', 'pid', 'rss_mb', 'slope_mb_per_hour', 'hours_to_oom', 'samples']]
+            leak_df.columns = ['Process Name', 'PID', 'RSS (MB)', 'Growth (MB/h)', 'Hours to OOM', 'Samples']
+            
+            st.dataframe(
+                leak_df,
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "RSS (MB)": st.column_config.NumberColumn("RSS (MB)", format="%.1f MB"),
+                    "Growth (MB/h)": st.column_config.NumberColumn("Growth (MB/h)", format="%.1f")
+                }
+            )
+        else:
+            st.info("No sustained memory growth detected (long-lived processes are sampled every 30s)")
+    except Exception as e:
+        st.error(f"Error loading leak suspects: {e}")
+    
     # Detailed process table
     st.header("📋 Detailed Process List")
     
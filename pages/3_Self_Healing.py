@@ -19,18 +19,16 @@ st.markdown("### Automated Issue Detection and Resolution")
 # Initialize session state components
 if 'monitor' not in st.session_state:
     from modules.system_monitor import SystemMonitor
-    from modules.self_healer import SelfHealer
-    from modules.alerts import AlertManager
+    from modules.self_healer import get_shared_healer
+    from modules.alerts import get_shared_alert_manager
     from modules.logger import SystemLogger
     
     st.session_state.monitor = SystemMonitor()
-    st.session_state.healer = SelfHealer()
-    st.session_state.alert_manager = AlertManager()
+    st.session_state.healer = get_shared_healer()
+    st.session_state.alert_manager = get_shared_alert_manager()
     st.session_state.logger = SystemLogger()
 
 # Initialize healing state
-if 'healing_enabled' not in st.session_state:
-    st.session_state.healing_enabled = False
 if 'last_healing_check' not in st.session_state:
     st.session_state.last_healing_check = None
 
@@ -39,26 +37,28 @@ with st.sidebar:
     st.header("🎛️ Healing Controls")
     
     # Main healing toggle
-    if st.button("🟢 Enable Auto-Healing" if not st.session_state.healing_enabled else "🔴 Disable Auto-Healing", 
+    # The healer is shared by every session, so this toggles auto-healing for all of them
+    if st.button("🟢 Enable Auto-Healing" if not st.session_state.healer.healing_active else "🔴 Disable Auto-Healing", 
                 type="primary"):
-        if not st.session_state.healing_enabled:
-            result = st.session_state.healer.start_continuous_healing(check_interval=180)  # 3 minutes
+        if not st.session_state.healer.healing_active:
+            result = st.session_state.healer.start_continuous_healing()  # reacts on every shared sample
             if result['success']:
-                st.session_state.healing_enabled = True
                 st.success("✅ Auto-healing enabled!")
             else:
                 st.error(f"❌ {result['message']}")
         else:
             result = st.session_state.healer.stop_continuous_healing()
             if result['success']:
-                st.session_state.healing_enabled = False
                 st.success("✅ Auto-healing disabled!")
             else:
                 st.error(f"❌ {result['message']}")
     
     # Status indicator
-    if st.session_state.healing_enabled:
+    if st.session_state.healer.healing_active:
         st.success("🟢 Auto-healing is ACTIVE")
+        sampler_status = st.session_state.healer.sampler.get_status()
+        st.caption(f"Sampling every {sampler_status['sample_interval']:.0f}s · "
+                   f"{sampler_status['samples_taken']} samples · last took {sampler_status['last_sample_duration']:.2f}s")
     else:
         st.warning("🟡 Auto-healing is INACTIVE")
     
@@ -78,11 +78,13 @@ with st.sidebar:
     
     if st.button("🏥 Run Healing Actions"):
         if 'current_issues' in st.session_state and st.session_state.current_issues:
-            with st.spinner("Running healing actions..."):
+            with st.spinner("Submitting healing actions..."):
                 try:
-                    result = st.session_state.healer.auto_heal(st.session_state.current_issues)
+                    result = st.session_state.healer.auto_heal(st.session_state.current_issues, wait=False)
                     if result['success']:
-                        st.success(f"✅ Healing completed: {result['successful_count']}/{result['total_count']} successful")
+                        st.success(f"✅ Submitted {len(result['jobs'])} healing action(s)")
+                        for skipped in result.get('skipped_actions', []):
+                            st.info(f"⏭️ Skipped {skipped['action']} ({skipped['reason'].replace('_', ' ')})")
                     else:
                         st.error(f"❌ {result['message']}")
                 except Exception as e:
@@ -95,17 +97,75 @@ with st.sidebar:
     # Healing configuration
     st.subheader("⚙️ Configuration")
     
-    cpu_threshold = st.slider("CPU Alert Threshold (%)", 50, 100, 75)
-    memory_threshold = st.slider("Memory Alert Threshold (%)", 50, 100, 85)
-    disk_threshold = st.slider("Disk Alert Threshold (%)", 50, 100, 85)
+    throttle_mode = st.checkbox(
+        "Throttle high-CPU processes instead of killing",
+        value=st.session_state.healer.cpu_healing_mode == 'throttle',
+        help="Renice, pin to one core or cap with cgroup cpu.max; limits are lifted once CPU load normalizes"
+    )
+    if throttle_mode != (st.session_state.healer.cpu_healing_mode == 'throttle'):
+        st.session_state.healer.set_cpu_healing_mode('throttle' if throttle_mode else 'kill')
     
-    # Update alert rules
+    leak_termination = st.checkbox(
+        "Terminate memory leak suspects automatically",
+        value=st.session_state.healer.leak_termination_enabled,
+        help="Off by default. Only suspects tracked for at least an hour that grew by 512 MB or more "
+             "and would exhaust memory within 6 hours are terminated"
+    )
+    if leak_termination != st.session_state.healer.leak_termination_enabled:
+        st.session_state.healer.set_leak_termination(leak_termination)
+    
+    watched_services = st.session_state.healer.get_watched_services()
+    services_text = st.text_area(
+        "Watched services",
+        value="\n".join(
+            f"{name}: {', '.join(deps)}" if deps else name for name, deps in watched_services.items()
+        ),
+        help="One service per line, optionally followed by ': dependency, ...'. "
+             "Dependencies are restarted first. Nothing is restarted while the list is empty."
+    )
+    new_services = {}
+    for line in services_text.splitlines():
+        name, _, deps = line.partition(':')
+        if name.strip():
+            new_services[name.strip()] = [dep.strip() for dep in deps.split(',') if dep.strip()]
+    if new_services != watched_services:
+        st.session_state.healer.set_watched_services(new_services)
+    
+    discover_failed_units = st.checkbox(
+        "Restart all failed systemd units when no services are listed",
+        value=st.session_state.healer.actions.discover_failed_units,
+        help="Off by default. Restarts whatever systemctl reports as failed, as the user running this app"
+    )
+    if discover_failed_units != st.session_state.healer.actions.discover_failed_units:
+        st.session_state.healer.set_failed_unit_discovery(discover_failed_units)
+    
+    # Sliders start from the shared rules; other sessions' settings are only overwritten on change
+    alert_rules = st.session_state.alert_manager.alert_rules
+    cpu_threshold = st.slider("CPU Alert Threshold (%)", 50, 100, int(alert_rules['cpu']['warning_threshold']))
+    memory_threshold = st.slider("Memory Alert Threshold (%)", 50, 100, int(alert_rules['memory']['warning_threshold']))
+    disk_threshold = st.slider("Disk Alert Threshold (%)", 50, 100, int(alert_rules['disk']['warning_threshold']))
+    
+    # Edit the compiled alert and issue rules in place
     new_rules = {
         'cpu': {'warning_threshold': cpu_threshold, 'critical_threshold': cpu_threshold + 15},
         'memory': {'warning_threshold': memory_threshold, 'critical_threshold': memory_threshold + 10},
         'disk': {'warning_threshold': disk_threshold, 'critical_threshold': disk_threshold + 10}
     }
-    st.session_state.alert_manager.update_alert_rules(new_rules)
+    changed_rules = {
+        rule_name: rule for rule_name, rule in new_rules.items()
+        if rule['warning_threshold'] != alert_rules[rule_name]['warning_threshold']
+    }
+    if changed_rules:
+        st.session_state.alert_manager.update_alert_rules(changed_rules)
+        # Auto-healing evaluates issues on the shared sampler's monitor
+        from modules.system_sampler import get_shared_sampler
+        for rule_name, rule in changed_rules.items():
+            get_shared_sampler().monitor.set_issue_thresholds(
+                rule_name, {'warning': rule['warning_threshold'], 'critical': rule['critical_threshold']})
+    # This session's own monitor (used for manual scans) follows the shared rules
+    for rule_name, rule in new_rules.items():
+        st.session_state.monitor.set_issue_thresholds(
+            rule_name, {'warning': rule['warning_threshold'], 'critical': rule['critical_threshold']})
 
 # Main content area
 col1, col2 = st.columns([2, 1])
@@ -115,8 +175,12 @@ with col1:
     st.header("🎯 System Health Status")
     
     try:
-        # Get current issues
-        current_issues = st.session_state.monitor.detect_issues()
+        # Reuse the shared sampler's latest issues while auto-healing runs, instead of collecting again
+        current_issues = None
+        if st.session_state.healer.healing_active and st.session_state.healer.sampler:
+            current_issues = st.session_state.healer.sampler.get_latest_issues()
+        if current_issues is None:
+            current_issues = st.session_state.monitor.detect_issues()
         
         if current_issues:
             st.warning(f"⚠️ {len(current_issues)} issue(s) detected:")
@@ -147,6 +211,12 @@ with col1:
             "trigger": "CPU usage > 75%",
             "safety": "Safe - excludes system processes"
         },
+        {
+            "action": "High CPU Process Throttling",
+            "description": "Lowers priority, restricts CPU affinity or applies a cgroup CPU limit; released when load normalizes",
+            "trigger": "CPU usage > 75%",
+            "safety": "Safe - reversible, nothing is terminated"
+        },
         {
             "action": "Memory Optimization",
             "description": "Frees up system memory using garbage collection and cache clearing",
@@ -161,7 +231,7 @@ with col1:
         },
         {
             "action": "Service Restart",
-            "description": "Restarts unresponsive Windows services",
+            "description": "Checks watched services in parallel and restarts stopped ones in dependency order (Windows services or systemd units)",
             "trigger": "Service not responding",
             "safety": "Medium - may briefly interrupt services"
         },
@@ -180,6 +250,16 @@ with col1:
             
             safety_color = "🟢" if action['safety'].startswith("Safe") else "🟡"
             st.write(f"**Safety Level:** {safety_color} {action['safety']}")
+    
+    # Platform-specific actions detected for this host
+    with st.expander("🖥️ Host Healing Capabilities"):
+        try:
+            registry_df = pd.DataFrame(st.session_state.healer.actions.describe())
+            registry_df['available'] = registry_df['available'].apply(lambda x: '✅ Available' if x else '⏭️ Skipped')
+            registry_df.columns = ['Action', 'Category', 'Platforms', 'Description', 'Status', 'Reason']
+            st.dataframe(registry_df, use_container_width=True, hide_index=True)
+        except Exception as e:
+            st.error(f"Error loading healing capabilities: {e}")
 
 with col2:
     # Healing statistics
@@ -239,6 +319,114 @@ with col2:
     except Exception as e:
         st.error(f"Error loading healing statistics: {e}")
 
+# Healing jobs section
+st.header("⏳ Healing Jobs")
+
+try:
+    healing_jobs = st.session_state.healer.get_jobs(limit=10)
+    
+    if healing_jobs:
+        jobs_df = pd.DataFrame(healing_jobs)
+        jobs_df['elapsed_seconds'] = jobs_df['elapsed_seconds'].fillna(0).round(1)
+        display_jobs = jobs_df[['job_id', 'action', 'status', 'priority', 'resource_class', 'elapsed_seconds']].copy()
+        display_jobs.columns = ['Job', 'Action', 'Status', 'Priority', 'Resource Class', 'Elapsed (s)']
+        
+        st.dataframe(display_jobs, use_container_width=True, hide_index=True)
+        
+        if any(job['status'] in ('queued', 'running') for job in healing_jobs):
+            st.info("🔄 Healing jobs in progress - this view refreshes automatically")
+    else:
+        st.info("No healing jobs submitted yet")
+        
+except Exception as e:
+    st.error(f"Error loading healing jobs: {e}")
+
+# Throttled processes section
+st.header("🐢 Throttled Processes")
+
+try:
+    throttled = st.session_state.healer.get_throttled_processes()
+    
+    if throttled:
+        throttled_df = pd.DataFrame(throttled)
+        throttled_df = throttled_df[['pid', 'name', 'applied', 'original_nice', 'original_cgroup', 'throttled_at',
+                                     'release_error']]
+        throttled_df.columns = ['PID', 'Process', 'Throttles', 'Original Nice', 'Original Cgroup', 'Throttled At',
+                                'Release Error']
+        st.dataframe(throttled_df, use_container_width=True, hide_index=True)
+        st.caption("Restoring a lower nice value or moving a process back between cgroups needs elevated "
+                   "privileges (root or CAP_SYS_NICE on Linux, Administrator on Windows); throttles that "
+                   "cannot be undone stay listed here.")
+        
+        if st.button("🔓 Release All Throttles"):
+            result = st.session_state.healer.release_throttles(force=True)
+            if result['success']:
+                st.success(f"✅ {result['message']}")
+            else:
+                st.error(f"❌ {result['message']}")
+    else:
+        st.info("No processes are currently throttled")
+        
+except Exception as e:
+    st.error(f"Error loading throttled processes: {e}")
+
+# Healing effectiveness section
+st.header("📐 Action Effectiveness")
+
+try:
+    effectiveness = st.session_state.healer.get_effectiveness_statistics()
+    
+    if effectiveness:
+        eff_df = pd.DataFrame(effectiveness)
+        eff_df['mean_relief'] = eff_df.apply(lambda r: f"{r['mean_relief']:+.1f} {r['unit']}", axis=1)
+        eff_df['last_relief'] = eff_df.apply(lambda r: f"{r['last_relief']:+.1f} {r['unit']}", axis=1)
+        eff_df['effective_rate'] = eff_df['effective_rate'].round(1)
+        display_eff = eff_df[['action', 'category', 'runs', 'mean_relief', 'last_relief', 'effective_rate']].copy()
+        display_eff.columns = ['Action', 'Issue Category', 'Measured Runs', 'Mean Relief', 'Last Relief', 'Effective (%)']
+        
+        st.dataframe(display_eff, use_container_width=True, hide_index=True)
+        st.caption("Relief is measured after a settling window. Where a category has alternative actions "
+                   "(disk, and memory with leak termination enabled), auto-healing prefers the one with the best history.")
+    else:
+        st.info("No healing actions measured yet")
+        
+except Exception as e:
+    st.error(f"Error loading effectiveness statistics: {e}")
+
+# Rate limits and circuit breakers section
+st.header("🔌 Circuit Breakers")
+
+try:
+    breaker_states = st.session_state.healer.get_breaker_states()
+    
+    if breaker_states:
+        breaker_icons = {'closed': '🟢 Closed', 'half_open': '🟡 Half-open', 'open': '🔴 Open'}
+        breaker_df = pd.DataFrame(breaker_states)
+        breaker_df['breaker'] = breaker_df['breaker'].map(breaker_icons)
+        breaker_df['ineffective'] = breaker_df.apply(
+            lambda r: f"{r['consecutive_ineffective']}/{r['failure_threshold']}", axis=1)
+        breaker_df['tokens'] = breaker_df.apply(
+            lambda r: f"{r['tokens']:.1f}/{r['capacity']}" if r['capacity'] else 'unlimited', axis=1)
+        breaker_df['backoff_remaining'] = breaker_df['backoff_remaining'].round(0)
+        display_breakers = breaker_df[['action', 'breaker', 'ineffective', 'consecutive_failures',
+                                       'backoff_remaining', 'tokens']].copy()
+        display_breakers.columns = ['Action', 'Breaker', 'Ineffective Runs', 'Consecutive Failures',
+                                    'Backoff (s)', 'Tokens']
+        
+        st.dataframe(display_breakers, use_container_width=True, hide_index=True)
+        st.caption("Breakers open after repeated ineffective runs; failing actions back off exponentially "
+                   "and destructive actions are limited by token buckets.")
+        
+        if any(state['breaker'] != 'closed' or state['backoff_remaining'] > 0 for state in breaker_states):
+            if st.button("🔁 Reset Breakers"):
+                st.session_state.healer.reset_breakers()
+                st.success("✅ Circuit breakers closed and backoff cleared")
+    else:
+        st.info("No healing actions have been rate limited yet")
+        
+except Exception as e:
+    st.error(f"Error loading circuit breakers: {e}")
+
 # Healing log section
 st.header("📋 Healing Activity Log")
 
@@ -267,12 +455,15 @@ try:
         if st.checkbox("Show full healing log"):
             st.subheader("Complete Healing Log")
             
-            display_log = log_df[['timestamp', 'action', 'message', 'success']].copy()
-            display_log.columns = ['Timestamp', 'Action', 'Message', 'Success']
+            if 'breaker' not in log_df:
+                log_df['breaker'] = None
+            display_log = log_df[['timestamp', 'action', 'message', 'success', 'breaker']].copy()
+            display_log.columns = ['Timestamp', 'Action', 'Message', 'Success', 'Breaker']
             display_log['Status'] = display_log['Success'].apply(lambda x: '✅ Success' if x else '❌ Failed')
+            display_log['Breaker'] = display_log['Breaker'].fillna('')
             
             st.dataframe(
-                display_log[['Timestamp', 'Action', 'Message', 'Status']],
+                display_log[['Timestamp', 'Action', 'Message', 'Status', 'Breaker']],
                 use_container_width=True,
                 hide_index=True
             )
@@ -356,9 +547,9 @@ except Exception as e:
 # Footer
 st.markdown("---")
 st.markdown(f"🕒 Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | "
-           f"Auto-healing: {'🟢 Active' if st.session_state.healing_enabled else '🔴 Inactive'}")
+           f"Auto-healing: {'🟢 Active' if st.session_state.healer.healing_active else '🔴 Inactive'}")
 
-# Auto-refresh if healing is enabled
-if st.session_state.healing_enabled:
+# Auto-refresh if healing is enabled or jobs are still running
+if st.session_state.healer.healing_active or st.session_state.healer.get_jobs(active_only=True):
     time.sleep(5)
     st.rerun()
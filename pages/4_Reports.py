@@ -6,6 +6,7 @@ import json
 import time
 from datetime import datetime, timedelta
 import io
+from modules.stream_export import iter_export, spool_chunks
 
 # Page configuration
 st.set_page_config(
@@ -20,13 +21,13 @@ st.markdown("### Comprehensive System Analysis and Reporting")
 # Initialize session state components
 if 'monitor' not in st.session_state:
     from modules.system_monitor import SystemMonitor
-    from modules.self_healer import SelfHealer
-    from modules.alerts import AlertManager
+    from modules.self_healer import get_shared_healer
+    from modules.alerts import get_shared_alert_manager
     from modules.logger import SystemLogger
     
     st.session_state.monitor = SystemMonitor()
-    st.session_state.healer = SelfHealer()
-    st.session_state.alert_manager = AlertManager()
+    st.session_state.healer = get_shared_healer()
+    st.session_state.alert_manager = get_shared_alert_manager()
     st.session_state.logger = SystemLogger()
 
 # Sidebar controls
@@ -60,7 +61,8 @@ with st.sidebar:
     
     # Export format
     st.subheader("💾 Export Options")
-    export_format = st.selectbox("Export Format", ["HTML", "JSON", "CSV", "Text"])
+    export_format = st.selectbox("Export Format", ["HTML", "JSON", "NDJSON", "CSV", "Text"])
+    compress_export = st.checkbox("Compress (gzip)", value=False)
     
     # Generate report button
     if st.button("📄 Generate Report", type="primary"):
@@ -270,6 +272,25 @@ if hasattr(st.session_state, 'generate_report') and st.session_state.generate_re
                     )
                     st.plotly_chart(fig_severity, use_container_width=True)
             
+            # Alert rate over the last day
+            if alert_stats['alerts_last_day']:
+                rate_df = pd.DataFrame(alert_stats['alerts_per_hour'])
+                rate_df['timestamp'] = pd.to_datetime(rate_df['timestamp'])
+                fig_rate = px.bar(rate_df, x='timestamp', y='count', title="Alerts per Hour (last 24h)")
+                st.plotly_chart(fig_rate, use_container_width=True)
+            
+            # Correlated incidents
+            incidents = st.session_state.alert_manager.get_incidents(limit=20)
+            if incidents:
+                st.subheader("Incidents")
+                incidents_df = pd.DataFrame(incidents)
+                incidents_df['categories'] = incidents_df['categories'].apply(', '.join)
+                st.dataframe(
+                    incidents_df[['id', 'status', 'severity', 'root_message', 'categories',
+                                  'alert_count', 'notifications', 'suppressed', 'updated_at']],
+                    use_container_width=True, hide_index=True
+                )
+            
             # Recent alerts table
             st.subheader("Recent Alerts")
             recent_alerts = st.session_state.alert_manager.get_recent_alerts(20)
@@ -447,18 +468,25 @@ if hasattr(st.session_state, 'generate_report') and st.session_state.generate_re
                 export_content = json.dumps({"error": f"Export failed: {e}"}, indent=2)
         
         elif export_format == "CSV":
-            # For CSV, export recent alerts and healing log
-            try:
-                alerts_data = st.session_state.alert_manager.export_alerts(format='csv')
-                export_content = f"# ALERTS DATA\n{alerts_data}\n\n# HEALING LOG\n"
-                
-                healing_log = st.session_state.healer.get_healing_log(100)
-                if healing_log:
-                    healing_df = pd.DataFrame(healing_log)
-                    export_content += healing_df.to_csv(index=False)
-                
-            except Exception as e:
-                export_content = f"Export failed: {e}"
+            # For CSV, stream all alerts and the recent healing log
+            def csv_chunks():
+                yield "# ALERTS DATA\n"
+                yield from st.session_state.alert_manager.iter_export_alerts(format='csv')
+                yield "\n\n# HEALING LOG\n"
+                yield from iter_export(st.session_state.healer.get_healing_log(100), 'csv')
+            
+            export_content = csv_chunks()
+        
+        elif export_format == "NDJSON":
+            # One JSON object per line: the report header, then every alert and healing entry
+            def ndjson_chunks():
+                yield from iter_export([dict(export_data, record="report")], 'ndjson')
+                yield from iter_export((dict(alert, record="alert") for alert in
+                                        st.session_state.alert_manager.store.iter_copies()), 'ndjson')
+                yield from iter_export((dict(action, record="healing") for action in
+                                        st.session_state.healer.get_healing_log(100)), 'ndjson')
+            
+            export_content = ndjson_chunks()
         
         elif export_format == "Text":
             # Generate comprehensive text report
@@ -500,13 +528,28 @@ if hasattr(st.session_state, 'generate_report') and st.session_state.generate_re
             file_extension = "txt"
         
         filename = f"system_report_{report_type.lower().replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{file_extension}"
+        mime = {"Text": "text/plain", "CSV": "text/csv", "JSON": "application/json",
+                "NDJSON": "application/x-ndjson"}.get(export_format, "text/html")
+        if compress_export:
+            filename += ".gz"
+            mime = "application/gzip"
+        
+        # Exports are streamed into a temporary file (opened as a BufferedReader) instead of one string
+        if isinstance(export_content, str):
+            export_content = [export_content]
+        try:
+            export_file = spool_chunks(export_content, compress=compress_export)
+        except Exception as e:
+            export_file = spool_chunks([f"Export failed: {e}"], compress=compress_export)
         
-        st.download_button(
-            label=f"📥 Download {export_format} Report",
-            data=export_content,
-            file_name=filename,
-            mime="text/plain" if export_format in ["Text", "CSV"] else "application/json" if export_format == "JSON" else "text/html"
-        )
+        # download_button reads the file right away, so it can be closed afterwards
+        with export_file:
+            st.download_button(
+                label=f"📥 Download {export_format} Report",
+                data=export_file,
+                file_name=filename,
+                mime=mime
+            )
         
     except Exception as e:
         st.error(f"Error generating report: {e}")
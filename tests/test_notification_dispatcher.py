@@ -0,0 +1,169 @@
+import email
+import smtplib
+
+from modules.notification_dispatcher import (EmailChannel, NotificationChannel, NotificationDispatcher,
+                                             SmtpSession)
+
+
+class FakeSMTP:
+    """SMTP stand-in that records sessions and messages instead of connecting"""
+
+    instances = []
+
+    def __init__(self, host, port, timeout=None):
+        self.host = host
+        self.port = port
+        self.started_tls = False
+        self.logged_in = None
+        self.sent = []
+        self.closed = False
+        self.drop_next = False
+        FakeSMTP.instances.append(self)
+
+    def starttls(self):
+        self.started_tls = True
+
+    def login(self, username, password):
+        self.logged_in = username
+
+    def noop(self):
+        return (250, b'OK')
+
+    def sendmail(self, from_addr, recipients, message):
+        if self.drop_next:
+            self.drop_next = False
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        self.sent.append((from_addr, list(recipients), message))
+
+    def quit(self):
+        self.closed = True
+
+
+class RecordingChannel(NotificationChannel):
+    name = 'recording'
+
+    def __init__(self, settings_provider, fail: bool = False):
+        super().__init__(settings_provider)
+        self.fail = fail
+        self.batches = []
+
+    def deliver(self, alerts):
+        if self.fail:
+            raise RuntimeError("endpoint unavailable")
+        self.batches.append(list(alerts))
+
+
+def alert(alert_id: str, severity: str = 'warning'):
+    return {'id': alert_id, 'timestamp': '2024-01-01T00:00:00', 'severity': severity,
+            'category': 'cpu', 'message': f'High CPU usage ({alert_id})'}
+
+
+def email_settings(**overrides):
+    settings = {'email': dict({
+        'enabled': True, 'smtp_server': 'smtp.test', 'smtp_port': 587, 'use_tls': True,
+        'username': 'monitor@test', 'password': 'secret', 'recipients': ['ops@test'],
+        'coalesce_seconds': 60
+    }, **overrides)}
+    return lambda: settings
+
+
+def make_email_dispatcher(settings_provider):
+    FakeSMTP.instances = []
+    channel = EmailChannel(settings_provider, session=SmtpSession(smtp_factory=FakeSMTP))
+    return NotificationDispatcher([channel]), channel
+
+
+def test_alerts_in_the_coalesce_window_share_one_email():
+    dispatcher, _ = make_email_dispatcher(email_settings())
+    for index in range(3):
+        dispatcher.submit(alert(f'A{index}', 'critical' if index == 1 else 'warning'))
+    assert dispatcher.flush(5)
+    dispatcher.shutdown()
+
+    assert len(FakeSMTP.instances) == 1
+    server = FakeSMTP.instances[0]
+    assert server.started_tls and server.logged_in == 'monitor@test'
+    assert len(server.sent) == 1
+    sender, recipients, raw = server.sent[0]
+    message = email.message_from_string(raw)
+    assert sender == 'monitor@test' and recipients == ['ops@test']
+    assert message['Subject'] == "System Alerts - 3 new, highest Critical"
+    assert all(f'Alert ID: A{index}' in raw for index in range(3))
+
+    metrics = dispatcher.get_metrics()
+    assert metrics['channels']['email']['delivered'] == 3
+    assert metrics['channels']['email']['batches'] == 1
+    assert server.closed  # shutdown closes the pooled session
+
+
+def test_smtp_session_is_reused_across_batches():
+    dispatcher, _ = make_email_dispatcher(email_settings())
+    dispatcher.submit(alert('A1'))
+    assert dispatcher.flush(5)
+    dispatcher.submit(alert('A2'))
+    assert dispatcher.flush(5)
+    dispatcher.shutdown()
+
+    assert len(FakeSMTP.instances) == 1
+    assert len(FakeSMTP.instances[0].sent) == 2
+
+
+def test_dropped_smtp_session_reconnects_once():
+    dispatcher, channel = make_email_dispatcher(email_settings())
+    dispatcher.submit(alert('A1'))
+    assert dispatcher.flush(5)
+
+    FakeSMTP.instances[0].drop_next = True
+    dispatcher.submit(alert('A2'))
+    assert dispatcher.flush(5)
+    dispatcher.shutdown()
+
+    assert channel.session.connects == 2
+    assert [len(server.sent) for server in FakeSMTP.instances] == [1, 1]
+    assert dispatcher.get_metrics()['channels']['email']['failed'] == 0
+
+
+def test_failing_channel_does_not_hold_back_the_others():
+    settings = {'recording': {'enabled': True, 'coalesce_seconds': 60}}
+    working = RecordingChannel(lambda: settings)
+    failing = RecordingChannel(lambda: settings, fail=True)
+    failing.name = 'failing'
+    settings['failing'] = {'enabled': True, 'coalesce_seconds': 60}
+    dispatcher = NotificationDispatcher([working, failing])
+
+    dispatcher.submit(alert('A1'))
+    dispatcher.submit(alert('A2'))
+    assert dispatcher.flush(5)
+    dispatcher.shutdown()
+
+    assert [[a['id'] for a in batch] for batch in working.batches] == [['A1', 'A2']]
+    metrics = dispatcher.get_metrics()['channels']
+    assert metrics['recording']['delivered'] == 2
+    assert metrics['failing']['failed'] == 2
+    assert metrics['failing']['last_error'] == "endpoint unavailable"
+
+
+def test_disabled_channels_receive_nothing():
+    settings = {'recording': {'enabled': False}}
+    channel = RecordingChannel(lambda: settings)
+    dispatcher = NotificationDispatcher([channel])
+
+    dispatcher.submit(alert('A1'))
+    assert dispatcher.flush(5)
+    dispatcher.shutdown()
+
+    assert channel.batches == []
+    assert dispatcher.get_metrics()['channels']['recording']['pending'] == 0
+
+
+def test_batches_are_capped_at_max_batch():
+    settings = {'recording': {'enabled': True, 'coalesce_seconds': 60}}
+    channel = RecordingChannel(lambda: settings)
+    dispatcher = NotificationDispatcher([channel], max_batch=2)
+
+    for index in range(5):
+        dispatcher.submit(alert(f'A{index}'))
+    assert dispatcher.flush(5)
+    dispatcher.shutdown()
+
+    assert [len(batch) for batch in channel.batches] == [2, 2, 1]
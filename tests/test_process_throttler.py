@@ -0,0 +1,118 @@
+import subprocess
+import sys
+
+import psutil
+import pytest
+
+from modules.process_throttler import ProcessThrottler
+
+
+@pytest.fixture
+def child():
+    process = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])
+    yield process
+    process.kill()
+    process.wait()
+
+
+@pytest.fixture
+def fake_roots(tmp_path, child):
+    """A cgroup v2 tree and a /proc with the child's cgroup, as plain directories"""
+    cgroup_root = tmp_path / 'cgroup'
+    (cgroup_root / 'user.slice' / 'app.scope').mkdir(parents=True)
+    (cgroup_root / 'cgroup.controllers').write_text('cpu memory\n')
+
+    proc_root = tmp_path / 'proc'
+    (proc_root / str(child.pid)).mkdir(parents=True)
+    (proc_root / str(child.pid) / 'cgroup').write_text('0::/user.slice/app.scope\n')
+    return cgroup_root, proc_root
+
+
+def test_cgroup_throttle_round_trip(fake_roots, child):
+    cgroup_root, proc_root = fake_roots
+    throttler = ProcessThrottler(cgroup_root=str(cgroup_root), proc_root=str(proc_root),
+                                 cpu_limit_percent=25.0)
+
+    result = throttler.throttle(child.pid, methods=['cgroup'])
+    assert result['success'] and result['applied'] == ['cgroup']
+
+    group = cgroup_root / 'healer-throttle.slice' / f'pid-{child.pid}'
+    assert (group / 'cpu.max').read_text() == '25000 100000'
+    assert (group / 'cgroup.procs').read_text() == str(child.pid)
+    assert (cgroup_root / 'cgroup.subtree_control').read_text() == '+cpu'
+
+    ledger = throttler.get_ledger()
+    assert [entry['pid'] for entry in ledger] == [child.pid]
+    assert ledger[0]['original_cgroup'] == '/user.slice/app.scope'
+
+    released = throttler.release(child.pid)
+    assert released['success'] and released['restored'] == ['cgroup']
+    assert (cgroup_root / 'user.slice' / 'app.scope' / 'cgroup.procs').read_text() == str(child.pid)
+    assert not group.exists()
+    assert throttler.get_ledger() == []
+
+
+def test_repeated_throttle_keeps_first_originals(fake_roots, child):
+    cgroup_root, proc_root = fake_roots
+    throttler = ProcessThrottler(cgroup_root=str(cgroup_root), proc_root=str(proc_root))
+
+    throttler.throttle(child.pid, methods=['cgroup'])
+    # A second throttle must not record the throttle group as the original cgroup
+    (proc_root / str(child.pid) / 'cgroup').write_text(f'0::/healer-throttle.slice/pid-{child.pid}\n')
+    throttler.throttle(child.pid, methods=['cgroup'])
+
+    assert throttler.get_ledger()[0]['original_cgroup'] == '/user.slice/app.scope'
+
+
+def test_release_keeps_throttles_that_cannot_be_undone(fake_roots, child, monkeypatch):
+    cgroup_root, proc_root = fake_roots
+    throttler = ProcessThrottler(cgroup_root=str(cgroup_root), proc_root=str(proc_root))
+
+    result = throttler.throttle(child.pid, methods=['nice', 'cgroup'])
+    assert sorted(result['applied']) == ['cgroup', 'nice']
+    assert psutil.Process(child.pid).nice() == throttler.nice_value
+
+    # Lowering nice again needs privileges the app may not have
+    original_nice = psutil.Process.nice
+
+    def nice(self, value=None):
+        if value is None:
+            return original_nice(self)
+        raise psutil.AccessDenied(self.pid)
+
+    monkeypatch.setattr(psutil.Process, 'nice', nice)
+    released = throttler.release(child.pid)
+
+    assert not released['success']
+    assert released['restored'] == ['cgroup'] and released['pending'] == ['nice']
+    ledger = throttler.get_ledger()
+    assert ledger[0]['applied'] == 'nice'
+    assert 'access denied' in ledger[0]['release_error']
+
+    # Once the privilege is there, the remaining throttle is undone and the entry goes away
+    monkeypatch.setattr(psutil.Process, 'nice', original_nice)
+    released = throttler.release(child.pid)
+    assert released['success'] and released['restored'] == ['nice']
+    assert throttler.get_ledger() == []
+
+
+def test_release_of_exited_process_cleans_up(fake_roots, child):
+    cgroup_root, proc_root = fake_roots
+    throttler = ProcessThrottler(cgroup_root=str(cgroup_root), proc_root=str(proc_root))
+    throttler.throttle(child.pid, methods=['cgroup'])
+
+    child.kill()
+    child.wait()
+    released = throttler.release(child.pid)
+
+    assert released['success'] and released['message'] == "Process exited"
+    assert not (cgroup_root / 'healer-throttle.slice' / f'pid-{child.pid}').exists()
+    assert throttler.get_ledger() == []
+
+
+def test_cgroup_method_needs_a_unified_hierarchy(tmp_path):
+    throttler = ProcessThrottler(cgroup_root=str(tmp_path), proc_root=str(tmp_path))
+    assert 'cgroup' not in throttler.get_available_methods()
+
+    (tmp_path / 'cgroup.controllers').write_text('cpu\n')
+    assert 'cgroup' in throttler.get_available_methods()
@@ -0,0 +1,144 @@
+import threading
+
+import pytest
+
+from modules.service_manager import AsyncCommandRunner, ScriptedCommandExecutor, ServiceManager
+
+SERVICES = {
+    'postgresql': [],
+    'redis': [],
+    'api': ['postgresql', 'redis'],
+    'worker': ['api']
+}
+
+
+def make_manager(executor: ScriptedCommandExecutor, services=None, max_concurrency: int = 4):
+    runner = AsyncCommandRunner(max_concurrency=max_concurrency, executor=executor)
+    return ServiceManager('systemd', services or SERVICES, runner=runner)
+
+
+def script_statuses(executor: ScriptedCommandExecutor, statuses):
+    for name, state in statuses.items():
+        executor.set_response(['systemctl', 'is-active', name], returncode=0 if state == 'active' else 3,
+                              stdout=state + '\n')
+
+
+def restarts(executor: ScriptedCommandExecutor):
+    return [call[2] for call in executor.calls if call[1] == 'restart']
+
+
+def test_restart_order_groups_dependencies_into_levels():
+    manager = make_manager(ScriptedCommandExecutor())
+    assert manager.restart_order(['worker', 'api', 'redis', 'postgresql']) == [
+        ['postgresql', 'redis'], ['api'], ['worker']
+    ]
+    # Dependencies that are not being restarted do not hold a service back
+    assert manager.restart_order(['worker', 'redis']) == [['redis', 'worker']]
+
+
+def test_restart_order_falls_back_to_configured_order_on_cycles():
+    manager = make_manager(ScriptedCommandExecutor(), {'a': ['b'], 'b': ['a']})
+    assert manager.restart_order(['a', 'b']) == [['a'], ['b']]
+
+
+def test_stopped_services_restart_after_their_dependencies():
+    executor = ScriptedCommandExecutor()
+    script_statuses(executor, {'postgresql': 'failed', 'redis': 'active', 'api': 'inactive', 'worker': 'failed'})
+    for name in SERVICES:
+        executor.set_response(['systemctl', 'restart', name])
+
+    outcome = make_manager(executor).check_and_restart()
+
+    assert outcome['statuses'] == {'postgresql': 'stopped', 'redis': 'running', 'api': 'stopped',
+                                   'worker': 'stopped'}
+    assert restarts(executor) == ['postgresql', 'api', 'worker']
+    assert sorted(outcome['restarted_services']) == ['api', 'postgresql', 'worker']
+    assert outcome['failed_services'] == []
+
+
+def test_failed_dependency_skips_its_dependents():
+    executor = ScriptedCommandExecutor()
+    script_statuses(executor, {name: 'failed' for name in SERVICES})
+    executor.set_response(['systemctl', 'restart', 'postgresql'], returncode=1, stderr='Job failed')
+    executor.set_response(['systemctl', 'restart', 'redis'])
+    executor.set_response(['systemctl', 'restart', 'api'])
+    executor.set_response(['systemctl', 'restart', 'worker'])
+
+    outcome = make_manager(executor).check_and_restart()
+
+    # api depends on the failed postgresql, and worker on api: neither is attempted
+    assert sorted(restarts(executor)) == ['postgresql', 'redis']
+    assert outcome['restarted_services'] == ['redis']
+    assert sorted(outcome['failed_services']) == ['api', 'postgresql', 'worker']
+
+
+def test_unknown_status_is_not_restarted():
+    executor = ScriptedCommandExecutor()
+    script_statuses(executor, {'redis': 'activating'})
+
+    outcome = make_manager(executor, {'redis': []}).check_and_restart()
+
+    assert outcome['statuses'] == {'redis': 'unknown'}
+    assert restarts(executor) == []
+
+
+def test_checks_time_out_without_blocking_the_others():
+    executor = ScriptedCommandExecutor(delay=0.2)
+    script_statuses(executor, {name: 'active' for name in SERVICES})
+    manager = make_manager(executor)
+    manager.check_timeout = 0.05
+
+    outcome = manager.check_and_restart()
+
+    assert set(outcome['statuses'].values()) == {'unknown'}
+    assert outcome['restarted_services'] == []
+
+
+def test_concurrency_is_capped():
+    executor = ScriptedCommandExecutor(delay=0.05)
+    script_statuses(executor, {name: 'active' for name in SERVICES})
+    runner = AsyncCommandRunner(max_concurrency=2, executor=executor)
+    active = []
+    peak = []
+
+    async def counting(args, timeout):
+        active.append(args)
+        peak.append(len(active))
+        try:
+            return await executor(args, timeout)
+        finally:
+            active.remove(args)
+
+    runner.executor = counting
+    ServiceManager('systemd', SERVICES, runner=runner).check_and_restart()
+
+    assert max(peak) == 2
+
+
+def test_run_sync_from_several_threads():
+    executor = ScriptedCommandExecutor(delay=0.01)
+    script_statuses(executor, {name: 'active' for name in SERVICES})
+    manager = make_manager(executor, max_concurrency=2)
+    results = []
+    errors = []
+
+    def check():
+        try:
+            results.append(manager.check_and_restart())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=check) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(results) == 4
+    assert all(set(result['statuses'].values()) == {'running'} for result in results)
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        ServiceManager('launchd', {})
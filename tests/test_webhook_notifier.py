@@ -0,0 +1,167 @@
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from modules.webhook_notifier import WebhookNotifier
+
+
+class RecordingHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, so pooled connections are reused
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        server = self.server
+        with server.lock:
+            status = server.statuses.pop(0) if server.statuses else 200
+            server.requests.append({'path': self.path, 'headers': dict(self.headers),
+                                    'body': json.loads(body), 'status': status})
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def endpoint():
+    """A local webhook endpoint; append to .statuses to script responses"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), RecordingHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.statuses = []
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f'http://127.0.0.1:{server.server_address[1]}/hooks/alerts'
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def closed_url():
+    """A URL nothing listens on (connections are refused)"""
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return f'http://127.0.0.1:{port}/hooks/alerts'
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_batches_are_posted_with_headers_over_pooled_connections(endpoint, tmp_path):
+    notifier = WebhookNotifier(retry_path=str(tmp_path / 'retry.json'))
+    notifier.endpoint(endpoint.url, {'Authorization': 'Bearer token'}, max_concurrency=2)
+    for index in range(6):
+        notifier.submit(endpoint.url, {'alert': index})
+    assert notifier.flush(5)
+
+    assert sorted(request['body']['alert'] for request in endpoint.requests) == list(range(6))
+    assert all(request['headers']['Authorization'] == 'Bearer token' for request in endpoint.requests)
+    assert all(request['path'] == '/hooks/alerts' for request in endpoint.requests)
+
+    metrics = notifier.get_metrics()['endpoints'][endpoint.url]
+    assert metrics['delivered'] == 6 and metrics['failed'] == 0
+    assert metrics['connections_opened'] <= 2
+    notifier.close()
+
+
+def test_server_errors_are_retried_with_backoff(endpoint, tmp_path):
+    endpoint.statuses.extend([503, 429])
+    notifier = WebhookNotifier(retry_path=str(tmp_path / 'retry.json'), base_delay=0.05)
+    notifier.endpoint(endpoint.url)
+    notifier.submit(endpoint.url, {'alert': 'A1'})
+
+    assert wait_for(lambda: notifier.get_metrics()['endpoints'][endpoint.url]['delivered'] == 1)
+    assert [request['status'] for request in endpoint.requests] == [503, 429, 200]
+    metrics = notifier.get_metrics()
+    assert metrics['endpoints'][endpoint.url]['retried'] == 2
+    assert metrics['retry_queue'] == 0
+    notifier.close()
+
+
+def test_client_errors_are_not_retried(endpoint, tmp_path):
+    endpoint.statuses.append(400)
+    notifier = WebhookNotifier(retry_path=str(tmp_path / 'retry.json'), base_delay=0.05)
+    notifier.endpoint(endpoint.url)
+    notifier.submit(endpoint.url, {'alert': 'A1'})
+    assert notifier.flush(5)
+
+    metrics = notifier.get_metrics()
+    assert metrics['endpoints'][endpoint.url]['failed'] == 1
+    assert metrics['retry_queue'] == 0
+    assert len(endpoint.requests) == 1
+    notifier.close()
+
+
+def test_batches_fail_after_max_attempts(closed_url, tmp_path):
+    notifier = WebhookNotifier(retry_path=str(tmp_path / 'retry.json'), base_delay=0.01, max_attempts=3)
+    notifier.endpoint(closed_url)
+    notifier.submit(closed_url, {'alert': 'A1'}, alert_count=2)
+
+    assert wait_for(lambda: notifier.get_metrics()['endpoints'][closed_url]['failed'] == 2)
+    metrics = notifier.get_metrics()['endpoints'][closed_url]
+    assert metrics['retried'] == 2
+    assert metrics['delivered'] == 0
+    notifier.close()
+
+
+def test_retries_survive_a_restart_and_use_the_configured_headers(endpoint, closed_url, tmp_path):
+    retry_path = tmp_path / 'retry.json'
+
+    # First run: the endpoint is down, so the batch waits in the retry queue until close()
+    first = WebhookNotifier(retry_path=str(retry_path), base_delay=60, clock=lambda: 1000.0)
+    first.endpoint(closed_url, {'Authorization': 'Bearer token'})
+    first.submit(closed_url, {'alert': 'A1'})
+    assert wait_for(lambda: first.get_metrics()['retry_queue'] == 1)
+    first.close()
+
+    saved = json.loads(retry_path.read_text())
+    assert len(saved) == 1 and saved[0]['due'] == 1060.0
+    assert 'Authorization' not in json.dumps(saved)  # headers are not persisted
+
+    # Second run: the same batch, now for the live endpoint, is sent once it is due
+    saved[0]['batch']['url'] = endpoint.url
+    retry_path.write_text(json.dumps(saved))
+    configs = {endpoint.url: {'headers': {'Authorization': 'Bearer token'}, 'max_concurrency': 1}}
+    second = WebhookNotifier(retry_path=str(retry_path), endpoint_config=configs.get)
+
+    assert wait_for(lambda: len(endpoint.requests) == 1)
+    request = endpoint.requests[0]
+    assert request['body'] == {'alert': 'A1'}
+    assert request['headers']['Authorization'] == 'Bearer token'
+    assert wait_for(lambda: json.loads(retry_path.read_text()) == [])
+    second.close()
+
+
+def test_retries_for_unconfigured_endpoints_are_held(endpoint, tmp_path):
+    retry_path = tmp_path / 'retry.json'
+    batch = {'url': endpoint.url, 'body': json.dumps({'alert': 'A1'}), 'alerts': 1,
+             'attempts': 1, 'enqueued_at': 0}
+    retry_path.write_text(json.dumps([{'due': 0, 'batch': batch}]))
+
+    configs = {}
+    notifier = WebhookNotifier(retry_path=str(retry_path), endpoint_config=configs.get)
+    assert wait_for(lambda: notifier.get_metrics()['held'] == 1)
+    assert endpoint.requests == []
+    # Held batches stay persisted while they wait
+    assert wait_for(lambda: len(json.loads(retry_path.read_text())) == 1)
+
+    notifier.endpoint(endpoint.url, {'Authorization': 'Bearer token'})
+    assert wait_for(lambda: len(endpoint.requests) == 1)
+    assert endpoint.requests[0]['headers']['Authorization'] == 'Bearer token'
+    assert notifier.get_metrics()['held'] == 0
+    notifier.close()